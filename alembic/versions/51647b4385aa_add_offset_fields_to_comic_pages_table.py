@@ -0,0 +1,30 @@
+"""Add compress_type and data_offset fields to comic_pages table
+
+Revision ID: 51647b4385aa
+Revises: bdec7d7c0867
+Create Date: 2026-01-07 21:05:37.811204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '51647b4385aa'
+down_revision: Union[str, None] = 'bdec7d7c0867'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows stay NULL (no fast path) until their comic is rescanned
+    op.add_column('comic_pages', sa.Column('compress_type', sa.Integer(), nullable=True))
+    op.add_column('comic_pages', sa.Column('data_offset', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('comic_pages', schema=None) as batch_op:
+        batch_op.drop_column('data_offset')
+        batch_op.drop_column('compress_type')
@@ -0,0 +1,49 @@
+"""Add scanned_directories table and last_full_walk to libraries
+
+Revision ID: 5e0b7c2d9f14
+Revises: a3c91e5d7b20
+Create Date: 2026-01-10 09:31:05.742210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0b7c2d9f14'
+down_revision: Union[str, None] = 'a3c91e5d7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scanned_directories',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('library_id', sa.Integer(), nullable=False),
+        sa.Column('path', sa.String(), nullable=False),
+        sa.Column('mtime_ns', sa.BigInteger(), nullable=True),
+        sa.Column('entry_count', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['library_id'], ['libraries.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('library_id', 'path', name='uq_scanned_directory_path')
+    )
+    with op.batch_alter_table('scanned_directories', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_scanned_directories_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_scanned_directories_library_id'), ['library_id'], unique=False)
+
+    # NULL: the first scan after upgrade is a full walk
+    op.add_column('libraries', sa.Column('last_full_walk', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('libraries', schema=None) as batch_op:
+        batch_op.drop_column('last_full_walk')
+
+    with op.batch_alter_table('scanned_directories', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_scanned_directories_library_id'))
+        batch_op.drop_index(batch_op.f('ix_scanned_directories_id'))
+
+    op.drop_table('scanned_directories')
@@ -0,0 +1,32 @@
+"""Add width, height and is_double fields to comic_pages table
+
+Revision ID: 684998f40329
+Revises: 51647b4385aa
+Create Date: 2026-01-08 19:42:11.305117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '684998f40329'
+down_revision: Union[str, None] = '51647b4385aa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows stay NULL (reader measures on load) until their comic is rescanned
+    op.add_column('comic_pages', sa.Column('width', sa.Integer(), nullable=True))
+    op.add_column('comic_pages', sa.Column('height', sa.Integer(), nullable=True))
+    op.add_column('comic_pages', sa.Column('is_double', sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('comic_pages', schema=None) as batch_op:
+        batch_op.drop_column('is_double')
+        batch_op.drop_column('height')
+        batch_op.drop_column('width')
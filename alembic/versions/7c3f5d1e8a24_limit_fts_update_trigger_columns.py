@@ -0,0 +1,47 @@
+"""Only refresh the FTS index when indexed comic columns change
+
+Revision ID: 7c3f5d1e8a24
+Revises: d4e2a9c61f38
+Create Date: 2026-01-12 16:48:09.530127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3f5d1e8a24'
+down_revision: Union[str, None] = 'd4e2a9c61f38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_update_trigger(columns: str) -> None:
+    op.execute(f"""
+               CREATE TRIGGER comics_fts_upd
+                   AFTER UPDATE{columns}
+                   ON comics
+               BEGIN
+                   UPDATE comics_fts
+                   SET title   = new.title,
+                       series  = (SELECT s.name
+                                  FROM series s
+                                           JOIN volumes v ON s.id = v.series_id
+                                  WHERE v.id = new.volume_id),
+                       summary = new.summary
+                   WHERE rowid = old.id;
+               END;
+               """)
+
+
+def upgrade() -> None:
+    # Thumbnail / colour / progress writes no longer rewrite the FTS row
+    op.execute("DROP TRIGGER IF EXISTS comics_fts_upd")
+    _create_update_trigger(" OF title, summary, volume_id")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS comics_fts_upd")
+    _create_update_trigger("")
@@ -0,0 +1,106 @@
+"""Add persisted sort keys to comics table
+
+Revision ID: a3c91e5d7b20
+Revises: 684998f40329
+Create Date: 2026-01-09 10:12:40.511832
+
+"""
+from typing import Sequence, Union
+
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91e5d7b20'
+down_revision: Union[str, None] = '684998f40329'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of the sort key rules at this revision (migrations don't import app code)
+UNKNOWN_SORT_NUMBER = 999999.0
+ISSUE_NUMBER_RE = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*(.*)$')
+NON_PLAIN_FORMATS = {
+    'annual', 'giant size', 'giant-size', 'graphic novel', 'one shot', 'one-shot', 'hardcover',
+    'trade paperback', 'trade paper back', 'tpb', 'preview', 'special'
+}
+
+
+def _sort_keys(number, fmt, year, month, day) -> dict:
+    sort_number, sort_suffix = UNKNOWN_SORT_NUMBER, ""
+    if number:
+        match = ISSUE_NUMBER_RE.match(number)
+        if match:
+            sort_number = float(match.group(1))
+            sort_suffix = match.group(2).strip().lower()
+        else:
+            sort_suffix = number.strip().lower()
+
+    y = year if year is not None and year != -1 else 9999
+    m = month if month is not None and month != -1 else 99
+    d = day if day is not None and day != -1 else 99
+
+    fmt = (fmt or "").lower().strip()
+    if fmt == 'annual':
+        format_weight = 2
+    elif fmt in NON_PLAIN_FORMATS:
+        format_weight = 3
+    else:
+        format_weight = 1
+
+    return {
+        "sort_number": sort_number,
+        "sort_suffix": sort_suffix,
+        "sort_date": y * 10000 + m * 100 + d,
+        "format_weight": format_weight,
+    }
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('comics', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sort_number', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('sort_suffix', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('sort_date', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('format_weight', sa.Integer(), nullable=True))
+
+    # Backfill existing rows (new/updated comics get them from the scanner)
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, number, format, year, month, day FROM comics")).fetchall()
+
+    updates = []
+    for row in rows:
+        keys = _sort_keys(row.number, row.format, row.year, row.month, row.day)
+        keys["id"] = row.id
+        updates.append(keys)
+
+    if updates:
+        conn.execute(
+            sa.text("UPDATE comics SET sort_number = :sort_number, sort_suffix = :sort_suffix, "
+                    "sort_date = :sort_date, format_weight = :format_weight WHERE id = :id"),
+            updates
+        )
+
+    # Indexes after the backfill (one build instead of per-row maintenance)
+    with op.batch_alter_table('comics', schema=None) as batch_op:
+        batch_op.create_index(
+            'idx_comic_volume_number_sort',
+            ['volume_id', 'sort_number', 'sort_suffix'],
+            unique=False
+        )
+        batch_op.create_index(
+            'idx_comic_volume_reading_sort',
+            ['volume_id', 'format_weight', 'sort_date', 'sort_number', 'sort_suffix'],
+            unique=False
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('comics', schema=None) as batch_op:
+        batch_op.drop_index('idx_comic_volume_reading_sort')
+        batch_op.drop_index('idx_comic_volume_number_sort')
+        batch_op.drop_column('format_weight')
+        batch_op.drop_column('sort_date')
+        batch_op.drop_column('sort_suffix')
+        batch_op.drop_column('sort_number')
@@ -0,0 +1,31 @@
+"""Add fingerprint field to comics table
+
+Revision ID: b81f4a6e2c57
+Revises: 5e0b7c2d9f14
+Create Date: 2026-01-11 14:05:27.918364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f4a6e2c57'
+down_revision: Union[str, None] = '5e0b7c2d9f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows stay NULL until the next scan computes them
+    with op.batch_alter_table('comics', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('fingerprint', sa.String(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_comics_fingerprint'), ['fingerprint'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('comics', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_comics_fingerprint'))
+        batch_op.drop_column('fingerprint')
@@ -0,0 +1,43 @@
+"""Create comic_pages table
+
+Revision ID: bdec7d7c0867
+Revises: c7e0f246b9d2
+Create Date: 2026-01-05 19:42:11.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bdec7d7c0867'
+down_revision: Union[str, None] = 'c7e0f246b9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Page manifest (one row per page, in reading order)
+    # Existing comics get their manifest on the next scan that touches them;
+    # until then the reader falls back to listing the archive.
+    op.create_table(
+        'comic_pages',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('comic_id', sa.Integer(), nullable=False),
+        sa.Column('page_index', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('compressed_size', sa.Integer(), nullable=True),
+        sa.Column('file_size', sa.Integer(), nullable=True),
+        sa.Column('image_type', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['comic_id'], ['comics.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('comic_id', 'page_index', name='unique_comic_page_index')
+    )
+    op.create_index(op.f('ix_comic_pages_id'), 'comic_pages', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_comic_pages_id'), table_name='comic_pages')
+    op.drop_table('comic_pages')
@@ -0,0 +1,28 @@
+"""Add payload field to scan_jobs table
+
+Revision ID: d4e2a9c61f38
+Revises: b81f4a6e2c57
+Create Date: 2026-01-12 10:22:41.306918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e2a9c61f38'
+down_revision: Union[str, None] = 'b81f4a6e2c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('scan_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('payload', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('scan_jobs', schema=None) as batch_op:
+        batch_op.drop_column('payload')
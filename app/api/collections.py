@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload, aliased
-from sqlalchemy import Float, func, select, and_, or_, not_
+from sqlalchemy import func, select, and_, or_, not_
 from typing import List, Annotated
 
 from app.core.comic_helpers import (get_aggregated_metadata, get_series_age_restriction, get_thumbnail_url,
                                     get_banned_comic_condition, check_container_restriction)
 from app.api.deps import SessionDep, CurrentUser, AdminUser, PaginationParams, PaginatedResponse
+from app.services.reading_order import reading_order_cache
 from app.models.collection import Collection, CollectionItem
 from app.models.comic import Comic, Volume
 from app.models.series import Series
@@ -135,7 +136,8 @@ async def get_collection(current_user: CurrentUser,
     items = query.order_by(
         Comic.year.asc(),
         Series.name.asc(),
-        func.cast(Comic.number, Float)
+        Comic.sort_number,
+        Comic.sort_suffix
     ).all()
 
     comics = []
@@ -192,5 +194,6 @@ async def delete_collection(current_user: AdminUser, collection_id: int, db: Ses
     if not collection: raise HTTPException(status_code=404, detail="Collection not found")
     db.delete(collection)
     db.commit()
+    reading_order_cache.invalidate()
 
     return {"message": f"Collection '{collection.name}' deleted"}
\ No newline at end of file
@@ -1,29 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import Response, FileResponse
-from sqlalchemy import Float, func, case, cast, or_
 from sqlalchemy.orm import joinedload, selectinload
-from typing import List, Annotated, Literal
+from typing import List, Annotated, Literal, Optional
 from pathlib import Path
-import re
 import random
 
-from app.core.comic_helpers import (get_reading_time, get_format_sort_index, REVERSE_NUMBERING_SERIES,
+from app.core.comic_helpers import (get_reading_time,
                                     get_age_rating_config, get_series_age_restriction, get_thumbnail_url, get_thumbnail_hash)
 from app.api.deps import SessionDep, CurrentUser, ComicDep
+from app.core.http_cache import make_etag, is_not_modified, not_modified, validator_headers
+from app.core.derivatives import negotiate_derivative, COVER_WIDTH_TIERS, CLIENT_HINTS
 
 from app.models.comic import Comic, Volume
 from app.models.series import Series
 from app.models.library import Library
 from app.models.credits import Person, ComicCredit
-from app.models.reading_list import ReadingList, ReadingListItem
-from app.models.collection import Collection, CollectionItem
-from app.models.pull_list import PullList, PullListItem
+from app.models.reading_list import ReadingList
+from app.models.collection import Collection
+from app.models.pull_list import PullList
 from app.models.reading_progress import ReadingProgress
 from app.models.tags import Character, Team, Location, Genre
 
 from app.schemas.search import SearchRequest, SearchResponse
 from app.services.search import SearchService
 from app.services.images import ImageService
+from app.services.image_executor import image_executor
+from app.services.variant_cache import variant_cache
+from app.services.reading_order import reading_order_cache
 
 
 router = APIRouter()
@@ -40,11 +43,6 @@ def filter_by_user_access(query, user: CurrentUser):
     allowed_ids = [lib.id for lib in user.accessible_libraries]
     return query.filter(Series.library_id.in_(allowed_ids))
 
-def natural_sort_key(s):
-    """Sorts 'Issue 1' before 'Issue 10' and handles '10a'"""
-    return [int(text) if text.isdigit() else text.lower()
-            for text in re.split('([0-9]+)', str(s))]
-
 @router.post("/search", response_model=SearchResponse, name="search")
 async def search_comics(request: SearchRequest, db: SessionDep, current_user: CurrentUser):
     """
@@ -215,23 +213,43 @@ async def get_comic(comic_id: int, db: SessionDep, current_user: CurrentUser):
 
 
 @router.get("/{comic_id}/thumbnail", name="thumbnail")
-async def get_comic_thumbnail(
+def get_comic_thumbnail(
         comic_id: int,
-        db: SessionDep
+        db: SessionDep,
+        request: Request,
+        w: Annotated[Optional[int], Query(ge=1, le=4096, description="Target width in image pixels")] = None
 ):
     """
     Get the thumbnail for a comic (public)
     Serves from storage/cover.
+    OPTIMIZED: Revalidation (If-None-Match / If-Modified-Since) is answered with a 304
+    from a single column lookup, without touching the cover file.
+    RESPONSIVE: w= or Client Hints select a cover width tier, Accept selects AVIF/WebP/JPEG.
     """
-    # 1. Base Query
-    comic = db.query(Comic).filter(Comic.id == comic_id).first()
+    # 1. Base Query (only what the validator and path need)
+    comic = db.query(Comic.id, Comic.updated_at, Comic.file_modified_at, Comic.thumbnail_path, Comic.file_path) \
+        .filter(Comic.id == comic_id).first()
 
     if not comic:
         # We return 404 here to prevent leaking existence of the comic
         raise HTTPException(status_code=404, detail="Comic not found")
 
+    # Covers never go beyond the largest tier
+    derivative = negotiate_derivative(request, w, COVER_WIDTH_TIERS, clamp=True)
+    variant = variant_cache.variant_key(**derivative.variant_flags()) if derivative else None
+
+    # Cover changes when the comic is re-processed (updated_at) or its file changes
     last_mod = int(comic.updated_at.timestamp()) if comic.updated_at else 0
-    etag = f'"{comic_id}-{last_mod}"'
+    file_mod = int(comic.file_modified_at or 0)
+    etag = make_etag(comic_id, last_mod, file_mod, variant or "thumb")
+    last_modified = max(last_mod, file_mod)
+
+    negotiation_headers = {"Vary": f"Accept, Accept-Encoding, {CLIENT_HINTS}", "Accept-CH": CLIENT_HINTS}
+
+    if is_not_modified(request, etag, last_modified):
+        response = not_modified(etag, last_modified)
+        response.headers.update(negotiation_headers)
+        return response
 
     thumb_path = None
 
@@ -248,15 +266,44 @@ async def get_comic_thumbnail(
         if standard_path.exists():
             thumb_path = standard_path
 
+    # 4. Responsive derivative (built once, then served from the variant cache).
+    # Only for comics that have a cover: a missing one is never rendered inside the request.
+    if derivative and thumb_path:
+        cached = variant_cache.get(comic_id, "cover", variant, last_modified)
+        if cached:
+            image_bytes, mime_type = cached
+        else:
+            mime_type = derivative.mime_type
+            image_bytes = image_executor.call(
+                ImageService().render_cover_derivative, thumb_path, comic.file_path, derivative
+            )
+            if image_bytes:
+                variant_cache.put(comic_id, "cover", variant, last_modified, image_bytes, mime_type)
+
+        if image_bytes:
+            return Response(
+                content=image_bytes,
+                media_type=mime_type,
+                headers={**validator_headers(etag, last_modified), **negotiation_headers}
+            )
+
+    if not thumb_path and comic.file_path:
+        # 5. Cover file missing: flag the comic so the next THUMBNAIL job regenerates it.
+        # Only the clean -> dirty transition writes (updated_at kept, so the ETag doesn't churn);
+        # repeated requests, or covers that fail to render, don't write or queue anything.
+        flagged = db.query(Comic).filter(Comic.id == comic_id, Comic.is_dirty == False) \
+            .update({Comic.is_dirty: True, Comic.updated_at: Comic.updated_at}, synchronize_session=False)
+        if flagged:
+            db.commit()
+
     if thumb_path:
 
         return FileResponse(
             thumb_path,
             media_type="image/webp",
             headers={
-                "ETag": etag,
-                "Cache-Control": "public, max-age=31536000",  # 1 year
-                "Vary": "Accept-Encoding"
+                **validator_headers(etag, last_modified),
+                **negotiation_headers
             }
         )
     else:
@@ -294,7 +341,7 @@ async def get_random_backgrounds(
 
 
 @router.get("/covers/manifest", name="cover_manifest")
-async def get_cover_manifest(
+def get_cover_manifest(
         db: SessionDep,
         current_user: CurrentUser,
         context_type: Literal["series", "volume", "reading_list", "collection", "pull_list"],
@@ -331,64 +378,15 @@ async def get_cover_manifest(
     # -------------------------
 
 
-    # --- DEFINE SORT LOGIC (Shared with comic_helpers) ---
-    # Push NULL/-1 dates to bottom (9999)
-    sort_year = case((or_(Comic.year == None, Comic.year == -1), 9999), else_=Comic.year)
-    sort_month = case((or_(Comic.month == None, Comic.month == -1), 99), else_=Comic.month)
-    sort_day = case((or_(Comic.day == None, Comic.day == -1), 99), else_=Comic.day)
-    sort_number = cast(Comic.number, Float)
-
-
-    # 3. Context Filtering & Sorting
-    if context_type == "volume":
-
-        # Check for Gimmick Series Name via simple scalar query first
-        # (Optimization: We could join, but explicit check is safer for logic branching)
-        series_name = db.query(Series.name).join(Volume).filter(Volume.id == context_id).scalar()
-
-        number_direction = sort_number.asc()
-        if series_name and series_name.lower() in REVERSE_NUMBERING_SERIES:
-            number_direction = sort_number.desc()
-
-        query = query.filter(Comic.volume_id == context_id) \
-            .order_by(sort_year.asc(), sort_month.asc(), sort_day.asc(),
-            number_direction)
-
-    elif context_type == "series":
-
-        # Check Name
-        series_name = db.query(Series.name).filter(Series.id == context_id).scalar()
-
-        number_direction = sort_number.asc()
-        if series_name and series_name.lower() in REVERSE_NUMBERING_SERIES:
-            number_direction = sort_number.desc()
-
-        format_weight = get_format_sort_index()
-        query = query.filter(Volume.series_id == context_id) \
-            .order_by(Volume.volume_number, format_weight,
-                      sort_year.asc(), sort_month.asc(), sort_day.asc(), number_direction)
-
-    elif context_type == "reading_list":
-        # Explicit Join: Join ReadingListItem to Comic
-        query = query.join(ReadingListItem, ReadingListItem.comic_id == Comic.id) \
-            .filter(ReadingListItem.reading_list_id == context_id) \
-            .order_by(ReadingListItem.position)
-
-    elif context_type == "pull_list":
-        # Explicit Join: Join PullListItem to Comic
-        # Also ensure we only show the current user's list (though RLS on library covers the content)
-        query = query.join(PullListItem, PullListItem.comic_id == Comic.id) \
-            .filter(PullListItem.pull_list_id == context_id) \
-            .order_by(PullListItem.sort_order)
-
-    elif context_type == "collection":
-        # Explicit Join: Join CollectionItem to Comic
-        # Fixes "Can't determine which FROM clause" error
-        query = query.join(CollectionItem, CollectionItem.comic_id == Comic.id) \
-            .filter(CollectionItem.collection_id == context_id) \
-            .order_by(Comic.year.asc(), Series.name.asc(), func.cast(Comic.number, Float))
+    # 3. Context Ordering
+    # Shared with reader navigation (read-init) so the cover browser and prev/next agree.
+    # The cache holds the ordered ids; this query only fetches the visible rows.
+    order = reading_order_cache.get(db, context_type, context_id, current_user)
+    if not order.ids:
+        return {"total": 0, "items": []}
 
-    items = query.all()
+    rows = query.filter(Comic.id.in_(order.ids)).all()
+    items = sorted(rows, key=lambda r: order.position(r.id))
 
     return {
         "total": len(items),
@@ -96,7 +96,7 @@ async def get_token_optional(
     return None
 
 
-async def get_current_user(
+def get_current_user(
         db: Annotated[Session, Depends(get_db)],
         token: Annotated[str, Depends(get_token_hybrid)]
 ) -> User:
@@ -125,7 +125,7 @@ async def get_current_user(
 
     return user
 
-async def get_current_user_optional(
+def get_current_user_optional(
         db: Annotated[Session, Depends(get_db)],
         token: Annotated[Optional[str], Depends(get_token_optional)]
 ) -> Optional[User]:
@@ -165,7 +165,7 @@ CurrentUser = Annotated[User, Depends(get_current_user)]
 AdminUser = Annotated[User, Depends(get_current_active_superuser)]
 
 # --- LIBRARY DEPENDENCY ---
-async def get_secure_library(
+def get_secure_library(
         library_id: Annotated[int, Path(title="The ID of the library")],
         db: SessionDep,
         user: CurrentUser
@@ -186,7 +186,7 @@ async def get_secure_library(
 
 
 # --- SERIES DEPENDENCY ---
-async def get_secure_series(
+def get_secure_series(
         series_id: Annotated[int, Path(title="The ID of the series")],
         db: SessionDep,
         user: CurrentUser
@@ -210,7 +210,7 @@ async def get_secure_series(
 
 
 # --- VOLUME DEPENDENCY ---
-async def get_secure_volume(
+def get_secure_volume(
         volume_id: Annotated[int, Path(title="The ID of the volume")],
         db: SessionDep,
         user: CurrentUser
@@ -234,7 +234,7 @@ async def get_secure_volume(
     return volume
 
 
-async def get_secure_comic(
+def get_secure_comic(
         comic_id: Annotated[int, Path(title="The ID of the comic to get")],
         db: SessionDep,
         user: CurrentUser
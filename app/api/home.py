@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy import Float
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy.sql.expression import func, desc, cast
+from sqlalchemy.sql.expression import func, desc
 from typing import List
 from datetime import datetime, timezone, timedelta
 from collections import defaultdict
@@ -14,7 +13,7 @@ from app.models.series import Series
 from app.models.user import User
 from app.models.reading_progress import ReadingProgress
 from app.schemas.search import ComicSearchItem
-from app.core.comic_helpers import REVERSE_NUMBERING_SERIES, NON_PLAIN_FORMATS
+from app.core.comic_helpers import REVERSE_NUMBERING_SERIES, NON_PLAIN_FORMATS, issue_sort_key, UNKNOWN_SORT_NUMBER
 
 router = APIRouter()
 
@@ -59,13 +58,6 @@ def _pick_best_cover(series_obj, comics_list):
         if not fmt: return True
         return fmt.lower() not in NON_PLAIN_FORMATS
 
-    # Helper: Safe Sort Key
-    def issue_sort_key(c):
-        try:
-            return float(c.number)
-        except:
-            return 999999
-
     # 1. Gimmick Detection
     is_reverse = series_obj.name.lower() in REVERSE_NUMBERING_SERIES
 
@@ -130,6 +122,8 @@ def get_random_gems(
             Comic.format,
             Comic.publisher,  # Needed for response
             Comic.updated_at,
+            Comic.sort_number,
+            Comic.sort_suffix,
             Volume.series_id
         )
         .join(Volume)
@@ -298,9 +292,9 @@ def get_up_next(
 
         seen_series.add(series_obj.id)
 
-        try:
-            current_number = float(progress.comic.number)
-        except (ValueError, TypeError):
+        # Persisted sort key (skip non-numeric issues like before)
+        current_number = progress.comic.sort_number
+        if current_number is None or current_number == UNKNOWN_SORT_NUMBER:
             continue
 
         # GIMMICK LOGIC
@@ -319,14 +313,14 @@ def get_up_next(
             # Find next issue (LOWER number)
             # We want the largest number that is SMALLER than current
             # e.g. Current=51, we want 50.
-            next_query = next_query.filter(cast(Comic.number, Float) < current_number)
+            next_query = next_query.filter(Comic.sort_number < current_number)
 
         else:
             # Standard Logic (Higher number)
             # Find the next comic
             # We're still going to run 1 query here per series, but it's very fast on SQLite
-            # because it's a simple indexed lookup on (volume_id, number).
-            next_query = next_query.filter(cast(Comic.number, Float) > current_number)
+            # because it's a simple indexed lookup on (volume_id, sort_number).
+            next_query = next_query.filter(Comic.sort_number > current_number)
 
         # --- APPLY AGE FILTER TO SUGGESTION (Series level) ---
         if age_filter is not None:
@@ -334,9 +328,9 @@ def get_up_next(
         # --------------------------------------
 
         if is_reverse:
-            next_comic = next_query.order_by(cast(Comic.number, Float).desc()).first()
+            next_comic = next_query.order_by(Comic.sort_number.desc(), Comic.sort_suffix.desc()).first()
         else:
-            next_comic = next_query.order_by(cast(Comic.number, Float).asc()).first()
+            next_comic = next_query.order_by(Comic.sort_number.asc(), Comic.sort_suffix.asc()).first()
 
         if next_comic:
             # Check memory set instead of DB
@@ -398,6 +392,8 @@ def get_popular(
             Comic.year,
             Comic.format,
             Comic.publisher,
+            Comic.sort_number,
+            Comic.sort_suffix,
             Volume.series_id
         )
         .join(Volume)
@@ -12,7 +12,7 @@ from app.models.library import Library
 router = APIRouter()
 
 def determine_library_name(job_type: JobType, job_library: Library) -> str:
-    if job_type == JobType.CLEANUP and not job_library:
+    if job_type in (JobType.CLEANUP, JobType.REPACK) and not job_library:
         library_name = "-"
     elif not job_library:
         library_name = "Deleted Library"
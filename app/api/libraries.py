@@ -3,13 +3,15 @@ from typing import List, Annotated, Optional
 from pydantic import BaseModel
 from sqlalchemy import func, case
 
-from app.core.comic_helpers import get_thumbnail_url, NON_PLAIN_FORMATS, REVERSE_NUMBERING_SERIES, get_series_age_restriction
+from app.core.comic_helpers import (get_thumbnail_url, NON_PLAIN_FORMATS, REVERSE_NUMBERING_SERIES, get_series_age_restriction,
+                                    issue_sort_key)
 from app.models.library import Library
 from app.models.series import Series
 from app.models.comic import Comic, Volume
 from app.models.reading_progress import ReadingProgress
 from app.services.scan_manager import scan_manager
 from app.services.watcher import library_watcher
+from app.services.reading_order import reading_order_cache
 from app.api.deps import PaginationParams, PaginatedResponse, SessionDep, CurrentUser, AdminUser, LibraryDep
 
 router = APIRouter()
@@ -161,6 +163,8 @@ async def get_library_series(
             Comic.year,
             Comic.format,
             Comic.updated_at,
+            Comic.sort_number,
+            Comic.sort_suffix,
             Volume.series_id,
             Volume.volume_number
         )
@@ -200,12 +204,6 @@ async def get_library_series(
         return f not in NON_PLAIN_FORMATS
 
     # Helper: Safe Sort Key for issues
-    def issue_sort_key(c):
-        try:
-            return float(c.number)
-        except:
-            return 999999
-
     # 3. Serialization & Thumbnails
     items = []
     for s in series_list:
@@ -352,6 +350,7 @@ async def delete_library(library_id: int,
 
     db.delete(library)
     db.commit()
+    reading_order_cache.invalidate()
     return {"message": "Library deleted"}
 
 
@@ -7,6 +7,7 @@ from pydantic import BaseModel
 from app.core.comic_helpers import (get_aggregated_metadata, get_series_age_restriction,
                                     get_thumbnail_url, get_banned_comic_condition)
 from app.api.deps import SessionDep, CurrentUser
+from app.services.reading_order import reading_order_cache
 from app.models.pull_list import PullList, PullListItem
 from app.models.comic import Comic
 from app.models.series import Series
@@ -133,6 +134,8 @@ def update_list(list_id: int, update_data: PullListUpdate, db: SessionDep, curre
 
     db.commit()
     db.refresh(plist)
+    # The list name is the navigation label
+    reading_order_cache.invalidate()
     return plist
 
 
@@ -145,6 +148,7 @@ def delete_list(list_id: int, db: SessionDep, current_user: CurrentUser):
 
     db.delete(plist)
     db.commit()
+    reading_order_cache.invalidate()
     return {"message": "List deleted"}
 
 
@@ -168,6 +172,7 @@ def add_item_to_list(list_id: int, item_data: AddComicRequest, db: SessionDep, c
     new_item = PullListItem(pull_list_id=list_id, comic_id=item_data.comic_id, sort_order=new_order)
     db.add(new_item)
     db.commit()
+    reading_order_cache.invalidate()
 
     return {"message": "Comic added", "sort_order": new_order}
 
@@ -183,6 +188,7 @@ def remove_item_from_list(list_id: int, comic_id: int, db: SessionDep, current_u
 
     db.delete(item)
     db.commit()
+    reading_order_cache.invalidate()
     return {"message": "Item removed"}
 
 
@@ -199,6 +205,7 @@ def reorder_list_items(list_id: int, order_data: ReorderRequest, db: SessionDep,
             item_map[comic_id].sort_order = index
 
     db.commit()
+    reading_order_cache.invalidate()
     return {"message": "List reordered successfully"}
 
 
@@ -228,5 +235,6 @@ def batch_add_items_to_list(list_id: int, batch_data: BatchAddComicRequest, db:
 
     db.add_all(new_items)
     db.commit()
+    reading_order_cache.invalidate()
 
     return {"message": f"Added {len(new_items)} comics to list"}
@@ -1,37 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response, FileResponse
-from sqlalchemy import func, Float, case, or_, cast
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, FileResponse, StreamingResponse
 from sqlalchemy.orm import joinedload
 from typing import List, Annotated, Optional, Literal
 from pathlib import Path
-import re
+from collections import deque
+import os
+import itertools
 import logging
+import zipfile
 
-from app.core.comic_helpers import (get_age_rating_config, get_comic_age_restriction)
-from app.core.comic_helpers import get_format_sort_index, get_format_weight, REVERSE_NUMBERING_SERIES
-from app.api.deps import SessionDep, CurrentUser
-from app.models.comic import Comic, Volume
-from app.models.series import Series
+from app.core.comic_helpers import get_age_rating_config
+from app.core.derivatives import negotiate_derivative, Derivative, PAGE_WIDTH_TIERS, CLIENT_HINTS
+from app.core.http_cache import make_etag, is_not_modified, not_modified, validator_headers
+from app.api.deps import SessionDep, CurrentUser, ComicDep, get_token_optional
+from app.models.comic import Comic, Volume, ComicPage
 
+from app.services.archive import iter_file_range, iter_zip_stream, get_image_mime_type
+from app.services.archive_pool import archive_pool
 from app.services.images import ImageService
+from app.services.variant_cache import variant_cache, VARIANT_EXTENSIONS
+from app.services.read_ahead import read_ahead
+from app.services.reading_order import reading_order_cache
+from app.services.image_executor import image_executor
 from app.models.reading_progress import ReadingProgress
-from app.models.pull_list import PullList, PullListItem
-from app.models.reading_list import ReadingList, ReadingListItem
-from app.models.collection import Collection, CollectionItem
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-def natural_sort_key(s):
-    """Sorts 'Issue 1' before 'Issue 10' and handles '10a'"""
-    return [int(text) if text.isdigit() else text.lower()
-            for text in re.split('([0-9]+)', str(s))]
-
 @router.get("/{comic_id}/read-init", name="init")
-async def get_comic_reader_init(comic_id: int,
+def get_comic_reader_init(comic_id: int,
                                 db: SessionDep,
                                 current_user: CurrentUser,
+                                request: Request,
+                                token: Annotated[Optional[str], Depends(get_token_optional)],
                                 # Context Parameters
                                 context_type: Annotated[
                                     Optional[Literal["volume", "reading_list", "pull_list", "collection", "series"]],
@@ -81,206 +83,24 @@ async def get_comic_reader_init(comic_id: int,
         # -------------------------------------
 
 
-    # Default: No Context (Standard Volume Browsing)
-    prev_id = None
-    next_id = None
-    ids = []
-    context_label = ""
-
-    # Define robust SQL Sort Keys (Date Priority)
-    sort_year = case((or_(Comic.year == None, Comic.year == -1), 9999), else_=Comic.year)
-    sort_month = case((or_(Comic.month == None, Comic.month == -1), 99), else_=Comic.month)
-    sort_day = case((or_(Comic.day == None, Comic.day == -1), 99), else_=Comic.day)
-    sort_number = cast(Comic.number, Float)
-
-    # --- PREPARE NEIGHBOR FILTER ---
-    # FIX: Use Whitelist (get_comic_age_restriction) instead of Negated Blacklist.
-    # This ensures Unrated (NULL) comics are included correctly.
-    safe_filter = get_comic_age_restriction(current_user)
+    # --- READING ORDER ---
+    # Without an explicit context the reader navigates the comic's own volume
+    if not context_id or context_type not in ("pull_list", "reading_list", "collection", "series"):
+        context_type, context_id = "volume", comic.volume_id
 
     logger.debug(f"Context type for reader: {context_type}")
 
-    # --- STRATEGY PATTERN ---
-    if context_type == "pull_list" and context_id:
-        # 1. Pull List Strategy
-
-        context_label = db.query(PullList.name).filter(PullList.id == context_id).scalar()
-
-        # Query items in THIS specific list, ordered by sort_order
-        #Join Comic to avoid Cartesian Product
-        query = db.query(PullListItem.comic_id).join(Comic, PullListItem.comic_id == Comic.id).filter(
-            PullListItem.pull_list_id == context_id
-        )
-
-        if safe_filter is not None:
-            query = query.filter(safe_filter)
-
-        items = query.order_by(PullListItem.sort_order).all()
-
-        # Flatten tuple list [(1,), (2,)] -> [1, 2]
-        ids = [i[0] for i in items]
-
-    elif context_type == "reading_list" and context_id:
-        # 2. Reading List Strategy (Fixes Armageddon 2001)
-
-        context_label = db.query(ReadingList.name).filter(ReadingList.id == context_id).scalar()
-
-        # FIX: Always Join Comic
-        query = db.query(ReadingListItem.comic_id) \
-            .join(Comic, ReadingListItem.comic_id == Comic.id) \
-            .filter(ReadingListItem.reading_list_id == context_id)
-
-        if safe_filter is not None:
-            query = query.filter(safe_filter)
-
-        items = query.order_by(ReadingListItem.position).all()
-
-        ids = [i[0] for i in items]
-
-    elif context_type == "collection" and context_id:
-        # 3. Collection Strategy (Thematic)
-
-        context_label = db.query(Collection.name).filter(Collection.id == context_id).scalar()
-
-        # Collections usually don't have explicit order
-        # Simplified Sort: Year -> Series -> Number
-        query = db.query(CollectionItem.comic_id) \
-            .join(Comic, CollectionItem.comic_id == Comic.id) \
-            .join(Volume, Comic.volume_id == Volume.id) \
-            .join(Series, Volume.series_id == Series.id) \
-            .filter(CollectionItem.collection_id == context_id)
-
-        if safe_filter is not None:
-            query = query.filter(safe_filter)
-
-        items = query.order_by(
-            Comic.year.asc(),
-            Series.name.asc(),
-            func.cast(Comic.number, Float)
-        ).all()
-
-        ids = [i[0] for i in items]
-
-    elif context_type == "series" and context_id:
-        # 4. Series Strategy
-
-        context_label = db.query(Series.name).filter(Series.id == context_id).scalar()
-
-        # Gimmick Detection
-        number_direction = sort_number.asc()
-        if context_label and context_label.lower() in REVERSE_NUMBERING_SERIES:
-            number_direction = sort_number.desc()
-
-        # Use centralized helper
-        format_weight = get_format_sort_index()
-
-        # Series strategy is already optimized (fetches IDs only via ORM selection)
-        # But let's be explicit to avoid object overhead:
-        query = db.query(Comic.id).join(Volume).filter(
-            Volume.series_id == context_id
-        )
-
-        if safe_filter is not None:
-            query = query.filter(safe_filter)
-
-        items = query.order_by(
-            Volume.volume_number,
-            format_weight,  # Plain(1) -> Annual(2) -> Special(3)
-            sort_year.asc(),
-            sort_month.asc(),
-            sort_day.asc(),
-            number_direction
-        ).all()
-
-        ids = [i[0] for i in items]
-
-    else:
-        # 5. Default / Volume Strategy
-        # OPTIMIZATION: Fetch lightweight Tuples instead of full Comic objects.
-        # This prevents instantiating 900 objects for large series.
-
-        # We access relation data safely via the loaded comic object
-        series_name = comic.volume.series.name
-        vol_num = comic.volume.volume_number
-        context_label = f"{series_name} (vol {vol_num})"
-
-        is_reverse = series_name.lower() in REVERSE_NUMBERING_SERIES
-
-        # Query only what we need for the Python sort
-        # Fetch Tuples: (id, number, format, year, month, day)
-        query = db.query(
-            Comic.id, Comic.number, Comic.format,
-            Comic.year, Comic.month, Comic.day
-        ).filter(
-            Comic.volume_id == comic.volume_id
-        )
-
-        if safe_filter is not None:
-            query = query.filter(safe_filter)
-
-        siblings = query.all()
-
-        # Robust Python Sort Logic
-        # Priority: Format -> Date -> Number
-        def smart_sort_key(x):
-            # x[3]=year, x[4]=month, x[5]=day
-            y = x[3] if x[3] is not None and x[3] != -1 else 9999
-            m = x[4] if x[4] is not None and x[4] != -1 else 99
-            d = x[5] if x[5] is not None and x[5] != -1 else 99
-
-            # Number: Natural Sort
-            # If reverse, we rely on the caller to flip OR we handle it here.
-            # Since standard tuple sort is always ASC, handling reverse number
-            # within a multi-key tuple is tricky.
-            # Strategy: We Sort by Date/Format FIRST.
-            # If dates are identical (common in reverse series), we rely on number.
-
-            # To handle reverse number sort in a tuple, we negate the float value if possible,
-            # but natural_sort_key returns a list of strings/ints.
-            # Simplification: We will just sort standardly, then post-process?
-            # No, post-process is inefficient.
-
-            # Better: We trust that Gimmick Series usually have correct Dates (Countdown does).
-            # If Dates are present, Date Sort handles the ordering correctly (May comes before Dec).
-            # If Dates are missing, we fall back to Number.
-
-            return (get_format_weight(x[2]), y, m, d, natural_sort_key(x[1]))
-
-        # Apply Sort
-        siblings.sort(key=smart_sort_key)
-
-        # Gimmick Fallback:
-        # If dates were missing/identical, we might have 1, 2, 3...
-        # If it's a reverse series, we want 3, 2, 1.
-        # Since we can't easily inject DESC into the tuple sort above for just one field,
-        # we check if we should reverse the whole list?
-        # NO. We only want to reverse if the series is reverse AND dates didn't do the job.
-        # Actually, for Countdown, Dates DO the job.
-        # For a series WITHOUT dates that is reverse?
-        if is_reverse:
-            # Check if dates were effectively useless (all same or missing)
-            # If so, reverse the list to get 50, 49, 48...
-            # This is a heuristic, but covers the edge case.
-            unique_dates = {(x[3], x[4], x[5]) for x in siblings}
-            if len(unique_dates) <= 1:
-                siblings.reverse()
-
-        ids = [x[0] for x in siblings]
+    # Cached per (context, age profile); rebuilt on scans and list edits
+    order = reading_order_cache.get(db, context_type, context_id, current_user)
+    if comic.id not in order and order.ids and not order.rebuilt:
+        # Comic imported since the order was built (scan still running): rebuild at most once
+        # per generation, whatever context the client asks for
+        order = reading_order_cache.get(db, context_type, context_id, current_user, rebuild=True)
 
     # --- CALCULATE NEIGHBORS ---
-    try:
-        current_idx = ids.index(comic_id)
-
-        if current_idx > 0:
-            prev_id = ids[current_idx - 1]
-
-        if current_idx < len(ids) - 1:
-            next_id = ids[current_idx + 1]
-
-    except ValueError:
-        # Edge case: The comic currently reading isn't actually IN the context list provided
-        # Fallback to volume logic or return None
-        pass
+    # O(1) position lookup; a comic outside the context list has no neighbours
+    prev_id, next_id = order.neighbours(comic.id)
+    current_idx = order.position(comic.id)
 
     # Page Count Strategy
     # Try DB first (Fast)
@@ -289,13 +109,27 @@ async def get_comic_reader_init(comic_id: int,
     else:
         # Fallback to Physical (Slow but accurate)
         # This handles legacy scans or edge cases
-        image_service = ImageService()
-        page_count = image_service.get_page_count(str(comic.file_path))
+        page_count = image_executor.call(ImageService.get_page_count, str(comic.file_path))
 
         # No Self-heal the DB record here
         # GET requests shouldn't write to DB to avoid locks.
         # The Scanner update will fix this eventually.
 
+    # Let read-ahead warm the start of the next issue as this one nears its end
+    session_key = read_ahead.session_key(token, request.client.host if request.client else None)
+    read_ahead.on_reader_init(session_key, comic.id, next_id)
+
+    # Page Geometry (from the scan-time manifest) so the client can lay out spreads before loading
+    geometry = db.query(ComicPage.width, ComicPage.height, ComicPage.is_double).filter(
+        ComicPage.comic_id == comic.id
+    ).order_by(ComicPage.page_index).all()
+
+    # Only usable if every page was measured (legacy scans / solid archives have gaps)
+    if len(geometry) != page_count or any(g.width is None for g in geometry):
+        pages = None
+    else:
+        pages = [{"width": g.width, "height": g.height, "is_double": g.is_double} for g in geometry]
+
     return {
         "comic_id": comic.id,
         "title": comic.title,
@@ -303,15 +137,16 @@ async def get_comic_reader_init(comic_id: int,
         "volume_number": comic.volume.volume_number,
         "number": comic.number,
         "page_count": page_count,
+        "pages": pages,
         "next_comic_id": next_id,
         "prev_comic_id": prev_id,
 
         # Context Stats
         # We perform safe math in case the list is empty (edge case)
-        "context_position": current_idx + 1 if ids else 0,
-        "context_total": len(ids) if ids else 0,
+        "context_position": current_idx + 1 if current_idx is not None else 0,
+        "context_total": len(order),
         "context_type": context_type,
-        "context_label": context_label
+        "context_label": order.label or ""
     }
 
 
@@ -320,39 +155,155 @@ def get_comic_page(
         comic_id: int,
         page_index: int,
         db: SessionDep,
+        request: Request,
+        token: Annotated[Optional[str], Depends(get_token_optional)],
         sharpen: Annotated[bool, Query()] = False,
         grayscale: Annotated[bool, Query()] = False,
-        webp: Annotated[bool, Query()] = False
+        webp: Annotated[bool, Query()] = False,
+        w: Annotated[Optional[int], Query(ge=1, le=8192, description="Target width in image pixels")] = None
 ):
     """
     Get a specific page image.
     OPTIMIZED: Fetches only the file_path string, not the full Comic object.
+    OPTIMIZED: Resolves the archive entry from the stored page manifest (single indexed lookup).
+    OPTIMIZED: Stored (uncompressed) CBZ pages are streamed straight from their file offset.
+    OPTIMIZED: The following pages are warmed in the background (read-ahead).
+    RESPONSIVE: w= or Client Hints (Viewport-Width/DPR/Save-Data) select a width tier,
+    Accept selects AVIF/WebP/JPEG. No hints = original page.
     """
-    # 1. Fetch Path Only (Scalar Query = <1ms)
-    file_path = db.query(Comic.file_path).filter(Comic.id == comic_id).scalar()
-
-    if not file_path:
+    derivative = negotiate_derivative(request, w, PAGE_WIDTH_TIERS)
+    if derivative:
+        # Codec comes from Accept instead
+        webp = False
+
+    with read_ahead.foreground():
+        response = _serve_comic_page(request, db, comic_id, page_index, sharpen, grayscale, webp, derivative)
+
+    # Same URL, different bytes depending on these headers
+    response.headers["Vary"] = f"Accept, {CLIENT_HINTS}"
+    response.headers["Accept-CH"] = CLIENT_HINTS
+
+    # Revalidation: the client already has this page (and likely its neighbours)
+    if response.status_code == 304:
+        return response
+
+    # Scheduled after this page is ready, so it never delays it
+    session_key = read_ahead.session_key(token, request.client.host if request.client else None)
+    read_ahead.on_page_request(session_key, comic_id, page_index,
+                               sharpen=sharpen, grayscale=grayscale, webp=webp, derivative=derivative)
+
+    return response
+
+
+def _serve_comic_page(request: Request, db, comic_id: int, page_index: int,
+                      sharpen: bool, grayscale: bool, webp: bool, derivative: Optional[Derivative]):
+    # 1. Fetch Path + Manifest Entry (Single indexed query)
+    row = db.query(
+        Comic.file_path, Comic.file_modified_at,
+        ComicPage.filename, ComicPage.file_size, ComicPage.compressed_size,
+        ComicPage.compress_type, ComicPage.data_offset, ComicPage.width
+    ) \
+        .outerjoin(ComicPage, (ComicPage.comic_id == Comic.id) & (ComicPage.page_index == page_index)) \
+        .filter(Comic.id == comic_id) \
+        .first()
+
+    if not row or not row.file_path:
         raise HTTPException(status_code=404, detail="Comic not found")
 
-    image_service = ImageService()
-    image_bytes, is_correct_format, mime_type = image_service.get_page_image(
-        str(file_path),
-        page_index,
-        sharpen=sharpen,
-        grayscale=grayscale,
-        transcode_webp=webp
+    file_path, scanned_mtime, entry_name = row.file_path, row.file_modified_at, row.filename
+
+    try:
+        source_stat = os.stat(file_path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="Page not found")
+
+    # 2. Stale Check: If the file changed since the scan, the manifest can't be trusted.
+    # Fall back to listing the archive until the scanner catches up.
+    if entry_name and (not scanned_mtime or source_stat.st_mtime > scanned_mtime):
+        entry_name = None
+
+    # Page already fits the width tier: skip the derivative so it can stream zero-copy / raw
+    if derivative and entry_name and not sharpen and not grayscale and derivative.fits(row.width):
+        derivative = None
+
+    # Conditional GET: validator = comic + page + source mtime + variant flags.
+    # A revalidating client gets a 304 before any archive is opened.
+    variant = variant_cache.variant_key(
+        sharpen=sharpen, grayscale=grayscale, webp=webp,
+        **(derivative.variant_flags() if derivative else {})
     )
+    etag = make_etag(comic_id, page_index, source_stat.st_mtime_ns, variant or "raw")
+    if is_not_modified(request, etag, source_stat.st_mtime):
+        return not_modified(etag, source_stat.st_mtime)
+
+    # 3. ZERO-COPY PATH: Stored entry + no processing -> stream the byte range from disk.
+    # Memory per in-flight page is one chunk instead of the whole image (twice).
+    if entry_name and row.data_offset is not None and row.compress_type == zipfile.ZIP_STORED \
+            and row.file_size is not None and row.file_size == row.compressed_size:
+
+        mime_type = get_image_mime_type(entry_name)
+
+        if not variant and not ImageService.needs_transcode(row.file_size, mime_type, webp):
+            extension = mime_type.split("/")[-1].replace("jpeg", "jpg")
+            return StreamingResponse(
+                iter_file_range(Path(file_path), row.data_offset, row.file_size),
+                media_type=mime_type,
+                headers={
+                    "Content-Length": str(row.file_size),
+                    "Content-Disposition": f'inline; filename="page_{page_index}.{extension}"',
+                    **validator_headers(etag, source_stat.st_mtime)
+                }
+            )
+
+    # 4. VARIANT CACHE: Processed pages are built once per (comic, page, flags, source mtime)
+    if variant:
+        cached = variant_cache.get(comic_id, page_index, variant, source_stat.st_mtime_ns)
+        if cached:
+            image_bytes, mime_type = cached
+            return Response(
+                content=image_bytes,
+                media_type=mime_type,
+                headers={
+                    "Content-Disposition": f'inline; filename="page_{page_index}.{VARIANT_EXTENSIONS[mime_type]}"',
+                    **validator_headers(etag, source_stat.st_mtime)
+                }
+            )
+
+    image_service = ImageService()
+
+    if variant:
+        image_bytes, is_correct_format, mime_type = image_executor.call(
+            image_service.render_page_variant,
+            comic_id,
+            str(file_path),
+            page_index,
+            source_stat.st_mtime_ns,
+            sharpen=sharpen,
+            grayscale=grayscale,
+            transcode_webp=webp,
+            entry_name=entry_name,
+            derivative=derivative
+        )
+    else:
+        # Raw page warmed by read-ahead?
+        warmed = read_ahead.cache.get((comic_id, page_index, source_stat.st_mtime_ns))
+        if warmed:
+            image_bytes, mime_type = warmed
+            is_correct_format = True
+        else:
+            image_bytes, is_correct_format, mime_type = image_executor.call(
+                image_service.get_page_image,
+                str(file_path),
+                page_index,
+                entry_name=entry_name
+            )
 
     if not image_bytes:
         raise HTTPException(status_code=404, detail="Page not found")
 
-    # 3. Construct Headers
+    # 5. Construct Headers
     # We use the returned mime_type to determine the correct extension for the browser
-    extension = "webp" if mime_type == "image/webp" else "jpg"
-
-    # Check if the original detected type was PNG/GIF for the filename if we didn't transcode
-    if not webp and mime_type == "image/png": extension = "png"
-    if not webp and mime_type == "image/gif": extension = "gif"
+    extension = VARIANT_EXTENSIONS.get(mime_type, "jpg")
 
     # CACHE LOGIC
     headers = {
@@ -360,8 +311,8 @@ def get_comic_page(
     }
 
     if is_correct_format:
-        # Success: Cache aggressively
-        headers["Cache-Control"] = "public, max-age=31536000"
+        # Success: Cache aggressively (and allow cheap revalidation)
+        headers.update(validator_headers(etag, source_stat.st_mtime))
     else:
         # Fallback triggered: DO NOT CACHE
         # This prevents the raw image from being permanently cached
@@ -373,3 +324,140 @@ def get_comic_page(
         media_type=mime_type,
         headers=headers
     )
+
+
+# Upper bound for one bundle request (keeps memory/CPU per request predictable)
+BUNDLE_MAX_PAGES = 32
+
+
+@router.get("/{comic_id}/pages", name="comic_pages")
+def get_comic_pages_bundle(
+        comic: ComicDep,
+        db: SessionDep,
+        request: Request,
+        start: Annotated[int, Query(alias="from", ge=0)] = 0,
+        count: Annotated[int, Query(ge=1, le=BUNDLE_MAX_PAGES)] = 8,
+        sharpen: Annotated[bool, Query()] = False,
+        grayscale: Annotated[bool, Query()] = False,
+        webp: Annotated[bool, Query()] = False,
+        w: Annotated[Optional[int], Query(ge=1, le=8192, description="Target width in image pixels")] = None
+):
+    """
+    Get a range of pages in one response: an uncompressed ZIP, streamed page by page.
+    For high-latency clients (fetch the next 8-16 pages at once) and offline reading.
+    Entries are named by page index (0004.jpg) and carry the same bytes as the page endpoint.
+    OPTIMIZED: Raw pages are read through one pooled archive handle.
+    OPTIMIZED: Processed variants render in parallel on the image executor (and fill the variant cache).
+    """
+    try:
+        source_stat = os.stat(comic.file_path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="Comic file not found")
+
+    page_count = comic.page_count or image_executor.call(ImageService.get_page_count, str(comic.file_path))
+    end = min(start + count, page_count)
+    if start >= end:
+        raise HTTPException(status_code=404, detail="Page range not found")
+
+    derivative = negotiate_derivative(request, w, PAGE_WIDTH_TIERS)
+    if derivative:
+        webp = False
+    variant = variant_cache.variant_key(
+        sharpen=sharpen, grayscale=grayscale, webp=webp,
+        **(derivative.variant_flags() if derivative else {})
+    )
+
+    # Authenticated content: private caches only
+    cache_control = "private, max-age=31536000"
+    etag = make_etag(comic.id, start, end, source_stat.st_mtime_ns, variant or "raw")
+    if is_not_modified(request, etag, source_stat.st_mtime):
+        return not_modified(etag, source_stat.st_mtime, cache_control=cache_control)
+
+    # Entry names: manifest if the file is unchanged since the scan, else list the archive once
+    entry_names = {}
+    if comic.file_modified_at and source_stat.st_mtime <= comic.file_modified_at:
+        entry_names = dict(
+            db.query(ComicPage.page_index, ComicPage.filename)
+            .filter(ComicPage.comic_id == comic.id, ComicPage.page_index >= start, ComicPage.page_index < end)
+            .all()
+        )
+
+    if len(entry_names) < end - start:
+        with archive_pool.open(Path(comic.file_path)) as archive:
+            names = archive.get_pages()
+        entry_names = {index: names[index] for index in range(start, min(end, len(names)))}
+
+    pages = _iter_bundle_pages(comic.id, str(comic.file_path), source_stat.st_mtime_ns, entry_names,
+                               sharpen, grayscale, webp, derivative, variant)
+
+    return StreamingResponse(
+        iter_zip_stream(pages),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="comic_{comic.id}_pages_{start}-{end - 1}.zip"',
+            "X-Page-Range": f"{start}-{end - 1}",
+            "X-Page-Count": str(page_count),
+            "Vary": f"Accept, {CLIENT_HINTS}",
+            **validator_headers(etag, source_stat.st_mtime, cache_control=cache_control)
+        }
+    )
+
+
+def _iter_bundle_pages(comic_id: int, file_path: str, mtime_ns: int, entry_names: dict,
+                       sharpen: bool, grayscale: bool, webp: bool,
+                       derivative: Optional[Derivative], variant: str):
+    """Yield (zip entry name, bytes) in page order"""
+    indices = sorted(entry_names)
+
+    if not variant:
+        # Raw bytes: short borrows of the same pooled handle, one page at a time
+        for index in indices:
+            entry_name = entry_names[index]
+            try:
+                with archive_pool.open(Path(file_path)) as archive:
+                    data = archive.read_file(entry_name)
+            except Exception as e:
+                logger.warning(f"Bundle skipped page {index} of comic {comic_id}: {e}")
+                continue
+            yield f"{index:04d}{Path(entry_name).suffix.lower()}", data
+        return
+
+    image_service = ImageService()
+
+    def render(index: int):
+        cached = variant_cache.get(comic_id, index, variant, mtime_ns)
+        if cached:
+            return cached
+        data, success, mime_type = image_service.render_page_variant(
+            comic_id, file_path, index, mtime_ns,
+            sharpen=sharpen, grayscale=grayscale, transcode_webp=webp,
+            entry_name=entry_names[index], derivative=derivative
+        )
+        return data, mime_type
+
+    # Small window of renders ahead of the stream: half the shared executor at most, so
+    # single-page requests from other readers don't queue behind a whole bundle
+    window = max(1, image_executor.max_workers // 2)
+    pending = deque()
+    remaining = iter(indices)
+    try:
+        for index in itertools.islice(remaining, window):
+            pending.append((index, image_executor.submit(render, index)))
+
+        while pending:
+            index, future = pending.popleft()
+            next_index = next(remaining, None)
+            if next_index is not None:
+                pending.append((next_index, image_executor.submit(render, next_index)))
+
+            try:
+                data, mime_type = future.result()
+            except Exception as e:
+                logger.warning(f"Bundle skipped page {index} of comic {comic_id}: {e}")
+                continue
+            if data:
+                yield f"{index:04d}.{VARIANT_EXTENSIONS.get(mime_type, 'jpg')}", data
+    finally:
+        # Client went away (generator closed): don't render pages nobody will receive
+        for _, future in pending:
+            future.cancel()
@@ -4,6 +4,7 @@ from sqlalchemy import func, select, and_, or_, not_
 from typing import Annotated, List
 
 from app.api.deps import SessionDep, CurrentUser, PaginationParams, PaginatedResponse
+from app.services.reading_order import reading_order_cache
 from app.core.comic_helpers import (get_aggregated_metadata,
                                     get_thumbnail_url, get_banned_comic_condition,
                                     check_container_restriction)
@@ -184,5 +185,6 @@ async def delete_reading_list(list_id: int, db: SessionDep, current_user: Curren
     if not reading_list: raise HTTPException(status_code=404, detail="Reading list not found")
     db.delete(reading_list)
     db.commit()
+    reading_order_cache.invalidate()
 
     return {"message": f"Reading list '{reading_list.name}' deleted"}
\ No newline at end of file
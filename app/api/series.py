@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
-from sqlalchemy import func, case, Float, and_, literal, not_
+from sqlalchemy import func, case, and_, literal, not_
 from sqlalchemy.orm import joinedload, aliased
 from typing import List, Optional, Annotated
 from datetime import datetime, timezone
@@ -8,7 +8,7 @@ from collections import defaultdict
 from app.core.comic_helpers import (get_format_filters, get_smart_cover, get_reading_time,
                                     get_thumbnail_url, get_thumbnail_hash,
                                     NON_PLAIN_FORMATS, REVERSE_NUMBERING_SERIES,
-                                    get_series_age_restriction, get_banned_comic_condition)
+                                    get_series_age_restriction, get_banned_comic_condition, issue_sort_key)
 from app.api.deps import SessionDep, CurrentUser, AdminUser, SeriesDep
 from app.api.deps import PaginationParams, PaginatedResponse
 
@@ -57,6 +57,8 @@ def bulk_serialize_series(series_list: List[Series], db, current_user) -> List[d
             Comic.year,
             Comic.format,
             Comic.updated_at,
+            Comic.sort_number,
+            Comic.sort_suffix,
             Volume.series_id
         )
         .join(Volume)
@@ -90,13 +92,6 @@ def bulk_serialize_series(series_list: List[Series], db, current_user) -> List[d
         if not fmt: return True
         return fmt.lower() not in NON_PLAIN_FORMATS
 
-    # Helper: Safe Sort Key
-    def issue_sort_key(c):
-        try:
-            return float(c.number)
-        except:
-            return 999999
-
     # 3. Stitch it all together
     results = []
     for s in series_list:
@@ -194,7 +189,7 @@ async def get_series_detail(series: SeriesDep, db: SessionDep, current_user: Cur
         .join(Volume) \
         .filter(Comic.volume_id.in_(volume_ids)) \
         .filter(Comic.story_arc != None, Comic.story_arc != "") \
-        .order_by(Volume.volume_number, func.cast(Comic.number, Float), Comic.number) \
+        .order_by(Volume.volume_number, Comic.sort_number, Comic.sort_suffix) \
         .all()
 
     # Process in Python
@@ -299,7 +294,8 @@ async def get_series_detail(series: SeriesDep, db: SessionDep, current_user: Cur
 
     # B. Volume Covers (First Issue per Volume)
     # Fetch ALL comics meta for smart selection (Lightweight query)
-    all_comics_meta = (db.query(Comic.id, Comic.volume_id, Comic.number, Comic.format, Comic.updated_at)
+    all_comics_meta = (db.query(Comic.id, Comic.volume_id, Comic.number, Comic.format, Comic.updated_at,
+                                Comic.sort_number, Comic.sort_suffix)
                        .filter(Comic.volume_id.in_(volume_ids)).all())
 
     # Group by Volume
@@ -313,12 +309,6 @@ async def get_series_detail(series: SeriesDep, db: SessionDep, current_user: Cur
         f = fmt.lower()
         return f not in NON_PLAIN_FORMATS
 
-    def issue_sort_key(c):
-        try:
-            return float(c.number)
-        except:
-            return 999999
-
     # Check for Gimmick Series Name once
     is_reverse_series = series.name.lower() in REVERSE_NUMBERING_SERIES
 
@@ -462,8 +452,8 @@ async def get_series_issues(
     # We define the 3-stage sort keys:
     # 1. Volume (Major)
     # 2. Numeric Value (9 before 10)
-    # 3. String Value (10a before 10b)
-    sort_keys = [Volume.volume_number, func.cast(Comic.number, Float), Comic.number]
+    # 3. Suffix (10a before 10b)
+    sort_keys = [Volume.volume_number, Comic.sort_number, Comic.sort_suffix]
     if sort_order == "desc":
         # Reverse ALL keys to ensure "Vol 2 #10" comes before "Vol 1 #1"
         query = query.order_by(*[k.desc() for k in sort_keys])
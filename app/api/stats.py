@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy import func, case, desc
 from typing import Annotated
+import os
 
 from app.api.deps import SessionDep, AdminUser
 from app.models.comic import Comic, Volume
@@ -9,6 +10,13 @@ from app.models.library import Library
 from app.models.tags import Genre, comic_genres
 from app.models.user import User
 from app.models.reading_progress import ReadingProgress
+from app.services.archive_pool import archive_pool
+from app.services.extraction_cache import extraction_cache
+from app.services.variant_cache import variant_cache
+from app.services.read_ahead import read_ahead
+from app.services.reading_order import reading_order_cache
+from app.services.image_executor import image_executor
+from app.services.image_pool import image_pool
 
 router = APIRouter()
 
@@ -90,4 +98,22 @@ async def get_genre_stats(db: SessionDep, user: AdminUser):
             "size_bytes": row.total_bytes or 0
         }
         for row in stats
-    ]
\ No newline at end of file
+    ]
+
+@router.get("/caches", name="caches")
+async def get_cache_stats(admin: AdminUser):
+    """
+    Hit/miss counters for the reader's in-process caches, plus image executor queue depth/wait times
+    and the image worker pool's job counters.
+    Counters are per worker process (pid included so multiple workers can be told apart).
+    """
+    return {
+        "pid": os.getpid(),
+        "archive_pool": archive_pool.stats(),
+        "cbr_extraction": extraction_cache.stats(),
+        "page_variants": variant_cache.stats(),
+        "read_ahead": read_ahead.stats(),
+        "reading_order": reading_order_cache.stats(),
+        "image_executor": image_executor.stats(),
+        "image_pool": image_pool.stats()
+    }
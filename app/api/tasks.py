@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends
+from typing import Optional
 
 from app.api.deps import SessionDep, AdminUser
 from app.models.library import Library
 from app.services.maintenance import MaintenanceService
 from app.services.backup import BackupService
 from app.services.scan_manager import scan_manager
+from app.services.variant_cache import variant_cache
 
 router = APIRouter()
 
@@ -77,3 +79,31 @@ async def run_colorscape_refresh_task(
         "message": f"Queued background processing for {queued_count} libraries.",
         "stats": {"libraries_queued": queued_count}
     }
+
+
+@router.post("/repack", name="repack")
+async def run_repack_task(
+        admin: AdminUser,
+        library_id: Optional[int] = None
+):
+    """
+    Queue a background job that repacks CBR/CB7 archives into uncompressed (stored) CBZ files.
+    Reading progress and list membership are preserved. Omit library_id to repack every library.
+    """
+    return scan_manager.add_repack_task(library_id=library_id)
+
+
+@router.post("/purge-page-cache", name="purge_page_cache")
+async def run_purge_page_cache_task(
+        admin: AdminUser
+):
+    """
+    Delete every cached processed page variant (WebP/sharpen/grayscale).
+    They are rebuilt on demand.
+    """
+    freed = variant_cache.clear()
+
+    return {
+        "message": "Page cache purged",
+        "stats": {"bytes_freed": freed}
+    }
@@ -20,6 +20,7 @@ from app.models.library import Library
 from app.models.reading_progress import ReadingProgress
 from app.models.pull_list import PullList, PullListItem
 from app.services.images import ImageService
+from app.services.image_executor import image_executor
 from app.services.settings_service import SettingsService
 from app.services.statistics import StatisticsService
 
@@ -164,17 +165,20 @@ async def get_user_dashboard(db: SessionDep, current_user: CurrentUser):
 
 
 @router.post("/me/avatar", name="upload_avatar")
-async def upload_avatar(
+def upload_avatar(
         file: UploadFile = File(...),
         db: SessionDep = SessionDep,
         current_user: CurrentUser = CurrentUser
 ):
-    """Upload and save user avatar"""
+    """
+    Upload and save user avatar.
+    Sync route: the upload read, Pillow work and DB commit all stay off the event loop.
+    """
     # HTTP Validation
     if file.content_type not in ["image/jpeg", "image/png", "image/webp"]:
         raise HTTPException(400, "Invalid image format")
 
-    content = await file.read()
+    content = file.file.read()
     if len(content) > MAX_AVATAR_SIZE_BYTES:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
@@ -189,8 +193,9 @@ async def upload_avatar(
     filename = f"user_{current_user.id}.webp"
     file_path = upload_dir / filename
 
+    # Pillow decode/resize/encode on the bounded image executor
     svc = ImageService()
-    success = svc.process_avatar(content, file_path)
+    success = image_executor.call(svc.process_avatar, content, file_path)
 
     if not success:
         raise HTTPException(status_code=500, detail="Failed to process image")
@@ -206,7 +211,7 @@ async def upload_avatar(
 
 # Helper to serve avatar (add to users router or generic image router)
 @router.get("/{user_id}/avatar", name="avatar")
-async def get_avatar(user_id: int, db: SessionDep):
+def get_avatar(user_id: int, db: SessionDep):
     """Serve user avatar"""
     user = db.query(User).filter(User.id == user_id).first()
 
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, case, Float, Integer, literal, or_
+from sqlalchemy import func, case, Integer, literal, or_
 from sqlalchemy.orm import joinedload
 
 from typing import List, Annotated
@@ -100,7 +100,7 @@ async def get_volume_detail(volume: VolumeDep, db: SessionDep, current_user: Cur
     arc_rows = db.query(Comic.id, Comic.story_arc, Comic.number) \
         .filter(Comic.volume_id == volume.id) \
         .filter(Comic.story_arc != None, Comic.story_arc != "") \
-        .order_by(func.cast(Comic.number, Float), Comic.number) \
+        .order_by(Comic.sort_number, Comic.sort_suffix) \
         .all()
 
     # Group by Arc Name
@@ -365,8 +365,9 @@ async def get_volume_issues(
     # Smart Sorting Strategy
     # We define the 2-stage sort keys:
     # 1. Numeric Value (9 before 10)
-    # 2. String Value (10a before 10b)
-    sort_keys = [func.cast(Comic.number, Float), Comic.number]
+    # 2. Suffix (10a before 10b)
+    # Both persisted at scan time: ORDER BY + LIMIT walks idx_comic_volume_number_sort
+    sort_keys = [Comic.sort_number, Comic.sort_suffix]
 
     if sort_order == "desc":
         query = query.order_by(*[k.desc() for k in sort_keys])
@@ -34,6 +34,17 @@ class Settings(BaseSettings):
     thumbnail_size: tuple[float, float] = (320, 455)
     avatar_size: tuple[float, float] = (400, 400)  # standard avatar box
 
+    # Reader: pool of open archive handles (per worker process)
+    archive_pool_size: int = 32
+    archive_pool_idle_seconds: int = 300
+
+    # Reader: threads for archive reads + Pillow work (bounds concurrent decodes per worker process)
+    image_executor_workers: int = 4
+
+    # Reader: background read-ahead (pages warmed past the current one, 0 disables)
+    read_ahead_depth: int = 8
+    read_ahead_cache_mb: int = 64
+
     # Supported formats
     supported_extensions: list = [".cbz", ".cbr"]
 
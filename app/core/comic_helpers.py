@@ -1,7 +1,8 @@
 import logging
+import re
 from datetime import datetime, timezone
 from functools import lru_cache
-from sqlalchemy import func, or_, not_, case, cast, Float
+from sqlalchemy import func, or_, not_, case
 from typing import Any
 from fastapi import HTTPException
 from sqlalchemy import func, or_, not_, case
@@ -234,11 +235,8 @@ def get_smart_cover(base_query, series_name: str = None):
     """
     is_plain, _, _ = get_format_filters()
 
-    # Define Sort Logic
-    sort_year = case((or_(Comic.year == None, Comic.year == -1), 9999), else_=Comic.year)
-    sort_month = case((or_(Comic.month == None, Comic.month == -1), 99), else_=Comic.month)
-    sort_day = case((or_(Comic.day == None, Comic.day == -1), 99), else_=Comic.day)
-    sort_number = cast(Comic.number, Float)
+    # Define Sort Logic (persisted keys: Date -> Number)
+    sort_number = Comic.sort_number
 
     # GIMMICK DETECTION
     # If this is a known reverse-numbering series, we want the HIGHEST number
@@ -253,9 +251,7 @@ def get_smart_cover(base_query, series_name: str = None):
         .filter(not_(Comic.number.like('-%'))) \
         .filter(not_(Comic.number.like('%.5'))) \
         .order_by(
-        sort_year.asc(),
-        sort_month.asc(),
-        sort_day.asc(),
+        Comic.sort_date.asc(),
         number_direction  # Dynamic Sort Direction
     )
 
@@ -265,9 +261,7 @@ def get_smart_cover(base_query, series_name: str = None):
 
     # PHASE 2: Fallback
     return base_query.order_by(
-        sort_year.asc(),
-        sort_month.asc(),
-        sort_day.asc(),
+        Comic.sort_date.asc(),
         number_direction
     ).first()
 
@@ -288,24 +282,6 @@ def get_reading_time(total_pages):
     return read_time
 
 
-# Helper for SQL Order By
-def get_format_sort_index():
-    """
-    Returns a SQLAlchemy CASE expression to weight formats.
-    Usage: query.order_by(get_format_sort_index(), ...)
-
-    Weights:
-    1: Plain Issues (Default)
-    2: Annuals
-    3: Specials / Other Non-Plain
-    """
-    return case(
-        (func.lower(Comic.format) == 'annual', 2),
-        (func.lower(Comic.format).in_(NON_PLAIN_FORMATS), 3),
-        else_=1
-    )
-
-
 # Helper for Python Sorting
 def get_format_weight(fmt_string: str) -> int:
     """
@@ -324,6 +300,51 @@ def get_format_weight(fmt_string: str) -> int:
     return 1
 
 
+# Persisted Sort Keys (computed at scan time, see Comic.sort_*)
+# Sentinels push unknown values last. Dates match the old CASE fallbacks; issue numbers
+# don't: SQLite's CAST('Alpha' AS FLOAT) is 0, so non-numeric issues used to sort first in
+# SQL listings (and last in the Python-side sorts). They now sort last everywhere.
+UNKNOWN_SORT_NUMBER = 999999.0
+UNKNOWN_SORT_DATE = 99999999
+
+_ISSUE_NUMBER_RE = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*(.*)$')
+
+
+def get_sort_keys(number: str, fmt: str, year: int, month: int, day: int) -> dict:
+    """
+    Canonical ordering columns for a comic.
+    - sort_number: numeric part of the issue ("10a" -> 10.0, "-1" -> -1.0, "Alpha" -> unknown)
+    - sort_suffix: whatever follows it, lowercased ("10a" -> "a"), or the whole label if not numeric
+    - sort_date: YYYYMMDD with missing parts as 9999/99/99
+    - format_weight: Plain(1) -> Annual(2) -> Special(3)
+    """
+    sort_number, sort_suffix = UNKNOWN_SORT_NUMBER, ""
+    if number:
+        match = _ISSUE_NUMBER_RE.match(number)
+        if match:
+            sort_number = float(match.group(1))
+            sort_suffix = match.group(2).strip().lower()
+        else:
+            sort_suffix = number.strip().lower()
+
+    y = year if year is not None and year != -1 else 9999
+    m = month if month is not None and month != -1 else 99
+    d = day if day is not None and day != -1 else 99
+
+    return {
+        "sort_number": sort_number,
+        "sort_suffix": sort_suffix,
+        "sort_date": y * 10000 + m * 100 + d,
+        "format_weight": get_format_weight(fmt),
+    }
+
+
+def issue_sort_key(comic) -> tuple:
+    """Python-side issue order for already loaded comics (same order as the indexed columns)"""
+    number = comic.sort_number if comic.sort_number is not None else UNKNOWN_SORT_NUMBER
+    return number, comic.sort_suffix or ""
+
+
 # Aggregation Helper
 def get_aggregated_metadata(
         db: SessionDep,
@@ -0,0 +1,111 @@
+from typing import Optional, Sequence
+
+from fastapi import Request
+from PIL import Image
+
+# Widths (device pixels) a request is snapped to, so the variant cache stays small
+PAGE_WIDTH_TIERS = (480, 720, 1080, 1440, 1920, 2560)
+COVER_WIDTH_TIERS = (160, 320, 640)
+
+# Advertised on responses so browsers start sending the hints; also the Vary list
+CLIENT_HINTS = "DPR, Viewport-Width, Save-Data"
+
+Image.init()
+AVIF_SUPPORTED = "AVIF" in Image.SAVE
+WEBP_SUPPORTED = "WEBP" in Image.SAVE
+
+
+class Derivative:
+    """A negotiated rendition: width tier, codec and Save-Data quality"""
+
+    def __init__(self, width: int, codec: str, save_data: bool = False):
+        self.width = width
+        self.codec = codec
+        self.save_data = save_data
+
+    @property
+    def mime_type(self) -> str:
+        return f"image/{self.codec}"
+
+    @property
+    def quality(self) -> int:
+        # Save-Data: visibly softer, roughly half the bytes
+        if self.codec == "avif":
+            return 40 if self.save_data else 60
+        if self.codec == "jpeg":
+            return 65 if self.save_data else 85
+        return 55 if self.save_data else 75
+
+    def fits(self, source_width: Optional[int]) -> bool:
+        """
+        Source is already no wider than the tier: resizing would be a no-op, so serving the
+        original beats a lossy re-encode. Save-Data still re-encodes (it asks for fewer bytes).
+        """
+        return source_width is not None and source_width <= self.width and not self.save_data
+
+    def variant_flags(self) -> dict:
+        """Flags for the variant cache key"""
+        return {f"w{self.width}": True, f"as{self.codec}": True, "lite": self.save_data}
+
+
+def _float_header(request: Request, *names: str) -> Optional[float]:
+    for name in names:
+        value = request.headers.get(name)
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+def snap_width(target: float, tiers: Sequence[int]) -> Optional[int]:
+    """Smallest tier that covers the target; None when even the largest tier is too small"""
+    for tier in tiers:
+        if tier >= target:
+            return tier
+    return None
+
+
+def pick_codec(accept: str) -> str:
+    accept = (accept or "").lower()
+    if AVIF_SUPPORTED and "image/avif" in accept:
+        return "avif"
+    if WEBP_SUPPORTED and "image/webp" in accept:
+        return "webp"
+    return "jpeg"
+
+
+def negotiate_derivative(request: Request, width: Optional[int], tiers: Sequence[int],
+                         clamp: bool = False) -> Optional[Derivative]:
+    """
+    Resolve the target width and pick a codec from Accept.
+    - ?w= is in image pixels (like a srcset w descriptor)
+    - Viewport-Width is in CSS pixels and is multiplied by DPR (capped at 1 with Save-Data)
+    Returns None when the client asked for nothing (legacy behaviour: original image),
+    or when the target is beyond the largest tier (unless clamp=True).
+    """
+    save_data = request.headers.get("save-data", "").strip().lower() == "on"
+
+    if width:
+        target = width
+    else:
+        viewport = _float_header(request, "viewport-width", "sec-ch-viewport-width")
+        if not viewport or viewport <= 0:
+            return None
+
+        dpr = _float_header(request, "dpr", "sec-ch-dpr") or 1.0
+        dpr = 1.0 if save_data else min(max(dpr, 1.0), 3.0)
+        target = viewport * dpr
+
+    tier = snap_width(target, tiers)
+    if tier is None:
+        if not clamp:
+            return None
+        tier = tiers[-1]
+
+    return Derivative(
+        width=tier,
+        codec=pick_codec(request.headers.get("accept", "")),
+        save_data=save_data
+    )
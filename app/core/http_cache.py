@@ -0,0 +1,54 @@
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Long-lived immutable assets (URLs carry a version or the validator changes with the file)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000"
+
+
+def make_etag(*parts) -> str:
+    """Strong validator from the identifying parts, e.g. make_etag(comic_id, mtime_ns, 'webp')"""
+    return '"' + "-".join(str(p) for p in parts) + '"'
+
+
+def http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[float] = None) -> bool:
+    """
+    RFC 9110 revalidation: If-None-Match wins when present, If-Modified-Since otherwise.
+    Uses weak comparison for If-None-Match (allowed for GET/HEAD).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have 1s resolution
+        return int(last_modified) <= since
+
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[float] = None,
+                      cache_control: str = IMMUTABLE_CACHE_CONTROL) -> dict:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(etag: str, last_modified: Optional[float] = None,
+                 cache_control: str = IMMUTABLE_CACHE_CONTROL) -> Response:
+    """Empty 304 carrying the same validators/caching headers as the full response"""
+    return Response(status_code=304, headers=validator_headers(etag, last_modified, cache_control))
@@ -27,6 +27,8 @@ from app.services.scheduler import scheduler_service
 from app.models.user import User
 
 from app.services.watcher import library_watcher
+from app.services.image_executor import image_executor
+from app.services.image_pool import image_pool
 
 # API Routes
 from app.api import libraries, comics, reader, progress, series, volumes, search
@@ -116,6 +118,9 @@ async def lifespan(app: FastAPI):
     # --- SHUTDOWN ---
     logger.info(f"Worker {worker_pid} shutting down...")
 
+    image_executor.shutdown()
+    image_pool.shutdown()
+
     if is_manager:
         logger.info(f"Worker {worker_pid} is Manager, also stopping services...")
         library_watcher.stop()
@@ -1,7 +1,7 @@
 # Import all models here so SQLAlchemy can set up relationships
-from app.models.library import Library
+from app.models.library import Library, ScannedDirectory
 from app.models.series import Series
-from app.models.comic import Volume, Comic  # Both Volume and Comic are in comic.py
+from app.models.comic import Volume, Comic, ComicPage  # Volume, Comic and ComicPage are in comic.py
 from app.models.tags import Character, Team, Location, Genre
 from app.models.credits import Person, ComicCredit
 from app.models.reading_list import ReadingList, ReadingListItem
@@ -18,7 +18,7 @@ from app.models.activity_log import ActivityLog
 
 # This ensures all models are loaded before relationships are configured
 __all__ = [
-    'Library', 'Series', 'Volume', 'Comic',
+    'Library', 'ScannedDirectory', 'Series', 'Volume', 'Comic', 'ComicPage',
     'Character', 'Team', 'Location', 'Genre',
     'Person', 'ComicCredit',
     'ReadingList', 'ReadingListItem',
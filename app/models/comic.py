@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, Float, JSON, Index, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, Float, JSON, Index, Boolean, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.database import Base
@@ -23,6 +23,10 @@ class Comic(Base):
 
     __table_args__ = (
         Index('idx_comic_volume_age_rating', 'volume_id', 'age_rating'),
+        # Listings: issue order within a volume
+        Index('idx_comic_volume_number_sort', 'volume_id', 'sort_number', 'sort_suffix'),
+        # Reading order: Format -> Date -> Number
+        Index('idx_comic_volume_reading_sort', 'volume_id', 'format_weight', 'sort_date', 'sort_number', 'sort_suffix'),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -32,6 +36,7 @@ class Comic(Base):
     file_path = Column(String, unique=True, nullable=False)
     file_modified_at = Column(Float)
     file_size = Column(Integer)
+    fingerprint = Column(String, nullable=True, index=True)  # size + head/tail hash + ComicInfo CRC (move detection)
     thumbnail_path = Column(String, nullable=True)  # Path to cached thumbnail
     page_count = Column(Integer, default=0)
 
@@ -80,6 +85,12 @@ class Comic(Base):
     color_secondary = Column(String, nullable=True)
     color_palette = Column(JSON, nullable=True)  # Full color palette for advanced features
 
+    # Canonical sort keys, computed by the scanner (see get_sort_keys)
+    sort_number = Column(Float, nullable=True)  # 10.0 for "10a"
+    sort_suffix = Column(String, nullable=True)  # "a" for "10a"
+    sort_date = Column(Integer, nullable=True)  # YYYYMMDD, unknown parts as 9999/99/99
+    format_weight = Column(Integer, nullable=True)  # Plain(1) -> Annual(2) -> Special(3)
+
     # Store full metadata as JSON for anything we missed
     metadata_json = Column(Text)
 
@@ -94,6 +105,8 @@ class Comic(Base):
     collection_items = relationship("CollectionItem", back_populates="comic", cascade="all, delete-orphan")
     reading_progress = relationship("ReadingProgress", back_populates="comic", cascade="all, delete-orphan")
     pull_list_items = relationship("PullListItem", back_populates="comic", cascade="all, delete-orphan")
+    pages = relationship("ComicPage", back_populates="comic", cascade="all, delete-orphan",
+                         order_by="ComicPage.page_index")
 
 
     # Helper methods to get credits by role
@@ -127,4 +140,39 @@ class Comic(Base):
 
     @property
     def editors(self):
-        return self.get_credits_by_role('editor')
\ No newline at end of file
+        return self.get_credits_by_role('editor')
+
+
+class ComicPage(Base):
+    """
+    Ordered page manifest, captured by the scanner at import time.
+    Lets the reader resolve a page index to an archive entry without
+    re-listing and re-sorting the archive on every request.
+    """
+    __tablename__ = "comic_pages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    comic_id = Column(Integer, ForeignKey("comics.id", ondelete="CASCADE"), nullable=False)
+    page_index = Column(Integer, nullable=False)  # Zero-based, matches the reader
+
+    # Archive entry
+    filename = Column(String, nullable=False)
+    compressed_size = Column(Integer, nullable=True)
+    file_size = Column(Integer, nullable=True)  # Uncompressed
+    image_type = Column(String, nullable=True)  # e.g. "jpeg", "png"
+
+    # Zero-copy serving: where the raw bytes live inside the .cbz (ZIP_STORED entries only)
+    compress_type = Column(Integer, nullable=True)  # zipfile.ZIP_* constant, NULL for non-zip
+    data_offset = Column(Integer, nullable=True)
+
+    # Geometry (from the image header at scan time) so the reader can lay out spreads up front
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    is_double = Column(Boolean, nullable=True)  # Aspect ratio > 1
+
+    # One row per page; the unique index doubles as the (comic_id, page_index) lookup
+    __table_args__ = (
+        UniqueConstraint('comic_id', 'page_index', name='unique_comic_page_index'),
+    )
+
+    comic = relationship("Comic", back_populates="pages")
@@ -6,8 +6,10 @@ from app.database import Base
 
 class JobType(str, enum.Enum):
     SCAN = "scan"
+    PATH_SCAN = "path_scan"  # Targeted scan of watcher-reported paths (payload)
     THUMBNAIL = "thumbnail"
     CLEANUP = "cleanup"
+    REPACK = "repack"
 
 class JobStatus(str, enum.Enum):
     PENDING = "pending"
@@ -28,6 +30,9 @@ class ScanJob(Base):
     status = Column(String, default=JobStatus.PENDING, index=True)
     force_scan = Column(Boolean, default=False)
 
+    # Job input (JSON string), e.g. {"paths": [...]} for PATH_SCAN
+    payload = Column(Text, nullable=True)
+
     # Timestamps
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     started_at = Column(DateTime, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.database import Base
@@ -14,8 +14,31 @@ class Library(Base):
     watch_mode = Column(Boolean, default=False)  # Real-time watching
 
     last_scanned = Column(DateTime, nullable=True)
+    last_full_walk = Column(DateTime, nullable=True)  # Last scan that listed every directory
     is_scanning = Column(Boolean, default=False)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     # Relationships - use string reference to avoid circular import
-    series = relationship("Series", back_populates="library", cascade="all, delete-orphan")
\ No newline at end of file
+    series = relationship("Series", back_populates="library", cascade="all, delete-orphan")
+    directories = relationship("ScannedDirectory", back_populates="library", cascade="all, delete-orphan")
+
+
+class ScannedDirectory(Base):
+    """
+    Directory state from the last scan.
+    A directory whose mtime is unchanged has the same entries, so incremental scans
+    don't list it or stat its files (subdirectories are still checked).
+    """
+    __tablename__ = "scanned_directories"
+
+    id = Column(Integer, primary_key=True, index=True)
+    library_id = Column(Integer, ForeignKey("libraries.id"), nullable=False, index=True)
+    path = Column(String, nullable=False)
+    mtime_ns = Column(BigInteger, nullable=True)  # NULL = always list (changed too close to the scan)
+    entry_count = Column(Integer, default=0)
+
+    library = relationship("Library", back_populates="directories")
+
+    __table_args__ = (
+        UniqueConstraint('library_id', 'path', name='uq_scanned_directory_path'),
+    )
@@ -1,3 +1,4 @@
+import os
 from fastapi import APIRouter, Depends, Request, HTTPException
 from fastapi.responses import Response, FileResponse
 from fastapi.templating import Jinja2Templates
@@ -10,15 +11,19 @@ from app.models import ComicCredit
 from app.models.library import Library
 from app.models.series import Series
 from app.models.comic import Comic, Volume
+from app.core.http_cache import make_etag, is_not_modified, not_modified, validator_headers
 from app.core.comic_helpers import (
     get_series_age_restriction,
     get_comic_age_restriction,
-    get_age_rating_config, NON_PLAIN_FORMATS, get_thumbnail_url
+    get_age_rating_config, NON_PLAIN_FORMATS, get_thumbnail_url, issue_sort_key
 )
 
 templates = Jinja2Templates(directory="app/templates")
 router = APIRouter(prefix="/opds", tags=["opds"])
 
+# Routes are plain `def`: they run blocking DB queries/file stats,
+# so Starlette runs them on its threadpool instead of the event loop.
+
 
 # Helper to render XML
 def render_xml(request: Request, context: dict):
@@ -35,17 +40,9 @@ def is_standard_format(fmt: str) -> bool:
     f = fmt.lower()
     return f not in NON_PLAIN_FORMATS
 
-# Helper: Safe Sort Key for issues
-def issue_sort_key(c):
-    try:
-        return float(c.number)
-    except:
-        return 999999
-
-
 # 1. ROOT: List Libraries
 @router.get("/", name="root")
-async def opds_root(request: Request, user: OPDSUser, db: SessionDep):
+def opds_root(request: Request, user: OPDSUser, db: SessionDep):
 
     # If Superuser, fetch ALL libraries. If regular user, use assigned.
     if user.is_superuser:
@@ -75,7 +72,7 @@ async def opds_root(request: Request, user: OPDSUser, db: SessionDep):
 
 # 2. LIBRARY: List Series
 @router.get("/libraries/{library_id}", name="library")
-async def opds_library(library_id: int, request: Request, user: OPDSUser, db: SessionDep):
+def opds_library(library_id: int, request: Request, user: OPDSUser, db: SessionDep):
     # Security check using your existing accessible_libraries logic
 
     if not user.is_superuser:
@@ -102,6 +99,7 @@ async def opds_library(library_id: int, request: Request, user: OPDSUser, db: Se
     raw_comics = (
         db.query(Comic.id, Comic.number, Comic.year,
                  Comic.format, Comic.updated_at, Comic.thumbnail_path,
+                 Comic.sort_number, Comic.sort_suffix,
             Volume.series_id, Volume.volume_number
         ).join(Volume).filter(Volume.series_id.in_(series_ids)).all()
     )
@@ -151,7 +149,7 @@ async def opds_library(library_id: int, request: Request, user: OPDSUser, db: Se
 # 3. SERIES: List Comics (Flattening Volumes)
 
 @router.get("/series/{series_id}", name="series")
-async def opds_series(series_id: int, request: Request, user: OPDSUser, db: SessionDep):
+def opds_series(series_id: int, request: Request, user: OPDSUser, db: SessionDep):
 
     # Security check for Series existence and Library Access would ideally happen here too
     # Assuming 'get_series_age_restriction' at library level helps, but let's be strict.
@@ -196,7 +194,7 @@ async def opds_series(series_id: int, request: Request, user: OPDSUser, db: Sess
 
 # 4. DOWNLOAD: Serve the file
 @router.get("/download/{comic_id}", name="download")
-async def opds_download(comic_id: int, user: OPDSUser, db: SessionDep):
+def opds_download(comic_id: int, user: OPDSUser, db: SessionDep, request: Request):
     # We duplicate the logic from get_secure_comic here because we need
     # to authenticate via Basic Auth (user argument), not JWT.
 
@@ -226,6 +224,16 @@ async def opds_download(comic_id: int, user: OPDSUser, db: SessionDep):
             raise HTTPException(status_code=403, detail="Age Restricted")
 
 
+    # 3. Conditional GET: OPDS apps re-download on refresh, answer from a stat() instead
+    try:
+        file_stat = os.stat(comic.file_path)
+    except OSError:
+        raise HTTPException(status_code=404)
+
+    etag = make_etag(comic.id, file_stat.st_mtime_ns, file_stat.st_size)
+    if is_not_modified(request, etag, file_stat.st_mtime):
+        return not_modified(etag, file_stat.st_mtime, cache_control="private, no-cache")
+
     # Clean filename for headers (remove non-ascii if necessary, but modern browsers/apps handle utf-8)
     export_name = f"{comic.series_group or 'Comic'} - {comic.title}.cbz"
 
@@ -233,5 +241,9 @@ async def opds_download(comic_id: int, user: OPDSUser, db: SessionDep):
         path=str(comic.file_path),
         filename=export_name,
         media_type="application/vnd.comicbook+zip",
-        headers={"Content-Disposition": f'attachment; filename="{export_name}"'}
+        stat_result=file_stat,
+        headers={
+            "Content-Disposition": f'attachment; filename="{export_name}"',
+            **validator_headers(etag, file_stat.st_mtime, cache_control="private, no-cache")
+        }
     )
\ No newline at end of file
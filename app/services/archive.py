@@ -1,11 +1,16 @@
 import logging
+import hashlib
+import os
 import zipfile
 import rarfile
 from pathlib import Path
 from typing import List, Optional
 import io
 import re
+import struct
+from PIL import Image
 from app.config import settings
+from app.services.extraction_cache import extraction_cache
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +28,96 @@ except ImportError:
     CB7_SUPPORT = False
     logger.warning("Warning: py7zr not installed. CB7 support disabled.")
 
+# Map archive entry extensions to the image type stored in the page manifest
+IMAGE_TYPES = {
+    '.jpg': 'jpeg', '.jpeg': 'jpeg', '.png': 'png', '.webp': 'webp',
+    '.gif': 'gif', '.bmp': 'bmp', '.tiff': 'tiff'
+}
+
+
+# Bytes hashed from each end of the file for the content fingerprint
+FINGERPRINT_CHUNK = 64 * 1024
+
+
+def content_fingerprint(filepath: Path, size: int, comicinfo_crc: int) -> str:
+    """
+    Cheap identity of an archive that survives renames and moves:
+    size + hash of the first/last 64 KB + ComicInfo.xml CRC.
+    Reads at most 128 KB regardless of the file size.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, "rb") as f:
+        digest.update(f.read(FINGERPRINT_CHUNK))
+        if size > FINGERPRINT_CHUNK:
+            f.seek(max(FINGERPRINT_CHUNK, size - FINGERPRINT_CHUNK))
+            digest.update(f.read(FINGERPRINT_CHUNK))
+    return f"{size}-{digest.hexdigest()}-{comicinfo_crc:08x}"
+
+
+# ZIP local file header (see zipfile.structFileHeader)
+_ZIP_LOCAL_HEADER = "<4s2B4HL2L2H"
+_ZIP_LOCAL_HEADER_SIZE = struct.calcsize(_ZIP_LOCAL_HEADER)
+
+
+def get_image_mime_type(filename: str) -> str:
+    """Guess the mime type of an archive entry from its extension (defaults to JPEG)"""
+    image_type = IMAGE_TYPES.get(Path(filename).suffix.lower(), 'jpeg')
+    if image_type in ('png', 'webp', 'gif'):
+        return f"image/{image_type}"
+    return "image/jpeg"
+
+
+def iter_file_range(filepath: Path, offset: int, length: int, chunk_size: int = 64 * 1024):
+    """
+    Yield `length` bytes starting at `offset`, one chunk at a time.
+    Used to serve stored CBZ entries straight from disk without buffering the whole page.
+    """
+    with open(filepath, "rb") as f:
+        f.seek(offset)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable sink: zipfile falls back to data descriptors and we drain what it wrote"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip_stream(entries):
+    """
+    Build an uncompressed (stored) ZIP on the fly from (name, bytes) pairs.
+    Each entry is yielded as soon as it's written, so the first page reaches the
+    client before the last one is extracted.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as zf:
+        for name, data in entries:
+            zf.writestr(name, data)
+            yield sink.drain()
+    # Central directory
+    yield sink.drain()
+
+
 class ComicArchive:
     """Unified interface for CBZ, CBR, and CB7 archives"""
 
@@ -121,14 +216,134 @@ class ComicArchive:
 
         return pages
 
-    def read_file(self, filename: str) -> bytes:
-        """Read a specific file from the archive"""
+    def get_page_entries(self, probe_dimensions: bool = False) -> List[dict]:
+        """
+        Ordered page manifest: one dict per page with the entry name,
+        compressed/uncompressed sizes and image type.
+        Sizes are None when the archive format doesn't expose them.
+
+        probe_dimensions: Also read each page's image header for width/height
+                          (header only, no pixel decoding).
+        """
+        entries = []
+        raw = open(self.filepath, "rb") if self.extension == ".cbz" else None
+        can_probe = probe_dimensions and self._can_probe_pages()
+
+        try:
+            for name in self.get_pages():
+                compressed_size = None
+                file_size = None
+                compress_type = None
+                data_offset = None
+
+                if self.extension in (".cbz", ".cbr"):
+                    info = self.archive.getinfo(name)
+                    compressed_size = info.compress_size
+                    file_size = info.file_size
+
+                if raw:
+                    compress_type = info.compress_type
+                    data_offset = self._get_stored_data_offset(raw, info)
+
+                entry = {
+                    "filename": name,
+                    "compressed_size": compressed_size,
+                    "file_size": file_size,
+                    "image_type": IMAGE_TYPES.get(Path(name).suffix.lower(), 'jpeg'),
+                    "compress_type": compress_type,
+                    "data_offset": data_offset,
+                    "width": None,
+                    "height": None,
+                    "is_double": None
+                }
+
+                if can_probe:
+                    geometry = self.probe_page(name)
+                    if geometry:
+                        entry.update(geometry)
+
+                entries.append(entry)
+        finally:
+            if raw:
+                raw.close()
+
+        return entries
+
+    def _can_probe_pages(self) -> bool:
+        """
+        Per-entry reads are cheap for ZIP and non-solid RAR.
+        Solid RAR / 7z would decompress from the start for every page (O(n^2)), so skip those.
+        """
+        if self.extension == ".cbz":
+            return True
+        if self.extension == ".cbr":
+            return not self.archive.is_solid()
+        return False
+
+    def probe_page(self, filename: str) -> Optional[dict]:
+        """
+        Page geometry from the image header only (Pillow's open() is lazy: no pixel decoding).
+        Returns {'width', 'height', 'image_type', 'is_double'} or None if unreadable.
+        """
+        try:
+            with self.archive.open(filename) as stream:
+                with Image.open(stream) as img:
+                    width, height = img.size
+                    image_format = (img.format or "").lower()
+        except Exception as e:
+            logger.debug(f"Could not probe {filename} in {self.filepath.name}: {e}")
+            return None
+
+        geometry = {
+            "width": width,
+            "height": height,
+            # Landscape page = double-page spread
+            "is_double": width > height
+        }
+        if image_format:
+            geometry["image_type"] = image_format
+
+        return geometry
+
+    @staticmethod
+    def _get_stored_data_offset(raw, info: zipfile.ZipInfo) -> Optional[int]:
+        """
+        Absolute offset of an entry's bytes inside the .cbz file.
+        Only for ZIP_STORED, unencrypted entries (the bytes on disk ARE the image).
+        The local header's extra field can differ from the central directory, so read it.
+        """
+        if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+            return None
+
+        raw.seek(info.header_offset)
+        header = raw.read(_ZIP_LOCAL_HEADER_SIZE)
+        if len(header) != _ZIP_LOCAL_HEADER_SIZE:
+            return None
+
+        signature, *_, name_length, extra_length = struct.unpack(_ZIP_LOCAL_HEADER, header)
+        if signature != b"PK\003\004":
+            return None
+
+        return info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_length + extra_length
+
+    def read_file(self, filename: str, populate_cache: bool = True) -> bytes:
+        """
+        Read a specific file from the archive.
+        CBR reads go through the extraction cache; populate_cache=False only uses an
+        existing extraction (for one-off reads like covers, where unpacking everything is waste).
+        """
         if self.extension == ".cbz":
             return self.archive.read(filename)
         elif self.extension == ".cbr":
+            data = extraction_cache.read(self, filename, populate=populate_cache)
+            if data is not None:
+                return data
             return self.archive.read(filename)
         elif self.extension == ".cb7":
-            return self.archive.read([filename])[filename].read()
+            data = self.archive.read([filename])[filename].read()
+            # py7zr handles are single-pass; rewind so the handle can be reused
+            self.archive.reset()
+            return data
 
     def get_comicinfo(self) -> Optional[bytes]:
         """Extract ComicInfo.xml if it exists"""
@@ -136,9 +351,27 @@ class ComicArchive:
         comicinfo = next((f for f in files if f.lower() == "comicinfo.xml"), None)
 
         if comicinfo:
-            return self.read_file(comicinfo)
+            return self.read_file(comicinfo, populate_cache=False)
         return None
 
+    def get_comicinfo_crc(self) -> int:
+        """CRC32 of ComicInfo.xml from the archive directory (no decompression); 0 if absent"""
+        name = next((f for f in self.get_file_list() if f.lower() == "comicinfo.xml"), None)
+        if not name:
+            return 0
+
+        if self.extension in (".cbz", ".cbr"):
+            return self.archive.getinfo(name).CRC or 0
+        elif self.extension == ".cb7":
+            info = next((i for i in self.archive.list() if i.filename == name), None)
+            return (info.crc32 or 0) if info else 0
+
+    def fingerprint(self, size: Optional[int] = None) -> str:
+        """Content fingerprint of this archive (see content_fingerprint)"""
+        if size is None:
+            size = os.path.getsize(self.filepath)
+        return content_fingerprint(self.filepath, size, self.get_comicinfo_crc())
+
     def close(self):
         """Close the archive"""
         self.archive.close()
@@ -0,0 +1,162 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+from app.config import settings
+from app.services.archive import ComicArchive
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledArchive:
+    """An open archive plus the bookkeeping the pool needs"""
+
+    def __init__(self, archive: ComicArchive):
+        self.archive = archive
+        # Serializes reads on this handle (py7zr/rarfile handles are not safe to share)
+        self.lock = threading.Lock()
+        self.refs = 0
+        self.last_used = time.monotonic()
+        self.evicted = False
+
+
+class ArchivePool:
+    """
+    Process-wide LRU pool of open ComicArchive handles.
+
+    Keyed by (path, mtime) so a modified file is never served from a stale handle.
+    Bounded by max_open; idle handles are closed after idle_timeout seconds.
+    Handles that are evicted while in use are closed when the last borrower releases them.
+    """
+
+    def __init__(self, max_open: int = 32, idle_timeout: float = 300):
+        self.max_open = max(1, max_open)
+        self.idle_timeout = idle_timeout
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, float], _PooledArchive]" = OrderedDict()
+
+        # Counters (per process) for tuning
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @contextmanager
+    def open(self, filepath: Path) -> Iterator[ComicArchive]:
+        """
+        Borrow an open archive for the duration of the with-block.
+        Keep the block short (read bytes, then release) - reads on one handle are serialized.
+        """
+        path = str(filepath)
+        key = (path, os.path.getmtime(path))
+
+        with self._lock:
+            self._evict_idle()
+            entry = self._entries.get(key)
+            if entry:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                entry.refs += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            # Open outside the pool lock (CBR/CB7 opens can be slow)
+            archive = ComicArchive(Path(path))
+
+            with self._lock:
+                existing = self._entries.get(key)
+                if existing:
+                    # Another thread won the race, use theirs
+                    archive.close()
+                    entry = existing
+                else:
+                    # Any handle on an older version of this file is now useless
+                    self._invalidate_locked(path)
+                    entry = _PooledArchive(archive)
+                    self._entries[key] = entry
+                    self._enforce_limit()
+                entry.refs += 1
+
+        try:
+            with entry.lock:
+                yield entry.archive
+        finally:
+            with self._lock:
+                entry.refs -= 1
+                entry.last_used = time.monotonic()
+                if entry.evicted and entry.refs == 0:
+                    self._close(entry)
+
+    def invalidate(self, filepath) -> None:
+        """Drop every handle for a path (call on rescan, repack or delete)"""
+        with self._lock:
+            self._invalidate_locked(str(filepath))
+
+    def clear(self) -> None:
+        """Close all handles"""
+        with self._lock:
+            for key in list(self._entries.keys()):
+                self._evict(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "open": len(self._entries),
+                "max_open": self.max_open,
+                "idle_timeout": self.idle_timeout,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+    # --- Internal (caller holds self._lock) ---
+
+    def _invalidate_locked(self, path: str):
+        for key in [k for k in self._entries if k[0] == path]:
+            self._evict(key)
+
+    def _evict_idle(self):
+        cutoff = time.monotonic() - self.idle_timeout
+        for key in [k for k, e in self._entries.items() if e.refs == 0 and e.last_used < cutoff]:
+            self._evict(key)
+
+    def _enforce_limit(self):
+        # Oldest first; in-use handles are marked and closed on release
+        while len(self._entries) > self.max_open:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, key):
+        entry = self._entries.pop(key)
+        entry.evicted = True
+        self.evictions += 1
+        if entry.refs == 0:
+            self._close(entry)
+
+    @staticmethod
+    def _close(entry: _PooledArchive):
+        try:
+            entry.archive.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled archive: {e}")
+
+    def _reset_after_fork(self):
+        # Forked workers (thumbnail pool) must not share file offsets with the parent.
+        # Drop the inherited handles without touching them.
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+
+# Global instance
+archive_pool = ArchivePool(settings.archive_pool_size, settings.archive_pool_idle_seconds)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=archive_pool._reset_after_fork)
@@ -0,0 +1,149 @@
+from collections import defaultdict
+from typing import Dict, Set, Tuple
+
+from sqlalchemy import Table, and_, bindparam, select
+from sqlalchemy.orm import Session
+
+from app.models.tags import comic_characters, comic_teams, comic_locations, comic_genres
+from app.models.credits import ComicCredit
+from app.models.reading_list import ReadingListItem
+from app.models.collection import CollectionItem
+from app.services.tags import TagService
+from app.services.credits import CreditService
+from app.services.reading_list import ReadingListService
+from app.services.collection import CollectionService
+
+# metadata field -> (tag kind, junction table, tag id column)
+TAG_FIELDS = {
+    'characters': ('characters', comic_characters, 'character_id'),
+    'teams': ('teams', comic_teams, 'team_id'),
+    'locations': ('locations', comic_locations, 'location_id'),
+    'genre': ('genres', comic_genres, 'genre_id'),
+}
+
+# Association table -> row columns (rows are tuples in this order, comic_id first)
+ROW_COLUMNS = {
+    **{table: ('comic_id', column) for _, table, column in TAG_FIELDS.values()},
+    ComicCredit.__table__: ('comic_id', 'person_id', 'role'),
+    ReadingListItem.__table__: ('comic_id', 'reading_list_id', 'position'),
+    CollectionItem.__table__: ('comic_id', 'collection_id'),
+}
+
+
+class AssociationBatch:
+    """
+    Deferred credits / tags / reading lists / collections for a batch of scanned comics.
+
+    The scan loop stages each comic's names; flush() (called before every batch commit) resolves
+    all names at once, creating missing entities in one insert per type, and applies the
+    difference against the stored rows with executemany DELETE / INSERT per association table.
+    Unchanged associations of updated comics are not touched.
+    """
+
+    def __init__(self, db: Session, tag_service: TagService, credit_service: CreditService,
+                 reading_list_service: ReadingListService, collection_service: CollectionService):
+        self.db = db
+        self.tag_service = tag_service
+        self.credit_service = credit_service
+        self.reading_list_service = reading_list_service
+        self.collection_service = collection_service
+
+        # comic_id -> staged names
+        self.pending: Dict[int, Dict] = {}
+        # Comics that may already have rows (imports start empty, no need to read them)
+        self.existing: Set[int] = set()
+
+    def stage(self, comic_id: int, metadata: Dict, new: bool):
+        """Record the associations a comic should end up with (no DB access)"""
+        self.pending[comic_id] = {
+            'tags': {kind: TagService.parse_names(metadata.get(field))
+                     for field, (kind, _, _) in TAG_FIELDS.items()},
+            'credits': self.credit_service.get_credits(metadata),
+            'reading_list': self.reading_list_service.get_list_entry(
+                metadata.get('alternate_series'), metadata.get('alternate_number')),
+            'collection': self.collection_service.get_collection_name(metadata.get('series_group')),
+        }
+        if not new:
+            self.existing.add(comic_id)
+
+    def flush(self) -> int:
+        """Write the staged associations (no commit). Returns the number of rows changed."""
+        if not self.pending:
+            return 0
+
+        desired = self._resolve()
+        current = self._load_current()
+
+        changed = 0
+        for table, columns in ROW_COLUMNS.items():
+            wanted = desired.get(table, set())
+            stored = current.get(table, set())
+            changed += self._delete(table, columns, stored - wanted)
+            changed += self._insert(table, columns, wanted - stored)
+
+        self.clear()
+        return changed
+
+    def clear(self):
+        """Drop the staged associations (after a flush, or when the batch is rolled back)"""
+        self.pending.clear()
+        self.existing.clear()
+
+    def _resolve(self) -> Dict[Table, Set[Tuple]]:
+        """Names -> ids for the whole batch, then the desired rows per table"""
+        staged = self.pending.values()
+
+        tag_ids = {
+            kind: self.tag_service.resolve_ids(kind, (n for s in staged for n in s['tags'][kind]))
+            for kind in TagService.TAG_MODELS
+        }
+        person_ids = self.credit_service.resolve_person_ids(n for s in staged for n, _ in s['credits'])
+        list_ids = self.reading_list_service.resolve_list_ids(
+            s['reading_list'][0] for s in staged if s['reading_list'])
+        collection_ids = self.collection_service.resolve_collection_ids(
+            s['collection'] for s in staged if s['collection'])
+
+        desired: Dict[Table, Set[Tuple]] = defaultdict(set)
+        for comic_id, s in self.pending.items():
+            for kind, table, _ in TAG_FIELDS.values():
+                desired[table].update((comic_id, tag_ids[kind][name]) for name in s['tags'][kind])
+
+            desired[ComicCredit.__table__].update(
+                (comic_id, person_ids[name], role) for name, role in s['credits'])
+
+            if s['reading_list']:
+                name, position = s['reading_list']
+                desired[ReadingListItem.__table__].add((comic_id, list_ids[name], position))
+
+            if s['collection']:
+                desired[CollectionItem.__table__].add((comic_id, collection_ids[s['collection']]))
+
+        return desired
+
+    def _load_current(self) -> Dict[Table, Set[Tuple]]:
+        """Stored rows of the updated comics (one SELECT per association table)"""
+        if not self.existing:
+            return {}
+
+        ids = list(self.existing)
+        return {
+            table: {tuple(row) for row in self.db.execute(
+                select(*(table.c[name] for name in columns)).where(table.c.comic_id.in_(ids))
+            )}
+            for table, columns in ROW_COLUMNS.items()
+        }
+
+    def _delete(self, table: Table, columns: Tuple[str, ...], rows: Set[Tuple]) -> int:
+        if not rows:
+            return 0
+        # Key columns only: (comic_id, target id) is unique in every association table
+        key = columns[:2] if table is not ComicCredit.__table__ else columns
+        stmt = table.delete().where(and_(*(table.c[name] == bindparam(f"b_{name}") for name in key)))
+        self.db.execute(stmt, [{f"b_{name}": value for name, value in zip(key, row)} for row in rows])
+        return len(rows)
+
+    def _insert(self, table: Table, columns: Tuple[str, ...], rows: Set[Tuple]) -> int:
+        if not rows:
+            return 0
+        self.db.execute(table.insert(), [dict(zip(columns, row)) for row in sorted(rows)])
+        return len(rows)
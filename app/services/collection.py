@@ -1,63 +1,43 @@
 import logging
 from sqlalchemy.orm import Session
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable
 
-from app.models import Collection, CollectionItem, Comic
+from app.models import Collection
 
 class CollectionService:
     def __init__(self, db: Session):
         self.db = db
-        self.collection_cache: Dict[str, Collection] = {}
+        # name -> collection id (filled by preload / resolve_collection_ids)
+        self.collection_cache: Dict[str, int] = {}
         self.logger = logging.getLogger(__name__)
 
-    def get_or_create_collection(self, name: str) -> Collection:
-        name = name.strip()
+    def preload(self):
+        """Load every known collection name once"""
+        self.collection_cache = dict(self.db.query(Collection.name, Collection.id))
 
-        if name in self.collection_cache:
-            return self.collection_cache[name]
+    def resolve_collection_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """Map names to collection ids, creating the missing collections in one batch (Flush only)"""
+        missing = [name for name in dict.fromkeys(names) if name not in self.collection_cache]
 
-        collection = self.db.query(Collection).filter(Collection.name == name).first()
-
-        if not collection:
-            collection = Collection(name=name, auto_generated=1)
-            self.db.add(collection)
+        if missing:
+            created = [Collection(name=name, auto_generated=1) for name in missing]
+            self.db.add_all(created)
             self.db.flush()
-            print(f"Created collection: {name}")
-            self.logger.debug(f"Created collection: {name}")
-
-        self.collection_cache[name] = collection
-        return collection
-
-    def add_comic_to_collection(self, comic: Comic, collection_name: str):
-        collection = self.get_or_create_collection(collection_name)
-
-        existing = self.db.query(CollectionItem).filter(
-            CollectionItem.collection_id == collection.id,
-            CollectionItem.comic_id == comic.id
-        ).first()
-
-        if not existing:
-            item = CollectionItem(
-                collection_id=collection.id,
-                comic_id=comic.id
-            )
-            self.db.add(item)
-            # No commit
-
-    def remove_comic_from_all_collections(self, comic_id: int):
-        self.db.query(CollectionItem).filter(
-            CollectionItem.comic_id == comic_id
-        ).delete()
-        # No commit
-
-    def update_comic_collections(self, comic: Comic, series_group: Optional[str]):
-        self.remove_comic_from_all_collections(comic.id)
-        if series_group:
-            self.add_comic_to_collection(comic, series_group)
+            for collection in created:
+                print(f"Created collection: {collection.name}")
+                self.logger.debug(f"Created collection: {collection.name}")
+            self.collection_cache.update((c.name, c.id) for c in created)
+
+        return self.collection_cache
+
+    def get_collection_name(self, series_group: Optional[str]) -> Optional[str]:
+        """Collection a comic belongs to, from SeriesGroup"""
+        if not series_group:
+            return None
+        return series_group.strip() or None
 
     def cleanup_empty_collections(self):
         empty_collections = self.db.query(Collection).filter(~Collection.items.any()).all()
         for col in empty_collections:
             self.db.delete(col)
-            if col.name in self.collection_cache:
-                del self.collection_cache[col.name]
\ No newline at end of file
+            self.collection_cache.pop(col.name, None)
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
-from typing import Dict, List
-from app.models import Person, ComicCredit, Comic
+from typing import Dict, Iterable, List, Set, Tuple
+from app.models import Person
 
 class CreditService:
     """Service for managing comic credits with Caching"""
@@ -17,25 +17,24 @@ class CreditService:
 
     def __init__(self, db: Session):
         self.db = db
-        self.person_cache: Dict[str, Person] = {}
+        # name -> person id (filled by preload / resolve_person_ids)
+        self.person_cache: Dict[str, int] = {}
 
-    def get_or_create_person(self, name: str) -> Person:
-        name = name.strip()
-        if not name:
-            return None
+    def preload(self):
+        """Load every known person once"""
+        self.person_cache = dict(self.db.query(Person.name, Person.id))
 
-        if name in self.person_cache:
-            return self.person_cache[name]
+    def resolve_person_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """Map names to person ids, creating the missing people in one batch (Flush only)"""
+        missing = [name for name in dict.fromkeys(names) if name not in self.person_cache]
 
-        person = self.db.query(Person).filter(Person.name == name).first()
+        if missing:
+            people = [Person(name=name) for name in missing]
+            self.db.add_all(people)
+            self.db.flush()  # IDs needed for credit rows
+            self.person_cache.update((person.name, person.id) for person in people)
 
-        if not person:
-            person = Person(name=name)
-            self.db.add(person)
-            self.db.flush()  # ID needed for credit relationship
-
-        self.person_cache[name] = person
-        return person
+        return self.person_cache
 
     def parse_credit_field(self, field_value: str) -> List[str]:
         if not field_value:
@@ -43,25 +42,10 @@ class CreditService:
         names = [n.strip() for n in field_value.split(',') if n.strip()]
         return list(dict.fromkeys(names))
 
-    def add_credits_to_comic(self, comic: Comic, metadata: Dict):
-        """Add all credits from metadata to a comic"""
-        # Clear existing credits
-        # This is a bulk delete, usually fast enough without optimization
-        self.db.query(ComicCredit).filter(ComicCredit.comic_id == comic.id).delete()
-
-        for metadata_field, role in self.ROLE_MAPPING.items():
-            field_value = metadata.get(metadata_field)
-            if field_value:
-                names = self.parse_credit_field(field_value)
-                for name in names:
-                    person = self.get_or_create_person(name)
-                    if person:
-                        credit = ComicCredit(
-                            comic_id=comic.id,
-                            person_id=person.id,
-                            role=role
-                        )
-                        self.db.add(credit)
-                        # No flush needed here, the objects just sit in session until batch commit
-
-        # REMOVED self.db.commit() - Scanner handles this
\ No newline at end of file
+    def get_credits(self, metadata: Dict) -> Set[Tuple[str, str]]:
+        """All (person name, role) pairs from metadata"""
+        return {
+            (name, role)
+            for metadata_field, role in self.ROLE_MAPPING.items()
+            for name in self.parse_credit_field(metadata.get(metadata_field))
+        }
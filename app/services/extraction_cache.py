@@ -0,0 +1,195 @@
+import os
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Marker written last: a directory without it is an incomplete extraction
+COMPLETE_MARKER = ".complete"
+
+
+class ExtractionCache:
+    """
+    Disk-backed cache of fully unpacked CBR archives.
+
+    rarfile shells out to unrar on every read, and solid archives must decompress
+    everything before the requested entry, so paging through a CBR is O(n^2).
+    Instead, the first page read unpacks the whole archive in ONE unrar pass into
+    cache_dir/extracted/<path hash>_<mtime>/ and later reads are plain file reads.
+
+    - Directories are keyed by source mtime, so a modified file never hits a stale copy.
+    - A global byte budget is enforced with LRU eviction (marker mtime = last access).
+    - Safe across worker processes: extraction goes to a private temp dir and is renamed into place.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+        # Counters (per process)
+        self.hits = 0
+        self.misses = 0
+        self.extractions = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _path_hash(filepath) -> str:
+        return hashlib.sha1(str(filepath).encode("utf-8")).hexdigest()[:16]
+
+    def _entry_dir(self, filepath: Path) -> Path:
+        mtime_ns = os.stat(filepath).st_mtime_ns
+        return self.root / f"{self._path_hash(filepath)}_{mtime_ns}"
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _safe_member_path(entry_dir: Path, filename: str) -> Optional[Path]:
+        target = (entry_dir / filename).resolve()
+        if entry_dir.resolve() not in target.parents:
+            return None
+        return target
+
+    def read(self, archive, filename: str, populate: bool = True) -> Optional[bytes]:
+        """
+        Read an entry of an open RAR ComicArchive through the cache.
+        Returns None on a miss when populate=False, or if the entry was evicted under us
+        (caller reads the archive directly). Peeks (populate=False) don't count as misses.
+        """
+        entry_dir = self._entry_dir(archive.filepath)
+        marker = entry_dir / COMPLETE_MARKER
+
+        if not marker.exists():
+            if not populate:
+                return None
+
+            self.misses += 1
+            with self._lock_for(entry_dir.name):
+                # Another thread may have finished while we waited
+                if not marker.exists():
+                    self._extract(archive, entry_dir)
+
+        else:
+            self.hits += 1
+
+        target = self._safe_member_path(entry_dir, filename)
+        if target is None or not target.is_file():
+            return None
+
+        # LRU bookkeeping
+        try:
+            os.utime(marker, None)
+        except OSError:
+            pass
+
+        try:
+            return target.read_bytes()
+        except FileNotFoundError:
+            # Evicted by another thread / worker between the lookup and the read
+            return None
+
+    def _extract(self, archive, entry_dir: Path):
+        """Unpack the whole archive in one pass, then publish it atomically"""
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        # Older versions of this file are dead weight now
+        self.invalidate(archive.filepath, keep=entry_dir.name)
+
+        tmp_dir = self.root / f".tmp_{entry_dir.name}_{os.getpid()}_{threading.get_ident()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        start = time.time()
+        try:
+            archive.archive.extractall(path=str(tmp_dir))
+
+            total_bytes = sum(f.stat().st_size for f in tmp_dir.rglob("*") if f.is_file())
+            (tmp_dir / COMPLETE_MARKER).write_text(str(total_bytes))
+
+            try:
+                os.rename(tmp_dir, entry_dir)
+            except OSError:
+                # Another worker process published it first
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+            self.extractions += 1
+            logger.debug(f"Extracted {archive.filepath.name} ({total_bytes} bytes) in {round(time.time() - start, 2)}s")
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        self._enforce_budget()
+
+    def invalidate(self, filepath, keep: Optional[str] = None) -> int:
+        """Remove cached extractions of a path (any mtime). Returns number removed."""
+        if not self.root.exists():
+            return 0
+
+        removed = 0
+        for entry_dir in self.root.glob(f"{self._path_hash(filepath)}_*"):
+            if entry_dir.name != keep:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def _get_max_bytes(self) -> int:
+        # Import here to avoid pulling the DB layer into archive handling at import time
+        from app.core.settings_loader import get_cached_setting
+        return int(get_cached_setting("system.cache.extraction_size_mb", 2048)) * 1024 * 1024
+
+    def _scan_entries(self):
+        """[(last_access, size, dir)] for every complete extraction"""
+        entries = []
+        for entry_dir in self.root.iterdir():
+            marker = entry_dir / COMPLETE_MARKER
+            if entry_dir.name.startswith(".tmp_") or not marker.exists():
+                continue
+            try:
+                entries.append((marker.stat().st_mtime, int(marker.read_text() or 0), entry_dir))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def _enforce_budget(self):
+        max_bytes = self._get_max_bytes()
+        entries = sorted(self._scan_entries(), key=lambda e: e[0])
+        total = sum(e[1] for e in entries)
+
+        # Evict least recently read first (never the only entry)
+        while total > max_bytes and len(entries) > 1:
+            _, size, entry_dir = entries.pop(0)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            self.evictions += 1
+
+    def clear(self) -> int:
+        """Delete every cached extraction. Returns bytes freed."""
+        if not self.root.exists():
+            return 0
+        freed = sum(e[1] for e in self._scan_entries())
+        shutil.rmtree(self.root, ignore_errors=True)
+        return freed
+
+    def stats(self) -> dict:
+        entries = self._scan_entries() if self.root.exists() else []
+        return {
+            "entries": len(entries),
+            "bytes": sum(e[1] for e in entries),
+            "max_bytes": self._get_max_bytes(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "extractions": self.extractions,
+            "evictions": self.evictions,
+        }
+
+
+# Global instance
+extraction_cache = ExtractionCache(settings.cache_dir / "extracted")
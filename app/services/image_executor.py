@@ -0,0 +1,114 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BlockingExecutor:
+    """
+    Bounded thread pool for archive reads and Pillow work triggered by requests.
+
+    - async handlers `await image_executor.run(...)` so the event loop never blocks on a CBR read.
+    - sync handlers (already on Starlette's threadpool) use `call(...)`: the bound caps how many
+      decodes/encodes run at once instead of one per request thread.
+    - Threads, not processes: zlib, unrar/7z I/O and Pillow decode/resize/encode release the GIL,
+      and page bytes don't have to be pickled across a process boundary.
+
+    Queue depth and wait time are tracked so max_workers can be sized from real traffic.
+    """
+
+    def __init__(self, max_workers: int, name: str = "image-io"):
+        self.max_workers = max(1, max_workers)
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+
+        # Counters (per process)
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+            return self._executor
+
+    def _run_task(self, fn: Callable, args, kwargs, submitted_at: float):
+        started_at = time.monotonic()
+        wait = started_at - submitted_at
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+        self._local.inside = True
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._local.inside = False
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+                self.total_run += time.monotonic() - started_at
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        with self._lock:
+            self.queued += 1
+        return self._get_executor().submit(self._run_task, fn, args, kwargs, time.monotonic())
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """Run on the pool and wait (sync handlers). Nested calls run inline to avoid self-deadlock."""
+        if getattr(self._local, "inside", False):
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result()
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Run on the pool without blocking the event loop (async handlers)"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "avg_wait_ms": round(self.total_wait / self.completed * 1000, 2) if self.completed else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+                "avg_run_ms": round(self.total_run / self.completed * 1000, 2) if self.completed else 0.0,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _reset_after_fork(self):
+        # Worker threads don't survive a fork
+        self._lock = threading.Lock()
+        self._executor = None
+        self._local = threading.local()
+        self.queued = self.active = self.completed = 0
+        self.total_wait = self.max_wait = self.total_run = 0.0
+
+
+# Global instance
+image_executor = BlockingExecutor(settings.image_executor_workers)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=image_executor._reset_after_fork)
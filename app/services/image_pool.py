@@ -0,0 +1,227 @@
+import os
+import logging
+import threading
+import multiprocessing
+from typing import Any, Callable, Iterable, Optional
+
+from app.core.settings_loader import get_cached_setting
+
+logger = logging.getLogger(__name__)
+
+
+class ImageWorkerPool:
+    """
+    Long-lived process pool for CPU-bound cover work (thumbnails, palettes).
+
+    - Started lazily on first use and kept warm: thumbnail jobs, series regenerations,
+      colorscape refreshes and on-demand covers don't pay for forking a pool each time.
+    - Sized from system.parallel_image_workers (0 = auto, half the cores). A changed setting
+      is picked up the next time the pool is idle.
+    - Fairness: tasks are handed to the pool through a bounded window, split evenly between
+      the jobs currently submitting, so a library-wide job can't starve a small one.
+
+    Usage:
+        image_pool.run(worker_fn, tasks, on_result)   # blocks until this job's tasks are done
+        image_pool.call(worker_fn, task)              # single task, returns its result
+    """
+
+    # In-flight tasks per pool process (keeps every process busy without queueing a whole job)
+    WINDOW_PER_PROCESS = 4
+
+    # Recycle pool processes now and then (Pillow / decoder memory fragmentation)
+    MAX_TASKS_PER_CHILD = 500
+
+    def __init__(self, size: Optional[int] = None):
+        # None = system.parallel_image_workers setting
+        self.requested_size = size
+
+        self._cond = threading.Condition()
+        self._pool = None
+        self._size = 0
+        self._in_flight = {}  # job token -> tasks submitted but not finished
+        # shutdown() bumps the epoch (jobs stop submitting), then marks it stopped once the
+        # pool is joined / terminated (jobs stop waiting for results that will never come)
+        self._epoch = 0
+        self._stopped_epoch = -1
+
+        # Counters (per process)
+        self.jobs = 0
+        self.completed = 0
+        self.failed = 0
+        self.starts = 0
+
+    def _resolve_size(self) -> int:
+        requested = self.requested_size
+        if requested is None:
+            requested = int(get_cached_setting("system.parallel_image_workers", 0))
+
+        total_cores = multiprocessing.cpu_count() or 1
+        if requested <= 0:
+            # AUTO MODE: 50% of cores, minimum 1
+            return max(1, total_cores // 2)
+        return min(requested, total_cores)
+
+    def _ensure_started(self):
+        """Start (or resize, when idle) the pool. Caller holds self._cond."""
+        size = self._resolve_size()
+
+        if self._pool is not None and size != self._size and not self._in_flight:
+            logger.info(f"Resizing image worker pool {self._size} -> {size}")
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+        if self._pool is None:
+            logger.info(f"Starting image worker pool with {size} process(es)")
+            self._pool = multiprocessing.Pool(processes=size, maxtasksperchild=self.MAX_TASKS_PER_CHILD)
+            self._size = size
+            self.starts += 1
+
+        return self._pool
+
+    def _share(self) -> int:
+        """In-flight tasks each active job may have (caller holds self._cond)"""
+        window = self._size * self.WINDOW_PER_PROCESS
+        return max(1, window // max(1, len(self._in_flight)))
+
+    def run(self, fn: Callable[[Any], Any], tasks: Iterable, on_result: Callable[[Any], None],
+            on_error: Optional[Callable[[BaseException], None]] = None, limit: int = 0):
+        """
+        Run fn(task) for every task, calling on_result / on_error from the pool's result thread.
+        Tasks are pulled from the iterable only as window slots free up.
+        limit: cap this job's concurrency (1 = serial-like), 0 = its fair share.
+        Raises RuntimeError if shutdown() interrupts the job; tasks lost to it go to on_error.
+        """
+        token = object()
+        with self._cond:
+            pool = self._ensure_started()
+            epoch = self._epoch
+            self._in_flight[token] = 0
+            self.jobs += 1
+
+        def finished(failed: bool):
+            with self._cond:
+                self._in_flight[token] -= 1
+                if failed:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+                self._cond.notify_all()
+
+        def callback(result):
+            try:
+                on_result(result)
+            finally:
+                finished(False)
+
+        def error_callback(e):
+            try:
+                if on_error:
+                    on_error(e)
+                else:
+                    logger.error(f"Image worker task failed: {e}")
+            finally:
+                finished(True)
+
+        interrupted = False
+        try:
+            for task in tasks:
+                with self._cond:
+                    while self._epoch == epoch and \
+                            self._in_flight[token] >= (min(limit, self._share()) if limit > 0 else self._share()):
+                        self._cond.wait()
+                    if self._epoch != epoch:
+                        interrupted = True
+                        break
+                    self._in_flight[token] += 1
+                    # Under the lock: shutdown() can't close the pool in between
+                    pool.apply_async(fn, (task,), callback=callback, error_callback=error_callback)
+
+            # Wait for this job's stragglers (a terminated pool never reports the rest)
+            with self._cond:
+                while self._in_flight[token] > 0 and self._stopped_epoch < epoch:
+                    self._cond.wait()
+                lost = self._in_flight[token]
+                self._in_flight[token] = 0
+                self.failed += lost
+
+            if lost:
+                interrupted = True
+                error = RuntimeError("Image worker pool shut down before the task finished")
+                for _ in range(lost):
+                    if on_error:
+                        on_error(error)
+                    else:
+                        logger.error(f"Image worker task failed: {error}")
+
+            if interrupted:
+                raise RuntimeError("Image worker pool shut down during the job")
+        finally:
+            with self._cond:
+                del self._in_flight[token]
+                self._cond.notify_all()
+
+    def call(self, fn: Callable[[Any], Any], task: Any) -> Any:
+        """Run a single task on the pool and return its result (raises the worker's exception)"""
+        results = []
+        errors = []
+        self.run(fn, [task], results.append, errors.append)
+        if errors:
+            raise errors[0]
+        return results[0]
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "running": self._pool is not None,
+                "processes": self._size if self._pool is not None else 0,
+                "active_jobs": len(self._in_flight),
+                "in_flight": sum(self._in_flight.values()),
+                "jobs": self.jobs,
+                "completed": self.completed,
+                "failed": self.failed,
+                "starts": self.starts,
+            }
+
+    def shutdown(self, timeout: float = 10.0):
+        """
+        Graceful stop: let running tasks finish (up to timeout), then terminate.
+        Running jobs stop submitting; tasks the pool never finished are failed, so no job
+        keeps waiting on it.
+        """
+        with self._cond:
+            pool, self._pool = self._pool, None
+            if pool is None:
+                return
+            epoch = self._epoch
+            self._epoch += 1
+            self._cond.notify_all()
+
+        pool.close()
+        joiner = threading.Thread(target=pool.join, daemon=True)
+        joiner.start()
+        joiner.join(timeout)
+        if joiner.is_alive():
+            logger.warning("Image worker pool did not stop in time, terminating")
+            pool.terminate()
+
+        with self._cond:
+            self._stopped_epoch = max(self._stopped_epoch, epoch)
+            self._cond.notify_all()
+
+    def _reset_after_fork(self):
+        # The pool's handler threads and pipes belong to the parent
+        self._cond = threading.Condition()
+        self._pool = None
+        self._size = 0
+        self._in_flight = {}
+        self._epoch = 0
+        self._stopped_epoch = -1
+        self.jobs = self.completed = self.failed = self.starts = 0
+
+
+# Global instance
+image_pool = ImageWorkerPool()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=image_pool._reset_after_fork)
@@ -1,28 +1,39 @@
 import logging
 from pathlib import Path
-from typing import Optional, Tuple, Annotated, Dict
+from typing import Optional, Tuple, Annotated, Dict, List
 from io import BytesIO
 from PIL import Image, ImageFilter, ImageOps
-from colorthief import ColorThief
 
 
-from app.services.archive import ComicArchive
+from app.core.derivatives import Derivative
+from app.services.archive import get_image_mime_type
+from app.services.archive_pool import archive_pool
+from app.services.palette import extract_palette
+from app.services.variant_cache import variant_cache
 from app.config import settings
 
 
 class ImageService:
     """Service for extracting and processing comic images"""
 
+    # Pages smaller than this are served as-is even when WebP is requested
+    TRANSCODE_MIN_BYTES = 500_000
+
     def __init__(self):
         self.thumbnail_size: tuple[float, float] = settings.thumbnail_size
         self.avatar_size: tuple[float, float] = settings.avatar_size
 
+    @classmethod
+    def needs_transcode(cls, size: int, mime_type: str, transcode_webp: bool) -> bool:
+        """WebP transcoding only pays off for large, non-WebP pages"""
+        return transcode_webp and size > cls.TRANSCODE_MIN_BYTES and mime_type != "image/webp"
+
     def process_cover(self, comic_path: str, thumbnail_path: Path) -> dict:
         """
         Optimized Workflow:
         1. Open Archive (Expensive I/O) -> Extract Cover
-        2. Calculate Colors (CPU) using a small resized copy
-        3. Resize & Save Thumbnail (CPU/Disk) using the original high-res data
+        2. Calculate Colors + Resize (CPU), see render_cover
+        3. Save Thumbnail (Disk)
 
         Returns: { "success": bool, "palette": dict }
         """
@@ -31,49 +42,18 @@ class ImageService:
         try:
             # 1. Get Raw Bytes (Reuse existing logic, force raw)
             # This handles the archive opening and file detection
-            cover_bytes, success, _ = self.get_page_image(comic_path, 0, transcode_webp=False)
+            cover_bytes, success, _ = self.get_page_image(comic_path, 0, transcode_webp=False, populate_cache=False)
 
             if not success or not cover_bytes:
                 return result
 
-            # 2. Load into Pillow
-            img = Image.open(BytesIO(cover_bytes))
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-
-            # 3. Extract Colors (Run ColorThief on a small copy)
-            # Optimization: Resizing to 150px makes ColorThief 10x faster with 99% accuracy
-            small_img = img.copy()
-            small_img.thumbnail((150, 150))
-
-            # ColorThief needs a file-like object
-            small_bytes = BytesIO()
-            small_img.save(small_bytes, format='JPEG')
-
-            color_thief = ColorThief(small_bytes)
-            # Get 5 colors
-            raw_palette = color_thief.get_palette(color_count=5, quality=10)
-
-            def rgb_to_hex(rgb):
-                return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
-
-            result['palette'] = {
-                'primary': rgb_to_hex(raw_palette[0]),
-                'secondary': rgb_to_hex(raw_palette[1]),
-                'accent1': rgb_to_hex(raw_palette[2]),
-                'accent2': rgb_to_hex(raw_palette[3]) if len(raw_palette) > 3 else None,
-                'accent3': rgb_to_hex(raw_palette[4]) if len(raw_palette) > 4 else None
-            }
-
-            # 4. Generate Thumbnail (Resize the original high-res img)
-            # We do this LAST so we don't accidentally use the tiny 150px image
-            width, height = self.thumbnail_size
-            img.thumbnail((width, height), Image.Resampling.LANCZOS)
+            thumbnail_bytes, palette = self.render_cover(cover_bytes)
 
             # Save
             thumbnail_path.parent.mkdir(parents=True, exist_ok=True)
-            img.save(thumbnail_path, format='WEBP', quality=85)
+            thumbnail_path.write_bytes(thumbnail_bytes)
 
+            result['palette'] = palette
             result['success'] = True
             return result
 
@@ -81,11 +61,62 @@ class ImageService:
             print(f"Error processing cover for {Path(comic_path).name}: {e}")
             return result
 
+    def render_cover(self, cover_bytes: bytes) -> Tuple[bytes, dict]:
+        """
+        Cover image bytes -> (WebP thumbnail bytes, palette dict).
+        No archive or disk access, so it can also run while the scanner has the archive open.
+        """
+        width, height = self.thumbnail_size
+
+        # 1. Reduced decode: JPEGs decode at 1/2..1/8 scale, straight to (at least) the thumbnail
+        # size (draft must run before anything loads the pixels). Other formats go through
+        # thumbnail()'s reduce() step.
+        img = Image.open(BytesIO(cover_bytes))
+        if img.format == "JPEG":
+            img.draft(img.mode, (int(width), int(height)))
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        # 2. Generate Thumbnail
+        img.thumbnail((width, height), Image.Resampling.LANCZOS)
+
+        # 3. Extract Colors from a small copy of the already-small pixels (no encode/decode round trip)
+        # Optimization: 150px is plenty for a 5 color palette
+        small_img = img.copy()
+        small_img.thumbnail((150, 150))
+        palette = self.palette_to_hex(extract_palette(small_img, color_count=5))
+
+        output = BytesIO()
+        img.save(output, format='WEBP', quality=85)
+        return output.getvalue(), palette
+
+    @staticmethod
+    def palette_to_hex(raw_palette: List[Tuple[int, int, int]]) -> Dict[str, Optional[str]]:
+        """Palette as stored on comics (color_primary / color_secondary / color_palette)"""
+        def rgb_to_hex(rgb):
+            return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+
+        # Single-color covers yield a 1-entry palette: repeat it
+        raw_palette = list(raw_palette) or [(0, 0, 0)]
+        while len(raw_palette) < 3:
+            raw_palette.append(raw_palette[-1])
+
+        return {
+            'primary': rgb_to_hex(raw_palette[0]),
+            'secondary': rgb_to_hex(raw_palette[1]),
+            'accent1': rgb_to_hex(raw_palette[2]),
+            'accent2': rgb_to_hex(raw_palette[3]) if len(raw_palette) > 3 else None,
+            'accent3': rgb_to_hex(raw_palette[4]) if len(raw_palette) > 4 else None
+        }
+
 
     def get_page_image(self, comic_path: str, page_index: int,
                        sharpen: bool = False,
                        grayscale: bool = False,
-                       transcode_webp: bool = False
+                       transcode_webp: bool = False,
+                       entry_name: Optional[str] = None,
+                       populate_cache: bool = True,
+                       derivative: Optional[Derivative] = None
                        ) -> Tuple[Optional[bytes], bool, str]:
         """
         Extract a specific page from a comic archive, optionally applying filters.
@@ -96,6 +127,12 @@ class ImageService:
             sharpen: Whether to sharpen the image
             grayscale: Whether to apply grayscale filters
             transcode_webp: Whether to convert the output to WebP (if large)
+            entry_name: Archive entry for this page, from the stored page manifest.
+                        Skips listing/sorting the archive when provided.
+            populate_cache: Unpack CBRs into the extraction cache on a miss.
+                            One-off reads (covers) pass False and only use existing extractions.
+            derivative: Negotiated width tier + codec (w= / Client Hints / Accept).
+                        Overrides the WebP transcode rules when given.
 
         Returns:
             (bytes, success, mimetype)
@@ -107,84 +144,180 @@ class ImageService:
                 print(f"Comic file not found: {comic_path}")
                 return None, False, "application/octet-stream"
 
-            with ComicArchive(file_path) as archive:
+            # Borrow a pooled handle: hold it only while reading bytes,
+            # Pillow work below runs after the handle is released.
+            with archive_pool.open(file_path) as archive:
 
-                pages = archive.get_pages()
+                if not entry_name:
+                    # SLOW LOOKUP: No manifest, list and natural-sort the archive
+                    pages = archive.get_pages()
 
-                if page_index < 0 or page_index >= len(pages):
-                    print(f"Page index {page_index} out of range (0-{len(pages) - 1})")
-                    return None, False, "application/octet-stream"
+                    if page_index < 0 or page_index >= len(pages):
+                        print(f"Page index {page_index} out of range (0-{len(pages) - 1})")
+                        return None, False, "application/octet-stream"
+
+                    entry_name = pages[page_index]
 
                 # Extract Raw Bytes
-                image_bytes = archive.read_file(pages[page_index])
-                original_size = len(image_bytes)
-
-                # Detect original mime type based on file extension in archive
-                # (Simple heuristic is enough here, or use python-magic if you want to be strict)
-                filename = pages[page_index].lower()
-                mime_type = "image/jpeg"  # Default
-                if filename.endswith(".png"): mime_type = "image/png"
-                elif filename.endswith(".webp"): mime_type = "image/webp"
-                elif filename.endswith(".gif"): mime_type = "image/gif"
-
-                # Logic: Should we Transcode?
-                # Only if requested AND image is large (>500KB) AND not already WebP
-                needs_transcode = transcode_webp and original_size > 500_000 and mime_type != "image/webp"
-
-                # FAST PATH: If no processing needed, return raw bytes
-                if not sharpen and not grayscale and not needs_transcode:
-                    return image_bytes, True, mime_type
-
-                # SLOW PATH: Pillow Processing
-                try:
-                    img = Image.open(BytesIO(image_bytes))
-
-                    # Convert to RGB (Strip Alpha/Palette if transcoding to optimize size)
-                    # For WebP, RGBA is fine, but for Grayscale we need L.
-                    if img.mode not in ('RGB', 'L', 'RGBA'):
-                        img = img.convert('RGB')
+                image_bytes = archive.read_file(entry_name, populate_cache=populate_cache)
+
+            original_size = len(image_bytes)
+
+            # Detect original mime type based on file extension in archive
+            # (Simple heuristic is enough here, or use python-magic if you want to be strict)
+            mime_type = get_image_mime_type(entry_name)
 
-                    # 2. OPTIMIZATION: Resize Huge Images
-                    # If we are transcoding for bandwidth/speed, we shouldn't serve 4000px images.
-                    # 2560px is more than enough for iPad Pros/Tablets.
-                    if transcode_webp:
-                        max_dimension = 2560
-                        if img.width > max_dimension or img.height > max_dimension:
-                            img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+            # Logic: Should we Transcode?
+            # Only if requested AND image is large (>500KB) AND not already WebP
+            needs_transcode = self.needs_transcode(original_size, mime_type, transcode_webp)
 
-                    # A. Apply Grayscale
+            # FAST PATH: If no processing needed, return raw bytes
+            if not sharpen and not grayscale and not needs_transcode and derivative is None:
+                return image_bytes, True, mime_type
+
+            # SLOW PATH: Pillow Processing
+            try:
+                img = Image.open(BytesIO(image_bytes))
+
+                if derivative:
+                    # No manifest width to check up front: still never re-encode a page that fits
+                    if not sharpen and not grayscale and derivative.fits(img.width):
+                        return image_bytes, True, mime_type
+                    self._downscale(img, derivative.width)
+                    if img.mode not in ('RGB', 'L', 'RGBA'):
+                        img = img.convert('RGB')
                     if grayscale:
                         img = ImageOps.grayscale(img)
-
-                    # B. Apply Sharpening (UnsharpMask is best for scans)
                     if sharpen:
                         img = img.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
-
-                    # 4. Save / Transcode
-                    output = BytesIO()
-
-                    if needs_transcode or mime_type == "image/webp":
-                        # Encode fast (The biggest latency saver)
-                        # quality=75: Good visual fidelity, low file size
-                        # method=0: Fastest encoding speed
-                        img.save(output, format="WEBP", quality=75, method=0)
-                        return output.getvalue(), True, "image/webp"
-                    else:
-                        # Fallback to JPEG if we just sharpened but didn't ask for WebP
-                        img.save(output, format="JPEG", quality=85)
-                        return output.getvalue(), True, "image/jpeg"
-
-                except Exception as e:
-                    logging.error(f"Image processing failed: {e}")
-                    print(f"Error processing image: {e}")
-                    # CRITICAL: Return original bytes, but flag as FAILED processing
-                    # so the controller knows not to cache this as the 'filtered' version.
-                    return image_bytes, False, mime_type  # Fallback, just return original bytes
+                    return self.encode_derivative(img, derivative), True, derivative.mime_type
+
+                # Convert to RGB (Strip Alpha/Palette if transcoding to optimize size)
+                # For WebP, RGBA is fine, but for Grayscale we need L.
+                if img.mode not in ('RGB', 'L', 'RGBA'):
+                    img = img.convert('RGB')
+
+                # 2. OPTIMIZATION: Resize Huge Images
+                # If we are transcoding for bandwidth/speed, we shouldn't serve 4000px images.
+                # 2560px is more than enough for iPad Pros/Tablets.
+                if transcode_webp:
+                    max_dimension = 2560
+                    if img.width > max_dimension or img.height > max_dimension:
+                        img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+
+                # A. Apply Grayscale
+                if grayscale:
+                    img = ImageOps.grayscale(img)
+
+                # B. Apply Sharpening (UnsharpMask is best for scans)
+                if sharpen:
+                    img = img.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
+
+                # 4. Save / Transcode
+                output = BytesIO()
+
+                if needs_transcode or mime_type == "image/webp":
+                    # Encode fast (The biggest latency saver)
+                    # quality=75: Good visual fidelity, low file size
+                    # method=0: Fastest encoding speed
+                    img.save(output, format="WEBP", quality=75, method=0)
+                    return output.getvalue(), True, "image/webp"
+                else:
+                    # Fallback to JPEG if we just sharpened but didn't ask for WebP
+                    img.save(output, format="JPEG", quality=85)
+                    return output.getvalue(), True, "image/jpeg"
+
+            except Exception as e:
+                logging.error(f"Image processing failed: {e}")
+                print(f"Error processing image: {e}")
+                # CRITICAL: Return original bytes, but flag as FAILED processing
+                # so the controller knows not to cache this as the 'filtered' version.
+                return image_bytes, False, mime_type  # Fallback, just return original bytes
 
         except Exception as e:
             print(f"Error extracting page {page_index}: {e}")
             return None, False, "application/octet-stream"
 
+    @staticmethod
+    def _downscale(img: Image.Image, width: int):
+        """Shrink in place to `width` (never upscales). JPEGs decode at a reduced scale via draft()."""
+        if img.width <= width:
+            return
+        height = max(1, round(img.height * width / img.width))
+        if img.format == "JPEG":
+            img.draft(img.mode, (width, height))
+        img.thumbnail((width, height), Image.Resampling.LANCZOS)
+
+    @staticmethod
+    def encode_derivative(img: Image.Image, derivative: Derivative) -> bytes:
+        output = BytesIO()
+        if derivative.codec == "jpeg":
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            img.save(output, format="JPEG", quality=derivative.quality, optimize=True)
+        elif derivative.codec == "avif":
+            # speed=8: encode time matters more than the last few % of size
+            img.save(output, format="AVIF", quality=derivative.quality, speed=8)
+        else:
+            img.save(output, format="WEBP", quality=derivative.quality, method=0)
+        return output.getvalue()
+
+    def render_page_variant(self, comic_id: int, comic_path: str, page_index: int, mtime_ns: int,
+                            sharpen: bool = False,
+                            grayscale: bool = False,
+                            transcode_webp: bool = False,
+                            entry_name: Optional[str] = None,
+                            derivative: Optional[Derivative] = None,
+                            source_width: Optional[int] = None
+                            ) -> Tuple[Optional[bytes], bool, str]:
+        """
+        get_page_image() + store the result in the variant cache.
+        Only real Pillow output is stored: small/already-WebP pages come back untouched.
+        source_width: manifest width of the page; a derivative it already fits is dropped.
+        """
+        if derivative and not sharpen and not grayscale and derivative.fits(source_width):
+            derivative = None
+
+        image_bytes, success, mime_type = self.get_page_image(
+            comic_path, page_index,
+            sharpen=sharpen, grayscale=grayscale, transcode_webp=transcode_webp,
+            entry_name=entry_name, derivative=derivative
+        )
+
+        variant = variant_cache.variant_key(
+            sharpen=sharpen, grayscale=grayscale, webp=transcode_webp,
+            **(derivative.variant_flags() if derivative else {})
+        )
+        source_mime = get_image_mime_type(entry_name) if entry_name else None
+        transformed = sharpen or grayscale \
+            or (derivative is not None and mime_type == derivative.mime_type) \
+            or (mime_type == "image/webp" and source_mime != "image/webp")
+
+        if variant and success and image_bytes and transformed:
+            variant_cache.put(comic_id, page_index, variant, mtime_ns, image_bytes, mime_type)
+
+        return image_bytes, success, mime_type
+
+    def render_cover_derivative(self, thumb_path: Optional[Path], comic_path: str,
+                                derivative: Derivative) -> Optional[bytes]:
+        """
+        Cover at a negotiated width/codec.
+        Tiers up to the stored thumbnail's width are cut from the thumbnail (cheap);
+        larger ones are rendered from the first page of the archive.
+        """
+        try:
+            if thumb_path and derivative.width <= self.thumbnail_size[0]:
+                img = Image.open(thumb_path)
+                self._downscale(img, derivative.width)
+                return self.encode_derivative(img, derivative)
+
+            image_bytes, success, _ = self.get_page_image(comic_path, 0, populate_cache=False, derivative=derivative)
+            return image_bytes if success else None
+
+        except Exception as e:
+            logging.error(f"Cover derivative failed for {Path(comic_path).name}: {e}")
+            return None
+
     @staticmethod
     def get_page_count(comic_path: str) -> int:
         """Get the number of pages in a comic"""
@@ -192,7 +325,7 @@ class ImageService:
             file_path = Path(comic_path)
             if not file_path.exists():
                 return 0
-            with ComicArchive(file_path) as archive:
+            with archive_pool.open(file_path) as archive:
                 return len(archive.get_pages())
         except Exception:
             return 0
@@ -229,7 +362,7 @@ class ImageService:
             return False
 
     def extract_palette(self, comic_path: str, num_colors=5) -> Optional[Dict[str, str]]:
-        """Extract color palette using ColorThief"""
+        """Extract color palette (median cut on a reduced decode of the cover)"""
         try:
 
             path = Path(comic_path)
@@ -238,24 +371,19 @@ class ImageService:
                 return None
 
             # 1. Get Cover Bytes
-            cover_bytes, success, _ = self.get_page_image(comic_path, 0, transcode_webp=False)
+            cover_bytes, success, _ = self.get_page_image(comic_path, 0, transcode_webp=False, populate_cache=False)
             if not success or not cover_bytes:
                 return None
 
-            color_thief = ColorThief(BytesIO(cover_bytes))
-            palette = color_thief.get_palette(color_count=num_colors, quality=10)
-
-            # Convert to HEX
-            def rgb_to_hex(rgb_tuple):
-                return f"#{rgb_tuple[0]:02x}{rgb_tuple[1]:02x}{rgb_tuple[2]:02x}"
+            # Reduced decode, then quantize the small in-memory pixels
+            img = Image.open(BytesIO(cover_bytes))
+            if img.format == "JPEG":
+                img.draft(img.mode, (150, 150))
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            img.thumbnail((150, 150))
 
-            return {
-                'primary': rgb_to_hex(palette[0]),
-                'secondary': rgb_to_hex(palette[1]),
-                'accent1': rgb_to_hex(palette[2]),
-                'accent2': rgb_to_hex(palette[3]),
-                'accent3': rgb_to_hex(palette[4]) if len(palette) > 4 else None
-            }
+            return self.palette_to_hex(extract_palette(img, color_count=num_colors))
 
         except Exception as e:
             print(f"Color palette extraction failed for {comic_path}: {e}")
@@ -0,0 +1,120 @@
+import os
+import time
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Directory mtimes this close to the walk are not trusted (coarse mtime resolution on
+# SMB/FAT/some NFS servers: a file added in the same tick would not change the mtime)
+RACY_WINDOW_NS = 2 * 1_000_000_000
+
+
+class LibraryWalker:
+    """
+    os.scandir based library walk that prunes unchanged directories.
+
+    - A directory whose mtime matches the previous scan has the same entries, so it is not
+      listed and its files are not stat'ed: they are reported as unchanged (`unchanged_paths`).
+      Its known subdirectories are still visited, since a deep change does not bubble up.
+    - Changed (or unknown) directories are listed; file sizes/mtimes come from DirEntry.stat().
+    - full=True lists every directory (forced scans and the periodic safety net), which also
+      catches files rewritten in place (that does not touch the directory mtime).
+
+    Usage:
+        walker = LibraryWalker(root, ['.cbz'], known_dirs, known_files)
+        for path, mtime, size in walker.walk(): ...
+        walker.directories  -> {path: (mtime_ns, entry_count)} to persist
+    """
+
+    def __init__(self, root: str, extensions: Iterable[str],
+                 known_dirs: Dict[str, Tuple[Optional[int], int]],
+                 known_files: Iterable[str], full: bool = False):
+        self.root = os.path.normpath(root)
+        self.extensions = tuple(e.lower() for e in extensions)
+        self.known_dirs = known_dirs
+        self.full = full
+
+        # Previous scan's tree, so an unchanged directory can be traversed without listing it
+        self._known_children: Dict[str, List[str]] = defaultdict(list)
+        for path in known_dirs:
+            if path != self.root:
+                self._known_children[os.path.dirname(path)].append(path)
+
+        self._known_files: Dict[str, List[str]] = defaultdict(list)
+        for path in known_files:
+            self._known_files[os.path.dirname(path)].append(path)
+
+        # Results
+        self.directories: Dict[str, Tuple[Optional[int], int]] = {}
+        self.unchanged_paths: List[str] = []
+        self.listed = 0
+        self.pruned = 0
+
+    def walk(self) -> Iterator[Tuple[str, float, int]]:
+        """Yield (path, mtime, size) for every supported file in a listed directory"""
+        started_ns = time.time_ns()
+        stack = [self.root]
+        visited = set()
+
+        while stack:
+            directory = stack.pop()
+            if directory in visited:
+                continue
+            visited.add(directory)
+
+            try:
+                st = os.stat(directory)
+            except FileNotFoundError:
+                # Gone: everything below it is reported missing by omission
+                continue
+            except OSError as e:
+                # Transient (NFS hiccup, permissions): keep what we knew instead of deleting it
+                logger.warning(f"Could not stat {directory}: {e}")
+                stack.extend(self._keep_known(directory))
+                continue
+
+            mtime_ns = st.st_mtime_ns
+            trusted = mtime_ns < started_ns - RACY_WINDOW_NS
+            previous = self.known_dirs.get(directory)
+
+            if not self.full and previous and previous[0] is not None and previous[0] == mtime_ns:
+                # Unchanged entries: reuse the last scan's view
+                self.pruned += 1
+                self.directories[directory] = previous
+                self.unchanged_paths.extend(self._known_files.get(directory, ()))
+                stack.extend(self._known_children.get(directory, ()))
+                continue
+
+            self.listed += 1
+            entry_count = 0
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        entry_count += 1
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.name.lower().endswith(self.extensions) and entry.is_file():
+                                # DirEntry caches the stat result
+                                entry_stat = entry.stat()
+                                yield entry.path, entry_stat.st_mtime, entry_stat.st_size
+                        except OSError as e:
+                            logger.warning(f"Skipping {entry.path}: {e}")
+            except OSError as e:
+                logger.warning(f"Could not list {directory}: {e}")
+                stack.extend(self._keep_known(directory))
+                continue
+
+            self.directories[directory] = (mtime_ns if trusted else None, entry_count)
+
+    def _keep_known(self, directory: str) -> List[str]:
+        """
+        Report a directory we could not read as unchanged (and force a listing next time).
+        Returns its known subdirectories, which are still visited.
+        """
+        self.unchanged_paths.extend(self._known_files.get(directory, ()))
+        if directory in self.known_dirs:
+            self.directories[directory] = (None, self.known_dirs[directory][1])
+        return self._known_children.get(directory, [])
@@ -0,0 +1,171 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+# Same quantization as ColorThief / Leptonica MMCQ: 5 bits per channel -> 32x32x32 histogram
+SIGBITS = 5
+RSHIFT = 8 - SIGBITS
+MAX_ITERATION = 1000
+FRACT_BY_POPULATIONS = 0.75
+
+# Value of each histogram cell's center in 8-bit space
+_CELL_CENTER = np.arange(1 << SIGBITS, dtype=np.int64) * (1 << RSHIFT) + (1 << RSHIFT) // 2
+
+RGB = Tuple[int, int, int]
+
+
+class _Box:
+    """Inclusive box of histogram cells: [r1..r2] x [g1..g2] x [b1..b2]"""
+
+    __slots__ = ('bounds', 'histo', '_count')
+
+    def __init__(self, bounds: List[int], histo: np.ndarray):
+        self.bounds = bounds  # [r1, r2, g1, g2, b1, b2]
+        self.histo = histo
+        self._count = None
+
+    @property
+    def cells(self) -> np.ndarray:
+        r1, r2, g1, g2, b1, b2 = self.bounds
+        return self.histo[r1:r2 + 1, g1:g2 + 1, b1:b2 + 1]
+
+    @property
+    def count(self) -> int:
+        if self._count is None:
+            self._count = int(self.cells.sum())
+        return self._count
+
+    @property
+    def volume(self) -> int:
+        r1, r2, g1, g2, b1, b2 = self.bounds
+        return (r2 - r1 + 1) * (g2 - g1 + 1) * (b2 - b1 + 1)
+
+    def with_bound(self, index: int, value: int) -> '_Box':
+        bounds = list(self.bounds)
+        bounds[index] = value
+        return _Box(bounds, self.histo)
+
+    def average(self) -> RGB:
+        r1, r2, g1, g2, b1, b2 = self.bounds
+        cells = self.cells
+        total = self.count
+        if not total:
+            mult = 1 << RSHIFT
+            return (int(mult * (r1 + r2 + 1) / 2), int(mult * (g1 + g2 + 1) / 2), int(mult * (b1 + b2 + 1) / 2))
+
+        # Integer sums (exact), divided like ColorThief so colors match to the unit
+        r_sum = int(cells.sum(axis=(1, 2)) @ _CELL_CENTER[r1:r2 + 1])
+        g_sum = int(cells.sum(axis=(0, 2)) @ _CELL_CENTER[g1:g2 + 1])
+        b_sum = int(cells.sum(axis=(0, 1)) @ _CELL_CENTER[b1:b2 + 1])
+        return (int(r_sum / total), int(g_sum / total), int(b_sum / total))
+
+
+def _median_cut(box: _Box) -> Tuple[Optional[_Box], Optional[_Box]]:
+    """Split a box along its longest axis near the population median (MMCQ's cut rule)"""
+    if not box.count:
+        return None, None
+    if box.count == 1:
+        return box.with_bound(0, box.bounds[0]), None
+
+    r1, r2, g1, g2, b1, b2 = box.bounds
+    widths = (r2 - r1 + 1, g2 - g1 + 1, b2 - b1 + 1)
+    axis = widths.index(max(widths))  # ties prefer r, then g
+
+    # Population of each slice along the axis, then running totals
+    other_axes = tuple(a for a in range(3) if a != axis)
+    lo, hi = box.bounds[2 * axis], box.bounds[2 * axis + 1]
+    partial = dict(zip(range(lo, hi + 1), np.cumsum(box.cells.sum(axis=other_axes)).tolist()))
+    total = partial[hi]
+    lookahead = {i: total - d for i, d in partial.items()}
+
+    for i in range(lo, hi + 1):
+        if partial[i] > total / 2:
+            left = i - lo
+            right = hi - i
+            if left <= right:
+                d2 = min(hi - 1, int(i + right / 2))
+            else:
+                d2 = max(lo, int(i - 1 - left / 2))
+            # Avoid 0-count boxes
+            while not partial.get(d2, False):
+                d2 += 1
+            count2 = lookahead.get(d2)
+            while not count2 and partial.get(d2 - 1, False):
+                d2 -= 1
+                count2 = lookahead.get(d2)
+            return box.with_bound(2 * axis + 1, d2), box.with_bound(2 * axis, d2 + 1)
+
+    return None, None
+
+
+def _split(boxes: List[_Box], sort_key, target: float):
+    """Repeatedly split the largest box (by sort_key) until `target` colors are reached"""
+    n_color = 1
+    n_iter = 0
+    while n_iter < MAX_ITERATION:
+        # Stable ascending sort + pop(): same tie-breaking as ColorThief's PQueue
+        boxes.sort(key=sort_key)
+        box = boxes.pop()
+        if not box.count:
+            boxes.append(box)
+            n_iter += 1
+            continue
+
+        box1, box2 = _median_cut(box)
+        if not box1:
+            raise ValueError("Median cut produced no box")
+        boxes.append(box1)
+        if box2:
+            boxes.append(box2)
+            n_color += 1
+        if n_color >= target:
+            return
+        n_iter += 1
+
+
+def quantize(pixels: np.ndarray, color_count: int) -> List[RGB]:
+    """
+    Median cut (MMCQ) over an (N, 3) uint8 pixel array, most significant color first.
+    Same boxes and colors as colorthief.MMCQ.quantize, with the histogram work in NumPy.
+    """
+    if not len(pixels):
+        raise ValueError("No pixels to quantize")
+    if color_count < 2 or color_count > 256:
+        raise ValueError("color_count must be between 2 and 256")
+
+    quantized = pixels.astype(np.intp) >> RSHIFT
+    index = (quantized[:, 0] << (2 * SIGBITS)) + (quantized[:, 1] << SIGBITS) + quantized[:, 2]
+    histo = np.bincount(index, minlength=1 << (3 * SIGBITS)).reshape((1 << SIGBITS,) * 3)
+
+    lows = quantized.min(axis=0).tolist()
+    highs = quantized.max(axis=0).tolist()
+    boxes = [_Box([lows[0], highs[0], lows[1], highs[1], lows[2], highs[2]], histo)]
+
+    # First set of colors by population, the rest by population x volume
+    _split(boxes, lambda b: b.count, FRACT_BY_POPULATIONS * color_count)
+    # Re-queue in pop order (largest population first), as ColorThief moves pq -> pq2
+    boxes.sort(key=lambda b: b.count)
+    boxes.reverse()
+    _split(boxes, lambda b: b.count * b.volume, color_count - len(boxes))
+
+    boxes.sort(key=lambda b: b.count * b.volume)
+    return [box.average() for box in reversed(boxes)]
+
+
+def extract_palette(img: Image.Image, color_count: int = 5, quality: int = 10) -> List[RGB]:
+    """
+    Dominant colors of an in-memory image.
+    Samples every `quality`th pixel and skips near-white ones (as ColorThief.get_palette does).
+    """
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    pixels = np.frombuffer(img.tobytes(), dtype=np.uint8).reshape(-1, 3)[::quality]
+    pixels = pixels[~(pixels > 250).all(axis=1)]
+
+    # An all-white cover still gets a palette
+    if not len(pixels):
+        pixels = np.full((1, 3), 255, dtype=np.uint8)
+
+    return quantize(pixels, color_count)
@@ -0,0 +1,376 @@
+import os
+import math
+import time
+import zipfile
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Optional, Set, Tuple
+
+from app.config import settings
+from app.core.derivatives import Derivative
+from app.database import SessionLocal
+from app.models.comic import Comic, ComicPage
+from app.services.images import ImageService
+from app.services.variant_cache import variant_cache
+
+logger = logging.getLogger(__name__)
+
+
+class PageMemoryCache:
+    """
+    Small in-memory LRU of raw page bytes warmed by read-ahead.
+    Only used for pages that can't be streamed from a file offset (deflated CBZ, CBR, CB7).
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, Tuple[bytes, str]]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def __contains__(self, key: tuple) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key: tuple, data: bytes, mime_type: str):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self._bytes -= len(old[0])
+            self._entries[key] = (data, mime_type)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class _ReaderSession:
+    """Page-turn tracking for one reader (login token or client address)"""
+
+    def __init__(self):
+        self.comic_id: Optional[int] = None
+        self.last_page: Optional[int] = None
+        self.last_time = 0.0
+        self.avg_interval: Optional[float] = None  # Seconds per forward page turn (EWMA)
+        self.next_comics: Dict[int, int] = {}  # comic_id -> next_comic_id (from read-init)
+
+
+class ReadAheadService:
+    """
+    Warms the pages a reader is about to request while they look at the current one.
+
+    - On page N, pages N+1..N+depth are prepared in the background: processed variants go
+      to the variant cache, raw bytes of slow archives go to a small memory cache and
+      stored CBZ pages are hinted to the OS page cache.
+    - depth adapts to page-turn speed: enough pages to cover LOOKAHEAD_SECONDS of reading.
+    - Near the end of a comic the first pages of next_comic_id (from read-init) are warmed too.
+    - Background work yields to foreground page requests and is dropped when too far behind.
+    """
+
+    LOOKAHEAD_SECONDS = 10.0
+    DEFAULT_DEPTH = 2
+    NEXT_COMIC_PAGES = 2
+    MAX_SESSIONS = 1024
+    MAX_PENDING = 16
+    # Background work waits at most this long for foreground requests to drain
+    MAX_YIELD_SECONDS = 2.0
+
+    def __init__(self, max_depth: int, cache_bytes: int, session_factory=SessionLocal):
+        self.max_depth = max(0, max_depth)
+        self.cache = PageMemoryCache(cache_bytes)
+        self.session_factory = session_factory
+
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, _ReaderSession]" = OrderedDict()
+        # Pages being warmed right now, so overlapping windows don't do the same work twice
+        # (finished pages are looked up in the variant / memory caches, which may evict them)
+        self._in_flight: Set[tuple] = set()
+        self._foreground = 0
+        self._pending = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Counters (per process)
+        self.scheduled = 0
+        self.warmed = 0
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_depth > 0
+
+    @staticmethod
+    def session_key(token: Optional[str], client_host: Optional[str]) -> str:
+        if token:
+            return hashlib.sha1(token.encode("utf-8")).hexdigest()[:16]
+        return client_host or "anonymous"
+
+    # --- Foreground hooks ---
+
+    @contextmanager
+    def foreground(self):
+        """Wrap foreground page requests: background warming pauses while any are in flight"""
+        with self._lock:
+            self._foreground += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._foreground -= 1
+
+    def on_reader_init(self, session_key: str, comic_id: int, next_comic_id: Optional[int]):
+        if not self.enabled or not next_comic_id:
+            return
+        with self._lock:
+            session = self._get_session(session_key)
+            session.next_comics[comic_id] = next_comic_id
+            # Only the current chain matters
+            while len(session.next_comics) > 8:
+                session.next_comics.pop(next(iter(session.next_comics)))
+
+    def on_page_request(self, session_key: str, comic_id: int, page_index: int,
+                        sharpen: bool = False, grayscale: bool = False, webp: bool = False,
+                        derivative: Optional[Derivative] = None):
+        """Record the page turn and schedule the pages after it"""
+        if not self.enabled:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            session = self._get_session(session_key)
+            depth = self._observe(session, comic_id, page_index, now)
+            next_comic_id = session.next_comics.get(comic_id)
+
+            if self._pending >= self.MAX_PENDING:
+                self.dropped += 1
+                return
+            self._pending += 1
+            self.scheduled += 1
+
+        flags = {"sharpen": sharpen, "grayscale": grayscale, "webp": webp}
+        self._get_executor().submit(self._run, comic_id, page_index, depth, next_comic_id, flags, derivative)
+
+    # --- Depth ---
+
+    def _observe(self, session: _ReaderSession, comic_id: int, page_index: int, now: float) -> int:
+        """Update turn speed and return the read-ahead depth (caller holds self._lock)"""
+        forward_turn = session.comic_id == comic_id and session.last_page is not None \
+            and page_index == session.last_page + 1
+
+        if forward_turn:
+            interval = now - session.last_time
+            if session.avg_interval is None:
+                session.avg_interval = interval
+            else:
+                session.avg_interval = 0.7 * session.avg_interval + 0.3 * interval
+        elif session.comic_id != comic_id or session.last_page is None or page_index < session.last_page:
+            # New comic or jump back: speed unknown again
+            session.avg_interval = None
+
+        session.comic_id = comic_id
+        session.last_page = page_index
+        session.last_time = now
+
+        return self.depth_for(session.avg_interval)
+
+    def depth_for(self, avg_interval: Optional[float]) -> int:
+        if not avg_interval:
+            return min(self.DEFAULT_DEPTH, self.max_depth)
+        return max(1, min(self.max_depth, math.ceil(self.LOOKAHEAD_SECONDS / avg_interval)))
+
+    def _get_session(self, session_key: str) -> _ReaderSession:
+        session = self._sessions.get(session_key)
+        if session is None:
+            session = self._sessions[session_key] = _ReaderSession()
+            while len(self._sessions) > self.MAX_SESSIONS:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_key)
+        return session
+
+    # --- Background ---
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # One thread: read-ahead must never compete with requests for CPU
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="read-ahead")
+            return self._executor
+
+    def _wait_for_foreground(self):
+        deadline = time.monotonic() + self.MAX_YIELD_SECONDS
+        while self._foreground > 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+    def _run(self, comic_id: int, page_index: int, depth: int, next_comic_id: Optional[int],
+             flags: dict, derivative: Optional[Derivative]):
+        try:
+            db = self.session_factory()
+            try:
+                page_count = self._warm(db, comic_id, range(page_index + 1, page_index + 1 + depth), flags, derivative)
+
+                # Close to the end: start on the next issue
+                if next_comic_id and page_count is not None and page_index + depth >= page_count - 1:
+                    self._warm(db, next_comic_id, range(self.NEXT_COMIC_PAGES), flags, derivative)
+            finally:
+                db.close()
+        except Exception as e:
+            logger.debug(f"Read-ahead failed for comic {comic_id}: {e}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _warm(self, db, comic_id: int, page_indices: range, flags: dict,
+              derivative: Optional[Derivative] = None) -> Optional[int]:
+        """Prepare the given pages of a comic. Returns the comic's page count."""
+        comic = db.query(Comic.file_path, Comic.file_modified_at, Comic.page_count) \
+            .filter(Comic.id == comic_id).first()
+        if not comic or not comic.file_path:
+            return None
+
+        page_indices = range(page_indices.start, min(page_indices.stop, comic.page_count or 0))
+        if not page_indices:
+            return comic.page_count
+
+        try:
+            source_stat = os.stat(comic.file_path)
+        except OSError:
+            return comic.page_count
+
+        # Manifest is only trusted if the file hasn't changed since the scan
+        manifest = {}
+        if comic.file_modified_at and source_stat.st_mtime <= comic.file_modified_at:
+            manifest = {
+                p.page_index: p for p in db.query(ComicPage).filter(
+                    ComicPage.comic_id == comic_id,
+                    ComicPage.page_index >= page_indices.start,
+                    ComicPage.page_index < page_indices.stop
+                )
+            }
+
+        variant = variant_cache.variant_key(**flags, **(derivative.variant_flags() if derivative else {}))
+        image_service = ImageService()
+
+        for index in page_indices:
+            key = (comic_id, index, variant, source_stat.st_mtime_ns)
+            with self._lock:
+                if key in self._in_flight:
+                    continue
+                self._in_flight.add(key)
+
+            try:
+                self._wait_for_foreground()
+
+                page = manifest.get(index)
+                entry_name = page.filename if page else None
+
+                # Pages that already fit the width tier are served as originals (see the reader)
+                page_variant, page_derivative = variant, derivative
+                if derivative and page and not flags["sharpen"] and not flags["grayscale"] \
+                        and derivative.fits(page.width):
+                    page_variant, page_derivative = variant_cache.variant_key(**flags), None
+
+                if page_variant:
+                    if variant_cache.contains(comic_id, index, page_variant, source_stat.st_mtime_ns):
+                        continue
+                    image_service.render_page_variant(
+                        comic_id, comic.file_path, index, source_stat.st_mtime_ns,
+                        sharpen=flags["sharpen"], grayscale=flags["grayscale"], transcode_webp=flags["webp"],
+                        entry_name=entry_name, derivative=page_derivative,
+                        source_width=page.width if page else None
+                    )
+
+                elif page and page.data_offset is not None and page.compress_type == zipfile.ZIP_STORED:
+                    # Served zero-copy from the file: just get the bytes into the OS page cache
+                    self._advise_willneed(comic.file_path, page.data_offset, page.file_size or 0)
+
+                else:
+                    memory_key = (comic_id, index, source_stat.st_mtime_ns)
+                    if memory_key in self.cache:
+                        continue
+                    image_bytes, success, mime_type = image_service.get_page_image(
+                        comic.file_path, index, entry_name=entry_name
+                    )
+                    if success and image_bytes:
+                        self.cache.put(memory_key, image_bytes, mime_type)
+
+                self.warmed += 1
+            finally:
+                with self._lock:
+                    self._in_flight.discard(key)
+
+        return comic.page_count
+
+    @staticmethod
+    def _advise_willneed(filepath: str, offset: int, length: int):
+        if not hasattr(os, "posix_fadvise") or length <= 0:
+            return
+        with open(filepath, "rb") as f:
+            os.posix_fadvise(f.fileno(), offset, length, os.POSIX_FADV_WILLNEED)
+
+    def drain(self):
+        """Block until scheduled work is finished (tests / shutdown)"""
+        if self._executor is not None:
+            self._executor.submit(lambda: None).result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "max_depth": self.max_depth,
+                "sessions": len(self._sessions),
+                "pending": self._pending,
+                "scheduled": self.scheduled,
+                "warmed": self.warmed,
+                "dropped": self.dropped,
+                "memory_cache": self.cache.stats(),
+            }
+
+    def _reset_after_fork(self):
+        # Executor threads don't survive a fork
+        self._lock = threading.Lock()
+        self._executor = None
+        self._sessions = OrderedDict()
+        self._in_flight = set()
+        self._foreground = self._pending = 0
+        self.cache = PageMemoryCache(self.cache.max_bytes)
+
+
+# Global instance
+read_ahead = ReadAheadService(settings.read_ahead_depth, settings.read_ahead_cache_mb * 1024 * 1024)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=read_ahead._reset_after_fork)
@@ -1,80 +1,59 @@
 import logging
 from sqlalchemy.orm import Session
-from typing import Optional, Dict
-from app.models import ReadingList, ReadingListItem, Comic
+from typing import Optional, Dict, Iterable, Tuple
+from app.models import ReadingList
 from app.services.enrichment import EnrichmentService
 
 class ReadingListService:
     def __init__(self, db: Session):
         self.db = db
-        self.list_cache: Dict[str, ReadingList] = {}
+        # name -> reading list id (filled by preload / resolve_list_ids)
+        self.list_cache: Dict[str, int] = {}
         self.logger = logging.getLogger(__name__)
         self.enrichment = EnrichmentService()
 
-    def get_or_create_reading_list(self, name: str) -> ReadingList:
-        name = name.strip()
+    def preload(self):
+        """Load every known reading list name once"""
+        self.list_cache = dict(self.db.query(ReadingList.name, ReadingList.id))
 
-        if name in self.list_cache:
-            return self.list_cache[name]
+    def resolve_list_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """Map names to reading list ids, creating the missing lists in one batch (Flush only)"""
+        missing = [name for name in dict.fromkeys(names) if name not in self.list_cache]
+        if not missing:
+            return self.list_cache
 
-        reading_list = self.db.query(ReadingList).filter(ReadingList.name == name).first()
-
-        if not reading_list:
+        created = []
+        for name in missing:
             reading_list = ReadingList(name=name, auto_generated=1)
 
             # Attempt to enrich description
-            # Since this is async, we ideally await it.
-            # If this method is sync, we might need to run it synchronously or background it.
-            # For simplicity, let's assume we can run it:
             description = self.enrichment.get_description(name)
             if description:
                 reading_list.description = description
 
-            self.db.add(reading_list)
-            self.db.flush()
+            created.append(reading_list)
             print(f"Created reading list: {name}")
             self.logger.debug(f"Created reading list: {name}")
 
-        self.list_cache[name] = reading_list
-        return reading_list
-
-    def add_comic_to_list(self, comic: Comic, list_name: str, position: float):
-        reading_list = self.get_or_create_reading_list(list_name)
-
-        existing = self.db.query(ReadingListItem).filter(
-            ReadingListItem.reading_list_id == reading_list.id,
-            ReadingListItem.comic_id == comic.id
-        ).first()
-
-        if existing:
-            if existing.position != position:
-                existing.position = position
-                # No commit
-        else:
-            item = ReadingListItem(
-                reading_list_id=reading_list.id,
-                comic_id=comic.id,
-                position=position
-            )
-            self.db.add(item)
-            # No commit
+        self.db.add_all(created)
+        self.db.flush()
+        self.list_cache.update((rl.name, rl.id) for rl in created)
+        return self.list_cache
 
-    def remove_comic_from_all_lists(self, comic_id: int):
-        self.db.query(ReadingListItem).filter(
-            ReadingListItem.comic_id == comic_id
-        ).delete()
-        # No commit
+    def get_list_entry(self, alternate_series: Optional[str],
+                       alternate_number: Optional[str]) -> Optional[Tuple[str, float]]:
+        """(list name, position) a comic belongs to, from AlternateSeries / AlternateNumber"""
+        if not alternate_series or not alternate_number:
+            return None
 
-    def update_comic_reading_lists(self, comic: Comic, alternate_series: Optional[str],
-                                   alternate_number: Optional[str]):
-        self.remove_comic_from_all_lists(comic.id)
+        name = alternate_series.strip()
+        if not name:
+            return None
 
-        if alternate_series and alternate_number:
-            try:
-                position = float(alternate_number)
-                self.add_comic_to_list(comic, alternate_series, position)
-            except ValueError:
-                pass
+        try:
+            return name, float(alternate_number)
+        except ValueError:
+            return None
 
     def cleanup_empty_lists(self):
         # This usually runs at the end of the scan, safe to run logic here
@@ -83,5 +62,4 @@ class ReadingListService:
         for rl in empty_lists:
             self.db.delete(rl)
             # Invalidate cache if we delete
-            if rl.name in self.list_cache:
-                del self.list_cache[rl.name]
\ No newline at end of file
+            self.list_cache.pop(rl.name, None)
@@ -0,0 +1,275 @@
+import os
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.comic_helpers import get_comic_age_restriction, REVERSE_NUMBERING_SERIES
+from app.models.comic import Comic, Volume
+from app.models.series import Series
+from app.models.pull_list import PullList, PullListItem
+from app.models.reading_list import ReadingList, ReadingListItem
+from app.models.collection import Collection, CollectionItem
+
+logger = logging.getLogger(__name__)
+
+
+class Generation:
+    """
+    Cross-process change token backed by a file under cache_dir.
+    bump() atomically replaces the file with a fresh random token; current() is one small
+    read, so every uvicorn worker sees a bump on its next request without any IPC.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def current(self) -> str:
+        try:
+            return self.path.read_text()
+        except OSError:
+            return ""
+
+    def bump(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}")
+            tmp.write_text(uuid.uuid4().hex)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not bump {self.path.name}: {e}")
+
+
+class ReadingOrder:
+    """Ordered comic ids of one navigation context, with O(1) position lookup"""
+
+    def __init__(self, ids: List[int], label: Optional[str]):
+        self.ids = ids
+        self.label = label
+        self._positions: Dict[int, int] = {comic_id: index for index, comic_id in enumerate(ids)}
+        # Set when built by a forced rebuild; callers don't force another in the same generation
+        self.rebuilt = False
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, comic_id: int) -> bool:
+        return comic_id in self._positions
+
+    def position(self, comic_id: int) -> Optional[int]:
+        return self._positions.get(comic_id)
+
+    def neighbours(self, comic_id: int) -> Tuple[Optional[int], Optional[int]]:
+        """(prev_id, next_id)"""
+        index = self._positions.get(comic_id)
+        if index is None:
+            return None, None
+        prev_id = self.ids[index - 1] if index > 0 else None
+        next_id = self.ids[index + 1] if index < len(self.ids) - 1 else None
+        return prev_id, next_id
+
+
+def age_profile(user) -> Optional[Tuple[str, bool]]:
+    """Users with the same age settings see the same filtered order"""
+    if not user or user.is_superuser or not user.max_age_rating:
+        return None
+    return user.max_age_rating, bool(user.allow_unknown_age_ratings)
+
+
+class ReadingOrderCache:
+    """
+    Per-process LRU of reading orders keyed by (context_type, context_id, age profile).
+
+    Every entry remembers the generation it was built under; any scan or list edit bumps
+    the generation and entries rebuild lazily on their next use.
+    Shared by reader navigation (read-init) and the cover browser manifest.
+    """
+
+    def __init__(self, generation: Generation, max_entries: int = 256):
+        self.generation = generation
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, Tuple[str, ReadingOrder]]" = OrderedDict()
+
+        # Counters (per process)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db: Session, context_type: str, context_id: int, user, rebuild: bool = False) -> ReadingOrder:
+        key = (context_type, context_id, age_profile(user))
+        generation = self.generation.current()
+
+        if not rebuild:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and entry[0] == generation:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+
+        # Build outside the lock (concurrent misses may both build; last one wins)
+        order = build_reading_order(db, context_type, context_id, user)
+        order.rebuilt = rebuild
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (generation, order)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return order
+
+    def invalidate(self):
+        """Bump the shared generation (all workers rebuild on next use)"""
+        self.generation.bump()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def build_reading_order(db: Session, context_type: str, context_id: int, user) -> ReadingOrder:
+    """
+    Ordered comic ids for a context.
+    Uses id-only queries ordered by the persisted sort keys (indexed) and the comic-level age filter of the user.
+    Handles Reverse Numbering (Countdown) and Date Sorting (Zero Hour).
+    """
+    # Whitelist filter: Unrated (NULL) comics are included correctly
+    safe_filter = get_comic_age_restriction(user)
+
+    # --- STRATEGY PATTERN ---
+    if context_type == "pull_list":
+        # 1. Pull List Strategy
+        label = db.query(PullList.name).filter(PullList.id == context_id).scalar()
+
+        # Join Comic to avoid Cartesian Product
+        query = db.query(PullListItem.comic_id).join(Comic, PullListItem.comic_id == Comic.id).filter(
+            PullListItem.pull_list_id == context_id
+        )
+
+        if safe_filter is not None:
+            query = query.filter(safe_filter)
+
+        ids = [i[0] for i in query.order_by(PullListItem.sort_order).all()]
+
+    elif context_type == "reading_list":
+        # 2. Reading List Strategy (Fixes Armageddon 2001)
+        label = db.query(ReadingList.name).filter(ReadingList.id == context_id).scalar()
+
+        query = db.query(ReadingListItem.comic_id) \
+            .join(Comic, ReadingListItem.comic_id == Comic.id) \
+            .filter(ReadingListItem.reading_list_id == context_id)
+
+        if safe_filter is not None:
+            query = query.filter(safe_filter)
+
+        ids = [i[0] for i in query.order_by(ReadingListItem.position).all()]
+
+    elif context_type == "collection":
+        # 3. Collection Strategy (Thematic)
+        label = db.query(Collection.name).filter(Collection.id == context_id).scalar()
+
+        # Collections usually don't have explicit order
+        # Simplified Sort: Year -> Series -> Number
+        query = db.query(CollectionItem.comic_id) \
+            .join(Comic, CollectionItem.comic_id == Comic.id) \
+            .join(Volume, Comic.volume_id == Volume.id) \
+            .join(Series, Volume.series_id == Series.id) \
+            .filter(CollectionItem.collection_id == context_id)
+
+        if safe_filter is not None:
+            query = query.filter(safe_filter)
+
+        items = query.order_by(
+            Comic.year.asc(),
+            Series.name.asc(),
+            Comic.sort_number,
+            Comic.sort_suffix
+        ).all()
+
+        ids = [i[0] for i in items]
+
+    elif context_type == "series":
+        # 4. Series Strategy
+        label = db.query(Series.name).filter(Series.id == context_id).scalar()
+
+        # Gimmick Detection
+        number_direction = Comic.sort_number.asc()
+        if label and label.lower() in REVERSE_NUMBERING_SERIES:
+            number_direction = Comic.sort_number.desc()
+
+        query = db.query(Comic.id).join(Volume).filter(
+            Volume.series_id == context_id
+        )
+
+        if safe_filter is not None:
+            query = query.filter(safe_filter)
+
+        items = query.order_by(
+            Volume.volume_number,
+            Comic.format_weight,  # Plain(1) -> Annual(2) -> Special(3)
+            Comic.sort_date,
+            number_direction,
+            Comic.sort_suffix
+        ).all()
+
+        ids = [i[0] for i in items]
+
+    else:
+        # 5. Default / Volume Strategy
+        volume = db.query(Volume.volume_number, Series.name).join(Series) \
+            .filter(Volume.id == context_id).first()
+        if not volume:
+            return ReadingOrder([], None)
+
+        series_name, vol_num = volume.name, volume.volume_number
+        label = f"{series_name} (vol {vol_num})"
+
+        is_reverse = series_name.lower() in REVERSE_NUMBERING_SERIES
+
+        # Priority: Format -> Date -> Number (walks idx_comic_volume_reading_sort)
+        # Gimmick series usually have correct Dates (Countdown does): if Dates are present,
+        # Date Sort handles the ordering. If Dates are missing, we fall back to Number.
+        query = db.query(Comic.id, Comic.sort_date).filter(
+            Comic.volume_id == context_id
+        )
+
+        if safe_filter is not None:
+            query = query.filter(safe_filter)
+
+        siblings = query.order_by(
+            Comic.format_weight,
+            Comic.sort_date,
+            Comic.sort_number,
+            Comic.sort_suffix
+        ).all()
+
+        # Gimmick Fallback: a reverse series whose dates were useless (all same or missing)
+        # is flipped to get 50, 49, 48...
+        if is_reverse:
+            unique_dates = {x[1] for x in siblings}
+            if len(unique_dates) <= 1:
+                siblings.reverse()
+
+        ids = [x[0] for x in siblings]
+
+    return ReadingOrder(ids, label)
+
+
+# Global instance
+reading_order_cache = ReadingOrderCache(Generation(settings.cache_dir / "reading_order.gen"))
@@ -0,0 +1,199 @@
+import os
+import time
+import shutil
+import logging
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.settings_loader import get_cached_setting
+from app.models.comic import Comic, Volume, ComicPage
+from app.models.series import Series
+from app.services.archive import ComicArchive
+from app.services.archive_pool import archive_pool
+from app.services.extraction_cache import extraction_cache
+from app.services.variant_cache import variant_cache
+
+# Formats that are slow for random page access
+REPACK_EXTENSIONS = ('.cbr', '.cb7')
+
+
+class RepackService:
+    """
+    Repacks CBR/CB7 archives into ZIP_STORED CBZ files for fast random access.
+    The Comic row is updated in place (same id), so reading progress, lists
+    and collections are untouched.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.logger = logging.getLogger(__name__)
+
+    def _get_targets(self, library_id: Optional[int] = None):
+        query = self.db.query(Comic.id).filter(
+            or_(*[Comic.filename.ilike(f"%{ext}") for ext in REPACK_EXTENSIONS])
+        )
+        if library_id:
+            query = query.join(Volume).join(Series).filter(Series.library_id == library_id)
+
+        return [r[0] for r in query.all()]
+
+    def repack_library(self, library_id: Optional[int] = None) -> dict:
+        """Repack every CBR/CB7 in a library (or all libraries). Commits per comic."""
+        delete_originals = get_cached_setting("system.repack.delete_originals", False)
+
+        stats = {
+            "repacked": 0,
+            "skipped": 0,
+            "errors": 0,
+            "bytes_before": 0,
+            "bytes_after": 0,
+            "bytes_saved": 0,
+            "page_latency_ms_before": 0.0,
+            "page_latency_ms_after": 0.0,
+            "page_latency_ms_saved": 0.0,
+        }
+        latency_before = []
+        latency_after = []
+
+        for comic_id in self._get_targets(library_id):
+            comic = self.db.get(Comic, comic_id)
+            if not comic:
+                continue
+
+            try:
+                result = self.repack_comic(comic, delete_original=delete_originals)
+            except Exception as e:
+                self.db.rollback()
+                self.logger.error(f"Repack failed for {comic.filename}: {e}")
+                stats["errors"] += 1
+                continue
+
+            if not result:
+                stats["skipped"] += 1
+                continue
+
+            stats["repacked"] += 1
+            stats["bytes_before"] += result["bytes_before"]
+            stats["bytes_after"] += result["bytes_after"]
+            latency_before.append(result["page_latency_ms_before"])
+            latency_after.append(result["page_latency_ms_after"])
+
+        # Stored CBZ can be LARGER than a RAR (no compression): negative savings are reported honestly
+        stats["bytes_saved"] = stats["bytes_before"] - stats["bytes_after"]
+
+        if latency_before:
+            stats["page_latency_ms_before"] = round(sum(latency_before) / len(latency_before), 2)
+            stats["page_latency_ms_after"] = round(sum(latency_after) / len(latency_after), 2)
+            stats["page_latency_ms_saved"] = round(stats["page_latency_ms_before"] - stats["page_latency_ms_after"], 2)
+
+        return stats
+
+    @staticmethod
+    def _time_page_read(filepath: Path) -> float:
+        """What the reader pays for one page: open + list + read a middle page (ms)"""
+        start = time.perf_counter()
+        with ComicArchive(filepath) as archive:
+            pages = archive.get_pages()
+            if pages:
+                archive.read_file(pages[len(pages) // 2], populate_cache=False)
+        return (time.perf_counter() - start) * 1000
+
+    def repack_comic(self, comic: Comic, delete_original: bool = False) -> Optional[dict]:
+        """
+        Repack a single comic. Returns None when skipped.
+        Order matters for safety: write temp -> atomic rename -> commit DB -> retire original.
+        """
+        source = Path(comic.file_path)
+        if source.suffix.lower() not in REPACK_EXTENSIONS or not source.exists():
+            return None
+
+        target = source.with_suffix(".cbz")
+        if target.exists():
+            self.logger.warning(f"Repack skipped, {target.name} already exists")
+            return None
+
+        bytes_before = os.path.getsize(source)
+        latency_before = self._time_page_read(source)
+
+        tmp_target = target.with_name(f".{target.name}.tmp")
+
+        try:
+            with ComicArchive(source) as archive:
+                names = archive.get_file_list()
+
+                # One extraction pass (per-entry reads are O(n^2) on solid RARs)
+                settings.cache_dir.mkdir(parents=True, exist_ok=True)
+                with tempfile.TemporaryDirectory(dir=settings.cache_dir) as tmp_dir:
+                    archive.archive.extractall(path=tmp_dir)
+
+                    # Keep every file (pages, ComicInfo.xml, credits...) in original order
+                    with zipfile.ZipFile(tmp_target, "w", compression=zipfile.ZIP_STORED) as zf:
+                        for name in names:
+                            extracted = Path(tmp_dir) / name
+                            if extracted.is_file():
+                                zf.write(extracted, arcname=name)
+
+            # Sanity check before anything is replaced
+            with zipfile.ZipFile(tmp_target) as zf:
+                if zf.testzip() is not None:
+                    raise ValueError("Repacked archive failed CRC check")
+
+            os.replace(tmp_target, target)
+        finally:
+            if tmp_target.exists():
+                tmp_target.unlink()
+
+        try:
+            with ComicArchive(target) as archive:
+                pages = archive.get_page_entries(probe_dimensions=True)
+                # Describes the new file: move detection must recognise the .cbz, not the old archive
+                fingerprint = archive.fingerprint()
+
+            if len(pages) != (comic.page_count or len(pages)):
+                raise ValueError(f"Page count mismatch after repack ({len(pages)} vs {comic.page_count})")
+
+            # Update in place: same id, so progress/list membership survive
+            comic.file_path = str(target)
+            comic.filename = target.name
+            comic.file_size = os.path.getsize(target)
+            comic.file_modified_at = os.path.getmtime(target)
+            comic.fingerprint = fingerprint
+
+            self.db.query(ComicPage).filter(ComicPage.comic_id == comic.id).delete(synchronize_session=False)
+            self.db.add_all([
+                ComicPage(comic_id=comic.id, page_index=index, **entry)
+                for index, entry in enumerate(pages)
+            ])
+
+            self.db.commit()
+        except Exception:
+            # DB still points at the original; drop the new file
+            target.unlink(missing_ok=True)
+            raise
+
+        archive_pool.invalidate(source)
+        extraction_cache.invalidate(source)
+        variant_cache.invalidate(comic.id)
+
+        # Retire the original (renamed so the scanner won't re-import it as a duplicate)
+        if delete_original:
+            source.unlink()
+        else:
+            shutil.move(str(source), str(source) + ".bak")
+
+        latency_after = self._time_page_read(target)
+
+        self.logger.info(f"Repacked {source.name} -> {target.name}")
+
+        return {
+            "bytes_before": bytes_before,
+            "bytes_after": comic.file_size,
+            "page_latency_ms_before": latency_before,
+            "page_latency_ms_after": latency_after,
+        }
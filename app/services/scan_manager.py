@@ -15,6 +15,7 @@ from app.models.job import JobType, JobStatus
 from app.services.scanner import LibraryScanner
 from app.services.maintenance import MaintenanceService
 from app.services.thumbnailer import ThumbnailService
+from app.services.repack import RepackService
 
 
 class ScanManager:
@@ -145,6 +146,68 @@ class ScanManager:
         finally:
             db.close()
 
+    def add_path_task(self, library_id: int, paths) -> dict:
+        """
+        Queue a targeted scan of changed files / directories (watcher events).
+        Paths are merged into a pending targeted job for the library; past the
+        scanning.targeted_scan_limit setting, a full scan is queued instead.
+        """
+        limit = int(get_cached_setting("scanning.targeted_scan_limit", 500))
+        paths = set(paths)
+
+        if len(paths) > limit:
+            self.logger.info(f"{len(paths)} changed paths in library {library_id}: queuing a full scan")
+            return self.add_task(library_id, force=False)
+
+        self.logger.debug(f"Adding PATH_SCAN job for library {library_id} to queue ({len(paths)} paths)")
+
+        db = SessionLocal()
+        try:
+            # A pending full scan already covers these paths
+            full_scan = db.query(ScanJob).filter(
+                ScanJob.library_id == library_id,
+                ScanJob.job_type == JobType.SCAN,
+                ScanJob.status == JobStatus.PENDING
+            ).first()
+
+            if full_scan:
+                return {"status": "ignored", "job_id": full_scan.id, "message": "Scan already queued"}
+
+            pending = db.query(ScanJob).filter(
+                ScanJob.library_id == library_id,
+                ScanJob.job_type == JobType.PATH_SCAN,
+                ScanJob.status == JobStatus.PENDING
+            ).first()
+
+            if pending:
+                merged = paths | set(json.loads(pending.payload or "{}").get("paths", []))
+                changes = {"payload": json.dumps({"paths": sorted(merged)})}
+                if len(merged) > limit:
+                    changes = {"payload": None, "job_type": JobType.SCAN}
+
+                # Only while still pending (the worker may have claimed it meanwhile)
+                rows_affected = db.query(ScanJob).filter(
+                    ScanJob.id == pending.id,
+                    ScanJob.status == JobStatus.PENDING
+                ).update(changes)
+                db.commit()
+
+                if rows_affected:
+                    return {"status": "merged", "job_id": pending.id, "message": "Paths added to queued scan"}
+
+            job = ScanJob(
+                library_id=library_id,
+                job_type=JobType.PATH_SCAN,
+                payload=json.dumps({"paths": sorted(paths)}),
+                status=JobStatus.PENDING
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            return {"status": "queued", "job_id": job.id, "message": "Targeted scan queued"}
+        finally:
+            db.close()
+
     def _process_queue(self):
         """Poller loop"""
         self.logger.info("Database Job Worker Started")
@@ -153,10 +216,10 @@ class ScanManager:
         while not self._stop_event.is_set():
             db = SessionLocal()
             try:
-                # Priority: SCAN -> THUMBNAIL -> CLEANUP
+                # Priority: SCAN / PATH_SCAN -> THUMBNAIL -> CLEANUP -> REPACK
                 job = db.query(ScanJob).filter(
                     ScanJob.status == JobStatus.PENDING,
-                    ScanJob.job_type == JobType.SCAN
+                    ScanJob.job_type.in_([JobType.SCAN, JobType.PATH_SCAN])
                 ).order_by(asc(ScanJob.created_at)).first()
 
                 if not job:
@@ -171,6 +234,12 @@ class ScanManager:
                         ScanJob.job_type == JobType.CLEANUP
                     ).order_by(asc(ScanJob.created_at)).first()
 
+                if not job:
+                    job = db.query(ScanJob).filter(
+                        ScanJob.status == JobStatus.PENDING,
+                        ScanJob.job_type == JobType.REPACK
+                    ).order_by(asc(ScanJob.created_at)).first()
+
                 if job:
                     # ATOMIC CLAIM
                     rows_affected = db.query(ScanJob).filter(
@@ -189,7 +258,8 @@ class ScanManager:
                         "id": job.id,
                         "library_id": job.library_id,
                         "type": job.job_type,
-                        "force": job.force_scan
+                        "force": job.force_scan,
+                        "payload": job.payload
                     }
                     db.close()  # Close immediately
 
@@ -198,12 +268,14 @@ class ScanManager:
                         self._set_library_scanning_status(job_data['library_id'], True)
 
                     # Execute
-                    if job_data['type'] == JobType.SCAN:
+                    if job_data['type'] in (JobType.SCAN, JobType.PATH_SCAN):
                         self._run_scan_job(job_data)
                     elif job_data['type'] == JobType.THUMBNAIL:
                         self._run_thumbnail_job(job_data)
                     elif job_data['type'] == JobType.CLEANUP:
                         self._run_cleanup_job(job_data)
+                    elif job_data['type'] == JobType.REPACK:
+                        self._run_repack_job(job_data)
 
                 else:
                     db.close()
@@ -250,7 +322,12 @@ class ScanManager:
         db_scan = SessionLocal()
         try:
             library = db_scan.query(Library).get(library_id)
-            if library:
+            if library and job_data['type'] == JobType.PATH_SCAN:
+                paths = json.loads(job_data['payload'] or "{}").get("paths", [])
+                self.logger.info(f"Starting PATH_SCAN job {job_id} ({len(paths)} paths)")
+                scanner = LibraryScanner(library, db_scan)
+                results = scanner.scan_paths(paths)
+            elif library:
                 self.logger.info(f"Starting SCAN job {job_id}")
                 scanner = LibraryScanner(library, db_scan)
                 results = scanner.scan(force=force)
@@ -271,6 +348,7 @@ class ScanManager:
             summary = {
                 "imported": results.get("imported", 0),
                 "updated": results.get("updated", 0),
+                "moved": results.get("moved", 0),
                 "deleted": results.get("deleted", 0),
                 "errors": results.get("errors", 0),
                 "elapsed": results.get("elapsed", 0)
@@ -377,6 +455,61 @@ class ScanManager:
         if library_id:
             self._set_library_scanning_status(library_id, False)
 
+    def _run_repack_job(self, job_data):
+        job_id = job_data['id']
+        library_id = job_data['library_id']
+
+        stats = {}
+        error = None
+
+        # 1. Run Logic
+        db_repack = SessionLocal()
+        try:
+            self.logger.info(f"Starting REPACK job {job_id}")
+            stats = RepackService(db_repack).repack_library(library_id=library_id)
+        except Exception as e:
+            error = str(e)
+            self.logger.error(f"Repack failed: {e}")
+            traceback.print_exc()
+        finally:
+            db_repack.close()
+
+        # 2. Update Status
+        if error:
+            self._safe_job_update(job_id, JobStatus.FAILED, error=error)
+        else:
+            self._safe_job_update(job_id, JobStatus.COMPLETED, summary=stats)
+
+        # 3. Reset Flag
+        if library_id:
+            self._set_library_scanning_status(library_id, False)
+
+    def add_repack_task(self, library_id: int = None) -> dict:
+        """Queue a CBR/CB7 -> CBZ (stored) repack task (library_id=None for all libraries)"""
+
+        self.logger.debug(f"Adding REPACK job for library {library_id} to queue")
+
+        db = SessionLocal()
+        try:
+            # Check for existing job to avoid stacking
+            existing = db.query(ScanJob).filter(
+                ScanJob.library_id == library_id,
+                ScanJob.job_type == JobType.REPACK,
+                ScanJob.status.in_([JobStatus.PENDING, JobStatus.RUNNING])
+            ).first()
+
+            if existing:
+                return {"status": "ignored", "job_id": existing.id, "message": "Repack already queued"}
+
+            job = ScanJob(library_id=library_id, job_type=JobType.REPACK, status=JobStatus.PENDING)
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+
+            return {"status": "queued", "job_id": job.id, "message": "Repack job queued"}
+        finally:
+            db.close()
+
     def add_cleanup_task(self) -> dict:
         """Queue a global cleanup task"""
 
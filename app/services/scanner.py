@@ -1,40 +1,150 @@
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional, Iterator, Tuple
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
+from collections import deque
 import json
+import functools
+import multiprocessing
 import os
 import time
 import logging
 
 from app.config import settings
-from app.models.library import Library
+from app.core.settings_loader import get_cached_setting
+from app.core.comic_helpers import get_sort_keys
+from app.models.library import Library, ScannedDirectory
 from app.models.series import Series
-from app.models.comic import Volume, Comic
+from app.models.comic import Volume, Comic, ComicPage
 from app.services.archive import ComicArchive
+from app.services.archive_pool import archive_pool
+from app.services.library_walker import LibraryWalker
+from app.services.extraction_cache import extraction_cache
+from app.services.variant_cache import variant_cache
+from app.services.reading_order import reading_order_cache
 from app.services.metadata import parse_comicinfo
 from app.services.tags import TagService
 from app.services.credits import CreditService
 from app.services.reading_list import ReadingListService
 from app.services.collection import CollectionService
+from app.services.association_batch import AssociationBatch
 from app.services.images import ImageService
 
+logger = logging.getLogger(__name__)
+
+
+def extract_metadata(file_path: Path, covers: bool = False) -> Optional[Dict]:
+    """
+    Extract metadata and the page manifest from a comic archive (no DB access).
+    covers=True (fused scan): also render the cover thumbnail + palette from the same
+    archive open, returned as metadata['cover'] = {'thumbnail': bytes, 'palette': dict}.
+    """
+    cover_bytes = None
+    try:
+        with ComicArchive(file_path) as archive:
+            # Ordered page manifest (persisted so the reader can skip the archive listing)
+            # Includes page geometry read from image headers
+            pages = archive.get_page_entries(probe_dimensions=True)
+
+            if not pages:
+                logger.warning(f"Warning: No valid image pages found in {file_path.name}")
+                return None
+
+            comicinfo_xml = archive.get_comicinfo()
+
+            # 1. Establish Physical Truth of page count
+            physical_count = len(pages)
+            metadata = {'page_count': physical_count, 'pages': pages, 'fingerprint': archive.fingerprint()}
+
+            if comicinfo_xml:
+                parsed = parse_comicinfo(comicinfo_xml)
+                metadata.update(parsed)
+
+                # Force overwrite: Always use physical count for this field.
+                # We trust the file system over the XML tag for navigational safety in the reader.
+                metadata['page_count'] = physical_count
+
+                metadata['raw_metadata'] = parsed
+
+            if covers:
+                cover_bytes = _read_cover(archive, pages[0]['filename'])
+
+    except Exception as e:
+        logger.error(f"Error extracting metadata from {file_path}: {e}")
+        return None
+
+    # Pillow work runs after the archive is closed
+    if cover_bytes:
+        try:
+            thumbnail, palette = ImageService().render_cover(cover_bytes)
+            metadata['cover'] = {'thumbnail': thumbnail, 'palette': palette}
+        except Exception as e:
+            # Not fatal: the comic stays dirty and the THUMBNAIL job retries it
+            logger.warning(f"Could not render cover for {file_path.name}: {e}")
+
+    return metadata
+
+
+def _read_cover(archive: ComicArchive, entry_name: str) -> Optional[bytes]:
+    try:
+        # One-off read: don't unpack a whole CBR into the extraction cache
+        return archive.read_file(entry_name, populate_cache=False)
+    except Exception as e:
+        logger.warning(f"Could not read cover of {archive.filepath}: {e}")
+        return None
+
+
+def _metadata_worker(file_path_str: str, covers: bool = False) -> Optional[Dict]:
+    """Process pool entry point (must be top-level to be picklable)"""
+    return extract_metadata(Path(file_path_str), covers=covers)
+
+
+# Stored when a backfill can't read the archive: not retried until the file changes
+# (a modified file is re-extracted, which writes a real fingerprint)
+UNREADABLE_FINGERPRINT = "unreadable"
+
+
+def _fingerprint_worker(file_path_str: str) -> Optional[str]:
+    """Process pool entry point: content fingerprint, or None if the archive can't be read"""
+    try:
+        with ComicArchive(Path(file_path_str)) as archive:
+            return archive.fingerprint()
+    except Exception as e:
+        logger.warning(f"Could not fingerprint {file_path_str}: {e}")
+        return None
+
+
 class LibraryScanner:
     """Scans library directories and imports comics with batch processing"""
 
-    def __init__(self, library: Library, db: Session):
+    # Extraction results in flight per worker (results carry page manifests, maybe cover bytes:
+    # the window keeps parent memory flat when the writer is slower than the workers)
+    WINDOW_PER_WORKER = 4
+
+    def __init__(self, library: Library, db: Session, workers: Optional[int] = None,
+                 fused_covers: Optional[bool] = None, full_walk_days: Optional[int] = None):
         self.library = library
         self.db = db
+        # Metadata extraction workers: None = system.parallel_scan_workers setting, 1 = serial
+        self.workers = workers
+        # Render covers during extraction: None = system.scan.fused_covers setting
+        self.fused_covers = fused_covers
+        # Days between full walks: None = system.scan.full_walk_days setting
+        self.full_walk_days = full_walk_days
         self.supported_extensions = ['.cbz', '.cbr']
         self.tag_service = TagService(db)
         self.credit_service = CreditService(db)
         self.reading_list_service = ReadingListService(db)
         self.collection_service = CollectionService(db)
+        # Credits / tags / reading lists / collections are written once per batch
+        self.associations = AssociationBatch(db, self.tag_service, self.credit_service,
+                                             self.reading_list_service, self.collection_service)
         self.image_service = ImageService()
 
         self.logger = logging.getLogger(__name__)
 
-        # Local caches to reduce DB reads during the scan loop
+        # Local caches to reduce DB reads during the scan loop (filled by _preload_entities)
         self.series_cache: Dict[str, Series] = {}
         self.volume_cache: Dict[str, Volume] = {}
 
@@ -49,16 +159,8 @@ class LibraryScanner:
             self.logger.error(f"Library path {self.library.path} does not exist")
             raise FileNotFoundError(f"Library path does not exist: {self.library.path}")
 
-        found_comics = []
-        errors = []
-        imported = 0
-        updated = 0
         skipped = 0
 
-        # Batch configuration
-        BATCH_SIZE = 50
-        pending_changes = 0
-
         self.logger.info(f"Scanning {library_path} (force={force})")
 
         # Start timing
@@ -77,105 +179,250 @@ class LibraryScanner:
         # Track paths found on disk to identify deletions later
         scanned_paths_on_disk = set()
 
-        # Walk through directory
-        for file_path in library_path.rglob('*'):
-            if file_path.suffix.lower() in self.supported_extensions:
-                file_path_str = str(file_path)
+        # --- PHASE 1: WALK (stat only) ---
+        # Decide what needs work before touching any archive.
+        # Directories unchanged since the last scan are neither listed nor have their files stat'ed.
+        full_walk = force or self._full_walk_due()
+        known_dirs = {
+            d.path: (d.mtime_ns, d.entry_count)
+            for d in self.db.query(ScannedDirectory).filter(ScannedDirectory.library_id == self.library.id)
+        }
+        walker = LibraryWalker(str(library_path), self.supported_extensions, known_dirs, existing_map.keys(),
+                               full=full_walk)
+
+        candidates = []
+        for file_path_str, file_mtime, file_size_bytes in walker.walk():
+            scanned_paths_on_disk.add(file_path_str)
+            candidate = self._classify(file_path_str, file_mtime, file_size_bytes, existing_map, force)
+            if candidate:
+                candidates.append(candidate)
+            else:
+                skipped += 1
+
+        # Files in pruned directories are known and unchanged
+        for file_path_str in walker.unchanged_paths:
+            if file_path_str not in scanned_paths_on_disk:
                 scanned_paths_on_disk.add(file_path_str)
+                skipped += 1
+
+        self.logger.info(f"Walk ({'full' if full_walk else 'incremental'}): listed {walker.listed} "
+                         f"director{'y' if walker.listed == 1 else 'ies'}, pruned {walker.pruned}")
+
+        stats = self._process(candidates, existing_map, scanned_paths_on_disk, force)
+
+        # Persist directory state for the next incremental walk
+        # Directories holding files that failed are listed again next time (retry)
+        error_dirs = {os.path.dirname(e["file"]) for e in stats["errors"]}
+        self._save_directories({
+            path: (None if path in error_dirs else mtime_ns, entry_count)
+            for path, (mtime_ns, entry_count) in walker.directories.items()
+        })
+
+        return self._finish(stats, skipped, start_time, force, full_walk=full_walk)
+
+    def scan_paths(self, paths: List[str]) -> dict:
+        """
+        Targeted scan of the files / directories reported by the watcher.
+
+        Only comics at (or below) those paths are compared against the disk: existing paths are
+        imported or updated (mtime check as usual), vanished ones deleted (or matched as moves).
+        Directory snapshots are left alone, so the next incremental walk still lists the
+        directories that changed.
+        """
+        library_root = os.path.normpath(self.library.path)
+        if not os.path.isdir(library_root):
+            self.logger.error(f"Library path {self.library.path} does not exist")
+            raise FileNotFoundError(f"Library path does not exist: {self.library.path}")
+
+        start_time = time.time()
+        skipped = 0
+
+        # Normalized, inside this library, and not already covered by a parent directory in the set
+        scope = sorted({
+            os.path.normpath(p) for p in paths
+            if os.path.normpath(p).startswith(library_root + os.sep) or os.path.normpath(p) == library_root
+        })
+        roots = []
+        for path in scope:
+            if not any(path.startswith(root + os.sep) for root in roots):
+                roots.append(path)
+
+        self.logger.info(f"Targeted scan of {len(roots)} path(s) in {library_root}")
+
+        existing_map = {c.file_path: c for c in self._comics_under(roots)}
+
+        # Stat only the given paths (directories: a full listing of that subtree)
+        scanned_paths_on_disk = set()
+        candidates = []
+        for root in roots:
+            if os.path.isdir(root):
+                walker = LibraryWalker(root, self.supported_extensions, {}, (), full=True)
+                found = list(walker.walk())
+            elif os.path.isfile(root) and root.lower().endswith(tuple(self.supported_extensions)):
+                st = os.stat(root)
+                found = [(root, st.st_mtime, st.st_size)]
+            else:
+                # Deleted (or not a comic): its comics are removed by omission
+                found = []
+
+            for file_path_str, file_mtime, file_size_bytes in found:
+                scanned_paths_on_disk.add(file_path_str)
+                candidate = self._classify(file_path_str, file_mtime, file_size_bytes, existing_map, False)
+                if candidate:
+                    candidates.append(candidate)
+                else:
+                    skipped += 1
+
+        stats = self._process(candidates, existing_map, scanned_paths_on_disk, False)
+        return self._finish(stats, skipped, start_time, False, full_walk=False)
+
+    def _classify(self, file_path_str: str, file_mtime: float, file_size_bytes: int,
+                  existing_map: dict, force: bool) -> Optional[tuple]:
+        """Candidate tuple for a file on disk, or None if it is known and unchanged"""
+        # Check against our pre-fetched map
+        existing = existing_map.get(file_path_str)
+
+        if existing:
+            # Check modification time
+            if not force and existing.file_modified_at and existing.file_modified_at >= file_mtime:
+                return None
+            action = "update"
+        else:
+            action = "import"
+
+        return Path(file_path_str), file_mtime, file_size_bytes, existing, action
+
+    def _comics_under(self, roots: List[str]) -> List[Comic]:
+        """This library's comics at, or below, the given paths"""
+        comics = []
+        base = self.db.query(Comic).join(Volume).join(Series).filter(Series.library_id == self.library.id)
+
+        # Chunked: keeps each statement well under SQLite's expression / variable limits
+        for start in range(0, len(roots), 100):
+            chunk = roots[start:start + 100]
+            comics.extend(base.filter(or_(
+                Comic.file_path.in_(chunk),
+                *(Comic.file_path.startswith(root + os.sep, autoescape=True) for root in chunk)
+            )))
+        return comics
+
+    def _process(self, candidates: list, existing_map: dict, scanned_paths_on_disk: set, force: bool) -> dict:
+        """Moves, metadata extraction and the batched write of the candidates, then deletions"""
+        found_comics = []
+        errors = []
+        imported = 0
+        updated = 0
+
+        # Batch configuration
+        BATCH_SIZE = 50
+        pending_changes = 0
+        # Counted once their batch commits (a failed batch commit rolls all of them back)
+        batch_found = []
+        batch_counts = {"import": 0, "update": 0}
+
+        # Stable apply order regardless of directory listing order
+        candidates.sort(key=lambda c: str(c[0]))
 
-                try:
-                    file_mtime = os.path.getmtime(file_path)
-                    file_size_bytes = os.path.getsize(file_path)
+        # Moved/renamed files: re-point the existing comic instead of delete + re-import
+        candidates, moved = self._detect_moves(candidates, existing_map, scanned_paths_on_disk)
 
-                    # Check against our pre-fetched map
-                    existing = existing_map.get(file_path_str)
+        # Comics from before fingerprints existed (still on disk and not about to be re-extracted)
+        pending_paths = {str(c[0]) for c in candidates}
+        self._backfill_fingerprints([
+            comic for file_path_str, comic in existing_map.items()
+            if not comic.fingerprint and file_path_str in scanned_paths_on_disk and file_path_str not in pending_paths
+        ])
 
-                    # --- PHASE 1: FILE I/O (No DB Lock) ---
-                    # We determine if work is needed and extract metadata BEFORE opening the DB transaction.
-                    # This prevents holding the write lock while unzipping large files.
+        # Name -> id maps for everything the writer resolves (one query per entity type)
+        if candidates:
+            self._preload_entities()
 
-                    action = "skip"
-                    metadata = None
+        # --- PHASE 2: FILE I/O (No DB Lock, parallel) ---
+        # Archives are opened and ComicInfo.xml parsed by a process pool; results stream back
+        # in walk order, so the single writer below applies them deterministically.
+        # This prevents holding the write lock while unzipping large files.
+        metadata_stream = self._iter_metadata([c[0] for c in candidates])
 
-                    if existing:
-                        # Check modification time
-                        if not force and existing.file_modified_at and existing.file_modified_at >= file_mtime:
-                            action = "skip"
+        for (file_path, file_mtime, file_size_bytes, existing, action), metadata in zip(candidates, metadata_stream):
+            file_path_str = str(file_path)
+
+            try:
+                if not metadata:
+                    # Failed to extract, log and continue
+                    errors.append({"file": file_path_str, "error": "Failed to extract metadata"})
+                    continue
+
+                # --- PHASE 3: DB WRITE (Short Transaction, single session) ---
+                # Now we open the transaction. Operations here must be fast.
+                with self.db.begin_nested():
+
+                    comic = None
+
+                    if action == "update":
+
+                        if force:
+                            self.logger.info(f"Force scanning: {file_path.name}")
                         else:
-                            action = "update"
-                            # Heavy I/O happens here, completely safe
-                            metadata = self._extract_metadata(file_path)
-                    else:
-                        action = "import"
-                        # Heavy I/O happens here, completely safe
-                        metadata = self._extract_metadata(file_path)
-
-                    if action == "skip":
-                        skipped += 1
-                        continue
-
-                    if not metadata:
-                        # Failed to extract, log and continue
-                        errors.append({"file": str(file_path), "error": "Failed to extract metadata"})
-                        continue
-
-                    # --- PHASE 2: DB WRITE (Short Transaction) ---
-                    # Now we open the transaction. Operations here must be fast.
-                    with self.db.begin_nested():
-
-                        comic = None
-
-                        if action == "update":
-
-                            if force:
-                                self.logger.info(f"Force scanning: {file_path.name}")
-                            else:
-                                self.logger.info(f"Updating modified: {file_path.name}")
-
-                            # Pass pre-extracted metadata
-                            comic = self._update_comic(existing, file_path, file_mtime, file_size_bytes, metadata)
-                            if comic:
-                                updated += 1
-                                pending_changes += 1
-
-                        elif action == "import":
-                            # Pass pre-extracted metadata
-                            comic = self._import_comic(file_path, file_mtime, file_size_bytes, metadata)
-                            if comic:
-                                imported += 1
-                                pending_changes += 1
-                                existing_map[file_path_str] = comic
-
-                        # FORCE FLUSH: Validate constraints immediately
+                            self.logger.info(f"Updating modified: {file_path.name}")
+
+                        # Pass pre-extracted metadata
+                        comic = self._update_comic(existing, file_path, file_mtime, file_size_bytes, metadata)
+                        if comic:
+                            batch_counts["update"] += 1
+                            pending_changes += 1
+
+                    elif action == "import":
+                        # Pass pre-extracted metadata
+                        comic = self._import_comic(file_path, file_mtime, file_size_bytes, metadata)
                         if comic:
-                            self.db.flush()
+                            batch_counts["import"] += 1
+                            pending_changes += 1
+                            existing_map[file_path_str] = comic
 
-                    # --- BATCH COMMIT ---
+                    # FORCE FLUSH: Validate constraints immediately
                     if comic:
-                        found_comics.append({
-                            "id": comic.id,
-                            "filename": comic.filename,
-                            "series": comic.volume.series.name if comic.volume and comic.volume.series else "Unknown",
-                            "pages": comic.page_count
-                        })
-
-                    # 2. OPTIMIZATION: Batch Commit
-                    # Only hit the disk once every BATCH_SIZE items
-                    if pending_changes >= BATCH_SIZE:
-                        self.logger.debug(f"Committing batch of {pending_changes} items...")
-                        self.db.commit()
-                        pending_changes = 0
-
-                except Exception as e:
-                    # Logic: The savepoint has already rolled back the DB changes for this specific file.
-                    # The session is clean and ready for the next file.
-                    errors.append({"file": str(file_path), "error": str(e)})
-                    self.logger.error(f"Error processing {file_path}: {e}")
+                        self.db.flush()
+
+                        # Fused scan: the cover was rendered with the metadata, no THUMBNAIL pass needed
+                        if metadata.get('cover'):
+                            self._apply_cover(comic, metadata['cover'])
+
+                # Staged only once the savepoint succeeded, written with the batch
+                if comic:
+                    self.associations.stage(comic.id, metadata, new=(action == "import"))
+
+                if comic:
+                    batch_found.append({
+                        "id": comic.id,
+                        "filename": comic.filename,
+                        "series": comic.volume.series.name if comic.volume and comic.volume.series else "Unknown",
+                        "pages": comic.page_count
+                    })
+
+            except Exception as e:
+                # Logic: The savepoint has already rolled back the DB changes for this specific file.
+                # The session is clean and ready for the next file.
+                errors.append({"file": file_path_str, "error": str(e)})
+                self.logger.error(f"Error processing {file_path}: {e}")
+                continue
+
+            # --- BATCH COMMIT ---
+            # 2. OPTIMIZATION: Only hit the disk once every BATCH_SIZE items.
+            # Outside the per-file try: a failing batch write is a batch error, not this file's.
+            if pending_changes >= BATCH_SIZE:
+                if self._commit_batch(pending_changes, errors, [c["id"] for c in batch_found]):
+                    found_comics.extend(batch_found)
+                    imported += batch_counts["import"]
+                    updated += batch_counts["update"]
+                batch_found = []
+                batch_counts = {"import": 0, "update": 0}
+                pending_changes = 0
 
         # Commit remaining
-        if pending_changes > 0:
-            self.logger.debug(f"Committing final batch of {pending_changes} items...")
-            self.db.commit()
+        if pending_changes > 0 and self._commit_batch(pending_changes, errors, [c["id"] for c in batch_found]):
+            found_comics.extend(batch_found)
+            imported += batch_counts["import"]
+            updated += batch_counts["update"]
 
         # Find and remove comics whose files no longer exist
         # We pass the set we built during the loop
@@ -185,11 +432,63 @@ class LibraryScanner:
         self.reading_list_service.cleanup_empty_lists()
         self.collection_service.cleanup_empty_collections()
 
+        return {
+            "found_comics": found_comics,
+            "errors": errors,
+            "imported": imported,
+            "updated": updated,
+            "moved": moved,
+            "deleted": deleted,
+        }
 
+    def _commit_batch(self, count: int, errors: list, comic_ids: List[int]) -> bool:
+        """
+        Write the staged associations and commit the batch.
+        On failure the batch is rolled back and reported once (not against whichever file filled
+        it), the entity caches are reloaded (they may hold rolled back ids) and the scan carries on.
+        """
+        self.logger.debug(f"Committing batch of {count} items...")
+        try:
+            self.associations.flush()
+            self.db.commit()
+            return True
+        except Exception as e:
+            self.db.rollback()
+            self.associations.clear()
+            errors.append({"file": f"(batch of {count} comics)", "error": f"Batch commit failed: {e}"})
+            self.logger.error(f"Batch commit of {count} comics failed, rolled back: {e}")
+            self._retry_next_scan(comic_ids)
+            self._preload_entities()
+            return False
+
+    def _retry_next_scan(self, comic_ids: List[int]):
+        """
+        Comics of a failed batch may already be stored (SQLite commits a released outermost
+        savepoint) without their associations: make the next scan process them again.
+        """
+        try:
+            if comic_ids:
+                self.db.query(Comic).filter(Comic.id.in_(comic_ids)) \
+                    .update({Comic.file_modified_at: None}, synchronize_session=False)
+            # Pruned directories would hide them from an incremental walk
+            self.library.last_full_walk = None
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            self.logger.error(f"Could not mark the failed batch for rescanning: {e}")
+
+    def _finish(self, stats: dict, skipped: int, start_time: float, force: bool, full_walk: bool) -> dict:
+        """Stamp the library, drop stale caches and build the scan result"""
         # Update library scan time
         self.library.last_scanned = datetime.now(timezone.utc)
+        if full_walk:
+            self.library.last_full_walk = self.library.last_scanned
         self.db.commit()
 
+        # Reader navigation / cover browser orders are stale once anything changed
+        if stats["imported"] or stats["updated"] or stats["deleted"] or stats["moved"]:
+            reading_order_cache.invalidate()
+
         elapsed_time = round(time.time() - start_time, 2)
         self.logger.info(f"Scanning complete - Elapsed time: {elapsed_time} seconds")
 
@@ -197,14 +496,15 @@ class LibraryScanner:
             "library": self.library.name,
             "path": self.library.path,
             "force_scan": force,
-            "found": len(found_comics),
-            "imported": imported,
-            "updated": updated,
-            "deleted": deleted,
+            "found": len(stats["found_comics"]),
+            "imported": stats["imported"],
+            "updated": stats["updated"],
+            "moved": stats["moved"],
+            "deleted": stats["deleted"],
             "skipped": skipped,
-            "errors": len(errors),
-            "comics": found_comics[:10],
-            "error_details": errors[:5],
+            "errors": len(stats["errors"]),
+            "comics": stats["found_comics"][:10],
+            "error_details": stats["errors"][:5],
             "elapsed": elapsed_time
         }
 
@@ -216,6 +516,9 @@ class LibraryScanner:
         for file_path, comic in existing_map.items():
             if file_path not in scanned_paths_on_disk:
                 self.logger.info(f"Removing deleted comic: {comic.filename}")
+                archive_pool.invalidate(file_path)
+                extraction_cache.invalidate(file_path)
+                variant_cache.invalidate(comic.id)
                 self.db.delete(comic)
                 deleted += 1
 
@@ -253,6 +556,7 @@ class LibraryScanner:
             file_path=str(file_path),
             file_modified_at=file_mtime,
             file_size=file_size_bytes,
+            fingerprint=metadata.get('fingerprint'),
             page_count=metadata['page_count'],
 
             # Basic info
@@ -292,40 +596,18 @@ class LibraryScanner:
 
         )
 
+        self._apply_sort_keys(comic)
+
         self.db.add(comic)
         # CRITICAL: Use flush() instead of commit().
         # This assigns the PK (id) so we can use it for the thumbnail,
         # but keeps the transaction open for the batch.
         self.db.flush()
 
-        # Add credits
-        self.credit_service.add_credits_to_comic(comic, metadata)
-
-        # Tags
-        if metadata.get('characters'):
-            comic.characters = self.tag_service.get_or_create_characters(metadata.get('characters'))
+        # Page manifest
+        self._write_page_manifest(comic, metadata.get('pages'))
 
-        if metadata.get('teams'):
-            comic.teams = self.tag_service.get_or_create_teams(metadata.get('teams'))
-
-        if metadata.get('locations'):
-            comic.locations = self.tag_service.get_or_create_locations(metadata.get('locations'))
-
-        if metadata.get('genre'):
-            comic.genres = self.tag_service.get_or_create_genres(metadata.get('genre'))
-
-        # Reading lists
-        self.reading_list_service.update_comic_reading_lists(
-            comic,
-            metadata.get('alternate_series'),
-            metadata.get('alternate_number')
-        )
-
-        # Collections
-        self.collection_service.update_comic_collections(
-            comic,
-            metadata.get('series_group')
-        )
+        # Credits, tags, reading lists and collections: staged by the scan loop, written per batch
 
         # Touch Parent Series to update 'updated_at'
         # This ensures it shows up in "Recently Updated"
@@ -357,10 +639,16 @@ class LibraryScanner:
         raw_number = metadata.get('number')
         clean_number = self._normalize_number(raw_number)
 
+        # Content changed: drop any pooled handle / extracted copy / processed pages of the old version
+        archive_pool.invalidate(comic.file_path)
+        extraction_cache.invalidate(comic.file_path)
+        variant_cache.invalidate(comic.id)
+
         # Update fields
         comic.volume_id = volume.id
         comic.file_modified_at = file_mtime
         comic.file_size = file_size_bytes
+        comic.fingerprint = metadata.get('fingerprint')
         comic.page_count = metadata['page_count']
         comic.number = clean_number
         comic.title = metadata.get('title')
@@ -385,35 +673,12 @@ class LibraryScanner:
         comic.metadata_json = json.dumps(metadata.get('raw_metadata', {}))
         comic.updated_at = datetime.now(timezone.utc)
         comic.is_dirty = True # Mark for thumbnailer / services
+        self._apply_sort_keys(comic)
 
-        # Update credits
-        self.credit_service.add_credits_to_comic(comic, metadata)
-
-        # Tags
-        comic.characters.clear()
-        comic.teams.clear()
-        comic.locations.clear()
-        comic.genres.clear()
-
-        if metadata.get('characters'):
-            comic.characters = self.tag_service.get_or_create_characters(metadata.get('characters'))
-        if metadata.get('teams'):
-            comic.teams = self.tag_service.get_or_create_teams(metadata.get('teams'))
-        if metadata.get('locations'):
-            comic.locations = self.tag_service.get_or_create_locations(metadata.get('locations'))
-        if metadata.get('genre'):
-            comic.genres = self.tag_service.get_or_create_genres(metadata.get('genre'))
-
-        self.reading_list_service.update_comic_reading_lists(
-            comic,
-            metadata.get('alternate_series'),
-            metadata.get('alternate_number')
-        )
+        # Page manifest (archive content may have changed)
+        self._write_page_manifest(comic, metadata.get('pages'))
 
-        self.collection_service.update_comic_collections(
-            comic,
-            metadata.get('series_group')
-        )
+        # Credits, tags, reading lists and collections: diffed against the stored rows per batch
 
         # Touch Parent Series
         series.updated_at = datetime.now(timezone.utc)
@@ -422,63 +687,217 @@ class LibraryScanner:
 
         return comic
 
+    def _write_page_manifest(self, comic: Comic, pages: Optional[List[Dict]]):
+        """Replace the stored page manifest for a comic (no commit, handled by batch loop)"""
+        # Bulk delete first so the (comic_id, page_index) unique index never sees duplicates
+        self.db.query(ComicPage).filter(ComicPage.comic_id == comic.id).delete(synchronize_session=False)
+
+        if not pages:
+            return
+
+        self.db.add_all([
+            ComicPage(comic_id=comic.id, page_index=index, **entry)
+            for index, entry in enumerate(pages)
+        ])
+
+    def _full_walk_due(self) -> bool:
+        """Periodic safety net: list everything (catches files rewritten in place)"""
+        last = self.library.last_full_walk
+        if last is None:
+            return True
+
+        interval_days = self.full_walk_days
+        if interval_days is None:
+            interval_days = int(get_cached_setting("system.scan.full_walk_days", 7))
+        if last.tzinfo is None:
+            last = last.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) - last >= timedelta(days=interval_days)
+
+    def _save_directories(self, directories: Dict[str, tuple]):
+        """Replace this library's directory snapshot (one DELETE + one executemany INSERT)"""
+        self.db.query(ScannedDirectory).filter(ScannedDirectory.library_id == self.library.id) \
+            .delete(synchronize_session=False)
+        self.db.bulk_insert_mappings(ScannedDirectory, [
+            {"library_id": self.library.id, "path": path, "mtime_ns": mtime_ns, "entry_count": entry_count}
+            for path, (mtime_ns, entry_count) in directories.items()
+        ])
+
     def _extract_metadata(self, file_path: Path) -> Optional[Dict]:
         """Extract metadata from comic archive"""
-        try:
-            with ComicArchive(file_path) as archive:
-                pages = archive.get_pages()
+        return extract_metadata(file_path)
+
+    def _resolve_workers(self, task_count: int) -> int:
+        """Worker count for metadata extraction (same semantics as the thumbnail workers)"""
+        if self.workers is not None:
+            requested = self.workers
+        else:
+            requested = int(get_cached_setting("system.parallel_scan_workers", 0))
+
+        total_cores = multiprocessing.cpu_count() or 1
+        if requested <= 0:
+            # AUTO MODE: 50% of cores, minimum 1
+            workers = max(1, total_cores // 2)
+        else:
+            workers = min(requested, total_cores)
+
+        return max(1, min(workers, task_count))
+
+    def _iter_metadata(self, paths: List[Path]) -> Iterator[Optional[Dict]]:
+        """Yield metadata for each path, in input order"""
+        fused = self.fused_covers
+        if fused is None:
+            fused = bool(get_cached_setting("system.scan.fused_covers", False))
+
+        if fused:
+            return self._iter_files(functools.partial(_metadata_worker, covers=True), paths,
+                                    "Extracting metadata and covers")
+        return self._iter_files(_metadata_worker, paths, "Extracting metadata")
+
+    def _apply_cover(self, comic: Comic, cover: Dict):
+        """Write a fused-scan cover and clear the dirty flag (same batch as the metadata)"""
+        thumbnail_path = settings.cover_dir / f"comic_{comic.id}.webp"
+        thumbnail_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Atomic replace: the thumbnail endpoint may be serving the previous cover
+        tmp_path = thumbnail_path.with_suffix(".tmp")
+        tmp_path.write_bytes(cover['thumbnail'])
+        os.replace(tmp_path, thumbnail_path)
+
+        palette = cover['palette']
+        comic.thumbnail_path = str(thumbnail_path)
+        comic.color_primary = palette.get('primary')
+        comic.color_secondary = palette.get('secondary')
+        comic.color_palette = palette
+        comic.is_dirty = False
+
+    def _iter_files(self, worker: Callable[[str], Any], paths: List[Path], action: str) -> Iterator[Any]:
+        """
+        Yield worker(path) for each path, in input order.
+        Uses a process pool (archive parsing is CPU + I/O bound and holds the GIL in places).
+        Only workers * WINDOW_PER_WORKER paths are submitted ahead of the writer, and results
+        are yielded in submission order, so the writer starts on the first one immediately.
+        """
+        if not paths:
+            return
+
+        workers = self._resolve_workers(len(paths))
+
+        if workers == 1:
+            self.logger.info(f"{action} for {len(paths)} file(s) (SERIAL MODE)")
+            for path in paths:
+                yield worker(str(path))
+            return
 
-                if not pages:
-                    self.logger.warning(f"Warning: No valid image pages found in {file_path.name}")
-                    return None
+        self.logger.info(f"{action} for {len(paths)} file(s) with {workers} worker(s)")
 
-                comicinfo_xml = archive.get_comicinfo()
+        window = workers * self.WINDOW_PER_WORKER
 
-                # 1. Establish Physical Truth of page count
-                physical_count = len(pages)
-                metadata = {'page_count': physical_count}
+        with multiprocessing.Pool(processes=workers) as pool:
+            pending = deque()
+            for path in paths:
+                pending.append(pool.apply_async(worker, (str(path),)))
+                if len(pending) >= window:
+                    yield pending.popleft().get()
 
-                if comicinfo_xml:
-                    parsed = parse_comicinfo(comicinfo_xml)
-                    metadata.update(parsed)
+            while pending:
+                yield pending.popleft().get()
 
-                    # Force overwrite: Always use physical count for this field.
-                    # We trust the file system over the XML tag for navigational safety in the reader.
-                    metadata['page_count'] = physical_count
+    def _detect_moves(self, candidates: list, existing_map: dict, scanned_paths_on_disk: set) -> Tuple[list, int]:
+        """
+        Match new paths to vanished comics by content fingerprint and move them in place.
+        Keeps reading progress, list items, thumbnails and page manifests, and skips re-extraction.
+        Only new files whose size matches a vanished comic are fingerprinted.
+        Returns the remaining candidates and the number of moved comics.
+        """
+        vanished = {}
+        for file_path_str, comic in existing_map.items():
+            if file_path_str not in scanned_paths_on_disk and comic.fingerprint not in (None, UNREADABLE_FINGERPRINT):
+                vanished.setdefault(comic.fingerprint, []).append(comic)
+
+        if not vanished:
+            return candidates, 0
+
+        sizes = {int(fp.split("-", 1)[0]) for fp in vanished}
+        probes = [c for c in candidates if c[4] == "import" and c[2] in sizes]
+        if not probes:
+            return candidates, 0
+
+        moved = {}
+        fingerprints = self._iter_files(_fingerprint_worker, [c[0] for c in probes], "Fingerprinting new files")
+        for candidate, fingerprint in zip(probes, fingerprints):
+            matches = vanished.get(fingerprint) if fingerprint else None
+            if not matches:
+                continue
+
+            file_path, file_mtime, file_size_bytes, _, _ = candidate
+            comic = matches.pop(0)
+            if not matches:
+                del vanished[fingerprint]
+
+            old_path = comic.file_path
+            self.logger.info(f"Moved: {old_path} -> {file_path}")
+
+            # Handles / extractions are keyed by path; variants by mtime (replaced on next render)
+            archive_pool.invalidate(old_path)
+            extraction_cache.invalidate(old_path)
+
+            comic.file_path = str(file_path)
+            comic.filename = file_path.name
+            comic.file_modified_at = file_mtime
+
+            del existing_map[old_path]
+            existing_map[comic.file_path] = comic
+            moved[file_path] = comic
+
+        if moved:
+            self.db.commit()
 
-                    metadata['raw_metadata'] = parsed
+        return [c for c in candidates if c[0] not in moved], len(moved)
 
-                return metadata
+    def _backfill_fingerprints(self, comics: List[Comic]):
+        """Fingerprint comics imported before fingerprints existed (one-time cost per comic)"""
+        if not comics:
+            return
 
-        except Exception as e:
-            self.logger.error(f"Error extracting metadata from {file_path}: {e}")
-            return None
+        fingerprints = self._iter_files(_fingerprint_worker, [Path(c.file_path) for c in comics],
+                                        "Fingerprinting existing files")
+        for index, (comic, fingerprint) in enumerate(zip(comics, fingerprints), start=1):
+            comic.fingerprint = fingerprint or UNREADABLE_FINGERPRINT
+            if index % 500 == 0:
+                self.db.commit()
+        self.db.commit()
 
-    def _get_or_create_series(self, name: str) -> Series:
-        """Get existing series or create new one with Caching"""
+    def _preload_entities(self):
+        """Fill the name -> entity caches once, so the write loop only inserts what is new"""
+        self.series_cache.clear()
+        self.volume_cache.clear()
+        for series in self.db.query(Series).filter(Series.library_id == self.library.id):
+            self.series_cache[series.name] = series
+
+        volumes = self.db.query(Volume).join(Series).filter(Series.library_id == self.library.id)
+        for volume in volumes:
+            self.volume_cache[f"{volume.series_id}_{volume.volume_number}"] = volume
+
+        self.tag_service.preload()
+        self.credit_service.preload()
+        self.reading_list_service.preload()
+        self.collection_service.preload()
 
-        # 1. Check local cache
+    def _get_or_create_series(self, name: str) -> Series:
+        """Get existing series (preloaded) or create new one"""
         if name in self.series_cache:
             return self.series_cache[name]
 
-        # 2. Check Database
-        series = self.db.query(Series).filter(
-            Series.name == name,
-            Series.library_id == self.library.id
-        ).first()
-
-        if not series:
-            # 3. Create new (Flush, don't commit)
-            series = Series(name=name, library_id=self.library.id)
-            self.db.add(series)
-            self.db.flush()
+        # Create new (Flush, don't commit): the comic needs the id right away
+        series = Series(name=name, library_id=self.library.id)
+        self.db.add(series)
+        self.db.flush()
 
-        # 4. Add to cache
         self.series_cache[name] = series
         return series
 
     def _get_or_create_volume(self, series: Series, volume_number: int) -> Volume:
-        """Get existing volume or create new one with Caching"""
+        """Get existing volume (preloaded) or create new one"""
 
         # Composite key for cache
         cache_key = f"{series.id}_{volume_number}"
@@ -486,19 +905,18 @@ class LibraryScanner:
         if cache_key in self.volume_cache:
             return self.volume_cache[cache_key]
 
-        volume = self.db.query(Volume).filter(
-            Volume.series_id == series.id,
-            Volume.volume_number == volume_number
-        ).first()
-
-        if not volume:
-            volume = Volume(series_id=series.id, volume_number=volume_number)
-            self.db.add(volume)
-            self.db.flush()
+        volume = Volume(series_id=series.id, volume_number=volume_number)
+        self.db.add(volume)
+        self.db.flush()
 
         self.volume_cache[cache_key] = volume
         return volume
 
+    def _apply_sort_keys(self, comic: Comic):
+        """Persist the canonical ordering columns so listings can ORDER BY an index"""
+        for column, value in get_sort_keys(comic.number, comic.format, comic.year, comic.month, comic.day).items():
+            setattr(comic, column, value)
+
     def _normalize_number(self, number: str) -> str:
         """Normalize weird comic numbers"""
         if not number:
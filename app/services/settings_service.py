@@ -65,6 +65,12 @@ class SettingsService:
             "label": "Scan Batch Window (Sec)",
             "description": "Time to wait for file operations to settle."
         },
+        {
+            "key": "scanning.targeted_scan_limit", "value": "500",
+            "category": "scanning", "data_type": "int",
+            "label": "Targeted Scan Limit (Paths)",
+            "description": "Watched libraries only rescan the files and folders that changed. Above this many changed paths in one batch window, a full library scan runs instead."
+        },
         {
             "key": "ui.login_background_style", "value": "random_covers",
             "category": "appearance", "data_type": "select",
@@ -168,9 +174,58 @@ class SettingsService:
             "category": "system",
             "data_type": "select",
             "label": "Parallel Image Worker Count",
-            "description": "Control how many CPU cores are used for thumbnail generation.",
+            "description": "Size of the shared image worker pool (thumbnails, colors, on-demand covers). A change applies once the pool is idle.",
+            "options": generate_worker_options()
+        },
+        {
+            "key": "system.parallel_scan_workers",
+            "value": "0",
+            "category": "system",
+            "data_type": "select",
+            "label": "Parallel Scan Worker Count",
+            "description": "Control how many CPU cores are used to read archives and ComicInfo.xml during library scans.",
             "options": generate_worker_options()
         },
+        {
+            "key": "system.scan.full_walk_days",
+            "value": "7",
+            "category": "system",
+            "data_type": "int",
+            "label": "Full Library Walk Interval (Days)",
+            "description": "Incremental scans skip folders that haven't changed. Every N days a scan re-reads every folder to catch files edited in place."
+        },
+        {
+            "key": "system.scan.fused_covers",
+            "value": "false",
+            "category": "system",
+            "data_type": "bool",
+            "label": "Generate Covers During Scan",
+            "description": "Render cover thumbnails and colors while the scanner has each new or changed archive open, instead of re-opening it in a separate thumbnail job. Slower scans, much less archive I/O (especially for CBR)."
+        },
+        {
+            "key": "system.cache.extraction_size_mb",
+            "value": "2048",
+            "category": "system",
+            "data_type": "int",
+            "label": "CBR Extraction Cache Size (MB)",
+            "description": "Disk budget for unpacked CBR archives. Least recently read comics are evicted first."
+        },
+        {
+            "key": "system.cache.variant_size_mb",
+            "value": "1024",
+            "category": "system",
+            "data_type": "int",
+            "label": "Processed Page Cache Size (MB)",
+            "description": "Disk budget for WebP/sharpened/grayscale page variants. Least recently served pages are evicted first."
+        },
+        {
+            "key": "system.repack.delete_originals",
+            "value": "false",
+            "category": "system",
+            "data_type": "bool",
+            "label": "Delete Originals After Repack",
+            "description": "When repacking CBR/CB7 to CBZ, delete the original file. Otherwise it is kept with a .bak extension."
+        },
         {
             "key": "system.task.scan.interval",
             "value": "daily",
@@ -1,120 +1,50 @@
 from sqlalchemy.orm import Session
-from typing import List, Dict
+from typing import Dict, Iterable, List
 from app.models import Character, Team, Location, Genre
 
 class TagService:
     """Service for managing tags with Caching and Deferred Commits"""
 
+    # Tag kind -> model (kinds match the Comic relationship names)
+    TAG_MODELS = {
+        'characters': Character,
+        'teams': Team,
+        'locations': Location,
+        'genres': Genre,
+    }
+
     def __init__(self, db: Session):
         self.db = db
-        # Cache to store objects by name to avoid DB lookups
-        self.character_cache: Dict[str, Character] = {}
-        self.team_cache: Dict[str, Team] = {}
-        self.location_cache: Dict[str, Location] = {}
-        self.genre_cache: Dict[str, Genre] = {}
-
-    def get_or_create_character(self, name: str) -> Character:
-        name = name.strip()
-        if not name:
-            return None
-
-        # 1. Check Cache
-        if name in self.character_cache:
-            return self.character_cache[name]
-
-        # 2. Check DB
-        character = self.db.query(Character).filter(Character.name == name).first()
-
-        if not character:
-            # 3. Create (Flush only)
-            character = Character(name=name)
-            self.db.add(character)
-            self.db.flush()  # Generate ID without disk write
+        # name -> id per tag kind, to avoid DB lookups (filled by preload / resolve_ids)
+        self.id_cache: Dict[str, Dict[str, int]] = {kind: {} for kind in self.TAG_MODELS}
 
-        # 4. Update Cache
-        self.character_cache[name] = character
-        return character
+    def preload(self):
+        """Load every known tag name once (one query per tag kind)"""
+        for kind, model in self.TAG_MODELS.items():
+            self.id_cache[kind] = dict(self.db.query(model.name, model.id))
 
-    def get_or_create_characters(self, names: str) -> List[Character]:
+    @staticmethod
+    def parse_names(names: str) -> List[str]:
+        """Split a comma separated ComicInfo field into unique, trimmed names"""
         if not names:
             return []
         name_list = [n.strip() for n in names.split(',') if n.strip()]
         # Deduplicate
-        unique_names = list(dict.fromkeys(name_list))
-        return [self.get_or_create_character(n) for n in unique_names if n]
-
-    def get_or_create_team(self, name: str) -> Team:
-        name = name.strip()
-        if not name:
-            return None
-
-        if name in self.team_cache:
-            return self.team_cache[name]
-
-        team = self.db.query(Team).filter(Team.name == name).first()
-        if not team:
-            team = Team(name=name)
-            self.db.add(team)
-            self.db.flush()
-
-        self.team_cache[name] = team
-        return team
-
-    def get_or_create_teams(self, names: str) -> List[Team]:
-        if not names:
-            return []
-        name_list = [n.strip() for n in names.split(',') if n.strip()]
-        unique_names = list(dict.fromkeys(name_list))
-        return [self.get_or_create_team(n) for n in unique_names if n]
-
-    def get_or_create_location(self, name: str) -> Location:
-        name = name.strip()
-        if not name:
-            return None
-
-        if name in self.location_cache:
-            return self.location_cache[name]
-
-        location = self.db.query(Location).filter(Location.name == name).first()
-        if not location:
-            location = Location(name=name)
-            self.db.add(location)
-            self.db.flush()
-
-        self.location_cache[name] = location
-        return location
-
-    def get_or_create_locations(self, names: str) -> List[Location]:
-        if not names:
-            return []
-        name_list = [n.strip() for n in names.split(',') if n.strip()]
-        unique_names = list(dict.fromkeys(name_list))
-        return [self.get_or_create_location(n) for n in unique_names if n]
-
-
-    def get_or_create_genre(self, name: str) -> Genre:
-
-        name = name.strip()
-        if not name:
-            return None
-
-        if name in self.genre_cache:
-            return self.genre_cache[name]
-
-        genre = self.db.query(Genre).filter(Genre.name == name).first()
-        if not genre:
-            genre = Genre(name=name)
-            self.db.add(genre)
-            self.db.flush()
-
-        self.genre_cache[name] = genre
-        return genre
-
-    def get_or_create_genres(self, names: str) -> List[Genre]:
-        if not names:
-            return []
-
-        name_list = [n.strip() for n in names.split(',') if n.strip()]
-        unique_names = list(dict.fromkeys(name_list))
-        return [self.get_or_create_genre(n) for n in unique_names if n]
-
+        return list(dict.fromkeys(name_list))
+
+    def resolve_ids(self, kind: str, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Map names to tag ids, creating the missing tags in one batch (Flush only).
+        Returns the cache for this kind (a superset of the requested names).
+        """
+        cache = self.id_cache[kind]
+        missing = [name for name in dict.fromkeys(names) if name not in cache]
+
+        if missing:
+            model = self.TAG_MODELS[kind]
+            created = [model(name=name) for name in missing]
+            self.db.add_all(created)
+            self.db.flush()  # Generate IDs without disk write
+            cache.update((tag.name, tag.id) for tag in created)
+
+        return cache
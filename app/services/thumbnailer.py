@@ -1,56 +1,79 @@
 import logging
+from datetime import datetime, timezone
 from pathlib import Path
-import multiprocessing
-from multiprocessing import Queue
-from typing import Tuple, Dict, Any, List
+import threading
+import itertools
+import queue
+from typing import Tuple, Dict, Any, Iterator
 from sqlalchemy.orm import Session
 
-from app.core.settings_loader import get_cached_setting
-from app.database import SessionLocal, engine
+from app.database import SessionLocal
+from app.services.image_pool import image_pool
 from app.models.comic import Comic, Volume
 from app.models.library import Library
 from app.models.series import Series
 from app.services.images import ImageService
 
 
-def _apply_batch(db, batch, stats_queue):
+def _apply_batch(db, batch) -> Tuple[int, int]:
     """
     Apply a batch of updates to the DB.
-    This runs inside the dedicated Writer process.
+    This runs inside the dedicated Writer thread.
+    One executemany UPDATE per shape (with / without palette), touching only the cover columns:
+    no SELECT per comic, and the FTS trigger (UPDATE OF title, summary, volume_id) stays quiet.
+    Returns (processed, errors).
     """
+    from sqlalchemy import bindparam, update
     from app.models.comic import Comic
 
-    for item in batch:
+    comics = Comic.__table__
+    now = datetime.now(timezone.utc)
 
-        comic_id = item.get("comic_id")
+    with_palette = []
+    without_palette = []
+    errors = 0
 
+    for item in batch:
         if item.get("error"):
-            stats_queue.put({"comic_id": comic_id, "status": "error"})
-            continue
-
-        # Fetch object to update
-        comic = db.query(Comic).get(comic_id)
-        if not comic:
-            stats_queue.put({"comic_id": comic_id, "status": "missing"})
+            errors += 1
             continue
 
-        # Update fields
-        comic.thumbnail_path = item.get("thumbnail_path")
         palette = item.get("palette")
+        row = {"b_id": item["comic_id"], "b_thumbnail_path": item.get("thumbnail_path"), "b_updated_at": now}
 
         if palette:
-            comic.color_primary = palette.get("primary")
-            comic.color_secondary = palette.get("secondary")
-            comic.color_palette = palette
-
-        # Work is complete, reset the flag
-        comic.is_dirty = False
+            row.update(b_primary=palette.get("primary"), b_secondary=palette.get("secondary"), b_palette=palette)
+            with_palette.append(row)
+        else:
+            without_palette.append(row)
+
+    # Work is complete, reset the flag
+    # updated_at still moves: it is the cover's HTTP validator (ETag / Last-Modified)
+    cover_values = {
+        "thumbnail_path": bindparam("b_thumbnail_path"),
+        "is_dirty": False,
+        "updated_at": bindparam("b_updated_at"),
+    }
+
+    if with_palette:
+        db.execute(
+            update(comics).where(comics.c.id == bindparam("b_id")).values(
+                **cover_values,
+                color_primary=bindparam("b_primary"),
+                color_secondary=bindparam("b_secondary"),
+                color_palette=bindparam("b_palette"),
+            ),
+            with_palette
+        )
 
-        stats_queue.put({"comic_id": comic_id, "status": "processed"})
+    if without_palette:
+        db.execute(update(comics).where(comics.c.id == bindparam("b_id")).values(**cover_values), without_palette)
 
     # Commit the batch (Single Transaction)
     db.commit()
 
+    return len(with_palette) + len(without_palette), errors
+
 
 def _thumbnail_worker(task: Tuple[int, str]) -> Dict[str, Any]:
     """
@@ -58,6 +81,7 @@ def _thumbnail_worker(task: Tuple[int, str]) -> Dict[str, Any]:
     Does NOT touch the database.
     """
     comic_id, file_path = task
+
     # Import here to avoid issues after fork
     from app.services.images import ImageService
 
@@ -90,27 +114,29 @@ def _thumbnail_worker(task: Tuple[int, str]) -> Dict[str, Any]:
         }
 
 
-def _thumbnail_writer(queue: Queue, stats_queue: Queue, batch_size: int = 25) -> None:
+def _thumbnail_writer(result_queue: queue.Queue, stats_queue: queue.Queue, batch_size: int = 100) -> None:
     """
-    Dedicated writer process: reads worker results and applies DB updates.
-    OPTIMIZED: batch_size lowered to 25 to prevent holding the lock too long.
+    Dedicated writer thread: reads worker results and applies DB updates (own session).
+    Each batch is a couple of executemany UPDATEs, so the write lock is held only briefly
+    and a larger batch is safe. Totals are reported once, in the summary.
     """
-
-    # CRITICAL Dispose inherited connections
-    engine.dispose()
-
-    from app.database import SessionLocal
-
     db = SessionLocal()
     processed = 0
     errors = 0
     skipped = 0
     batch = []
 
+    def flush():
+        nonlocal processed, errors
+        batch_processed, batch_errors = _apply_batch(db, batch)
+        processed += batch_processed
+        errors += batch_errors
+        batch.clear()
+
     try:
         while True:
             # Block until an item is available
-            item = queue.get()
+            item = result_queue.get()
 
             # Sentinel value means "All workers are done"
             if item is None:
@@ -120,22 +146,17 @@ def _thumbnail_writer(queue: Queue, stats_queue: Queue, batch_size: int = 25) ->
 
             # If batch is full, write it
             if len(batch) >= batch_size:
-                _apply_batch(db, batch, stats_queue)
-                processed += sum(1 for i in batch if not i.get("error"))
-                errors += sum(1 for i in batch if i.get("error"))
-                batch.clear()
+                flush()
 
         # Flush remaining items
         if batch:
-            _apply_batch(db, batch, stats_queue)
-            processed += sum(1 for i in batch if not i.get("error"))
-            errors += sum(1 for i in batch if i.get("error"))
+            flush()
 
     finally:
 
 
         # CRITICAL Close DB *BEFORE* signaling summary.
-        # This guarantees the lock is released before the parent process wakes up.
+        # This guarantees the lock is released before the job reports completion.
         db.close()
 
         # Signal completion
@@ -157,138 +178,110 @@ class ThumbnailService:
         """
         Force regenerate thumbnails for ALL comics in a series.
         Refactored: Delegates to the parallel engine for safety.
-        Forces 1 worker to keep it 'serial-like' if you prefer, or
-        let it use multiple cores to finish the series instantly.
+        The pool is already warm, so the series gets its fair share of it
+        and finishes quickly without starving a running library job.
         """
-
-        # Using 2 workers is usually safe and twice as fast for a series or 1 for serial behavior
         return self.process_missing_thumbnails_parallel(
             force=True,
             series_id=series_id,
-            worker_limit=1
-        )
-
-
-    def _get_target_comics(self, force: bool = False) -> List[Comic]:
-
-        if not self.library_id:
-            raise ValueError("Library ID required for library-wide processing")
-
-        query = (
-            self.db
-            .query(Comic)
-            .join(Comic.volume)
-            .join(Series)
-            .filter(Series.library_id == self.library_id)
+            worker_limit=0
         )
 
-        if force:
-            return query.all()
-
-        return query.filter(Comic.is_dirty == True).all()
 
+    # Comics per keyset page when streaming tasks
+    TASK_CHUNK_SIZE = 500
 
-    def process_missing_thumbnails_parallel(self, force: bool = False, series_id: int = None, worker_limit: int = 0) -> Dict[str, int]:
+    def _iter_tasks(self, force: bool = False, series_id: int = None) -> Iterator[Tuple]:
         """
-        Parallel thumbnail generation.
-        The writer process handles batching automatically.
+        Stream worker tasks as (id, file_path).
+        Keyset pages of plain tuples: no ORM objects, and no read cursor held open while
+        the writer process commits.
         """
-
-        # 1. BUILD QUERY based on inputs
         if series_id:
             # Targeted Series Scan (Does not require self.library_id)
-            #self.logger.info(f"Processing Series {series_id}")
-            comics = (self.db.query(Comic)
-                      .join(Volume)
-                      .filter(Volume.series_id == series_id)
-                      .all())
+            query = (self.db.query(Comic.id, Comic.file_path)
+                     .join(Volume)
+                     .filter(Volume.series_id == series_id))
         elif self.library_id:
-            # Library-Wide Scan (Uses existing helper)
-            #self.logger.info(f"Processing thumbnails for Library {self.library_id}")
-            comics = self._get_target_comics(force=force)
+            # Library-Wide Scan
+            query = (self.db.query(Comic.id, Comic.file_path)
+                     .join(Comic.volume)
+                     .join(Series)
+                     .filter(Series.library_id == self.library_id))
+            if not force:
+                query = query.filter(Comic.is_dirty == True)
         else:
             # Error: Neither target provided
             raise ValueError("Either series_id OR initialized library_id is required")
 
+        last_id = 0
+        while True:
+            rows = query.filter(Comic.id > last_id).order_by(Comic.id).limit(self.TASK_CHUNK_SIZE).all()
+            if not rows:
+                return
 
-        stats = {"processed": 0, "errors": 0, "skipped": 0}
-
-        if not comics:
-            return stats
-
-        # Pre-filter "skipped" to avoid sending unnecessary work
-        tasks: List[Tuple[int, str]] = []
-        for comic in comics:
-            has_thumb = comic.thumbnail_path and Path(str(comic.thumbnail_path)).exists()
-            has_colors = comic.color_primary is not None
+            for comic_id, file_path in rows:
+                yield comic_id, str(file_path)
 
-            if not force and not comic.is_dirty and has_thumb and has_colors:
-                stats["skipped"] += 1
-                continue
+            last_id = rows[-1][0]
 
-            tasks.append((comic.id, str(comic.file_path)))
+    def process_missing_thumbnails_parallel(self, force: bool = False, series_id: int = None, worker_limit: int = 0) -> Dict[str, int]:
+        """
+        Parallel thumbnail generation on the shared, warm image worker pool.
+        Tasks are streamed from the DB into the pool (bounded), so workers start on the
+        first page of comics; the writer thread handles batching automatically.
+        """
+        stats = {"processed": 0, "errors": 0, "skipped": 0}
 
-        if not tasks:
+        tasks = self._iter_tasks(force=force, series_id=series_id)
+        first_task = next(tasks, None)
+        if first_task is None:
             return stats
 
-        # Queues
-        result_queue: Queue = multiprocessing.Queue()
-        stats_queue: Queue = multiprocessing.Queue()
+        # Queues (the writer is a thread: results already arrive in this process)
+        result_queue: queue.Queue = queue.Queue()
+        stats_queue: queue.Queue = queue.Queue()
 
         # Start Writer (Handles DB Updates)
-        writer_proc = multiprocessing.Process(
+        writer = threading.Thread(
             target=_thumbnail_writer,
             args=(result_queue, stats_queue),
-            kwargs={'batch_size': 25}  # Safe batch size
+            kwargs={'batch_size': 100},  # Set-based writes keep the lock short
+            name="thumbnail-writer",
+            daemon=True
         )
-        writer_proc.start()
+        writer.start()
+
+        # Concurrency: the shared pool is sized by system.parallel_image_workers;
+        # worker_limit only caps this job (e.g., 1 = serial-like), 0 = its fair share
+        if worker_limit == 1:
+            self.logger.info(f"Using exactly 1 worker for thumbnail generation (SERIAL MODE)")
+        elif worker_limit > 1:
+            self.logger.info(f"Using up to {worker_limit} worker(s) for thumbnail generation")
+        else:
+            self.logger.info(f"Using the shared image worker pool for thumbnail generation")
 
-        # Determine Worker Count
-        if worker_limit > 0:
-            workers = worker_limit  # Respect the override (e.g., 1)
+        def on_result(payload):
+            # Runs on the pool's result thread: send worker result to writer
+            result_queue.put(payload)
 
-            if worker_limit == 1:
-                self.logger.info(f"Using exactly 1 worker for thumbnail generation (SERIAL MODE)")
-            else:
-                self.logger.info(f"Using exactly {worker_limit} worker(s) for thumbnail generation")
+        def on_error(e):
+            self.logger.error(f"Thumbnail worker failed: {e}")
+            stats["errors"] += 1
 
-        else:
-            requested_workers = int(get_cached_setting("system.parallel_image_workers", 0))
-            self.logger.info(f"Requested {'(Auto)' if requested_workers <= 0 else requested_workers} worker(s) for parallel thumbnail generation")
-
-            if requested_workers <= 0:
-                # AUTO MODE:
-                # Use 50% of cores, with a minimum of 1.
-                # This prevents system starvation when multiple web workers are active.
-                total_cores = multiprocessing.cpu_count() or 1
-                workers = max(1, total_cores // 2)
-            else:
-                max_cores = multiprocessing.cpu_count() or 1
-                workers = min(requested_workers, max_cores)
-
-            self.logger.info(f"Using {workers} worker(s) for parallel thumbnail generation")
-
-        # Start Workers (CPU bound)
-        with multiprocessing.Pool(processes=workers) as pool:
-            for payload in pool.imap_unordered(_thumbnail_worker, tasks):
-                # Send worker result to writer
-                result_queue.put(payload)
-
-        # All worker tasks done; tell writer to finish
-        result_queue.put(None)
-
-        # Wait for stats
-        summary_received = False
-        while not summary_received:
-            item = stats_queue.get()
-            if item.get("summary"):
-                stats["processed"] += item.get("processed", 0)
-                stats["errors"] += item.get("errors", 0)
-                stats["skipped"] += item.get("skipped", 0)
-                summary_received = True
-
-        writer_proc.join()
+        try:
+            image_pool.run(_thumbnail_worker, itertools.chain([first_task], tasks), on_result, on_error,
+                           limit=worker_limit)
+        finally:
+            # All worker tasks done; tell writer to finish
+            result_queue.put(None)
 
-        return stats
+            # Wait for the writer's summary (its only message)
+            summary = stats_queue.get()
+            stats["processed"] += summary.get("processed", 0)
+            stats["errors"] += summary.get("errors", 0)
+            stats["skipped"] += summary.get("skipped", 0)
 
+            writer.join()
 
+        return stats
@@ -0,0 +1,214 @@
+import os
+import shutil
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Cached file extension <-> served mime type
+VARIANT_EXTENSIONS = {
+    "image/webp": "webp",
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/avif": "avif",
+    "image/gif": "gif",
+}
+VARIANT_MIME_TYPES = {ext: mime for mime, ext in VARIANT_EXTENSIONS.items()}
+
+
+class VariantCache:
+    """
+    Disk cache of processed page variants (WebP transcode, sharpen, grayscale...).
+
+    Pillow decode + resize + filter + encode runs once per (comic, page, variant, source mtime)
+    instead of once per device/user.
+
+    Layout: cache_dir/variants/<comic_id>/<page index or 'cover'>_<variant>_<mtime_ns>.<ext>
+    - The source mtime is part of the name, so a modified comic never serves a stale variant.
+    - A global byte budget is enforced with LRU eviction (file mtime = last access), down to a
+      low-water mark so a full cache isn't rescanned on every write.
+    - Writes go to a temp file and are renamed into place (safe across worker processes).
+    """
+
+    # Eviction frees space down to this fraction of the budget
+    LOW_WATER = 0.9
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._lock = threading.Lock()
+
+        # Running size estimate for this process (None = not measured yet).
+        # Other workers write too, so it is re-measured whenever the budget is enforced.
+        self._bytes: Optional[int] = None
+
+        # Counters (per process)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @staticmethod
+    def variant_key(**flags) -> str:
+        """Stable variant name from the enabled flags, e.g. 'grayscale-webp'. Empty = original."""
+        return "-".join(sorted(name for name, enabled in flags.items() if enabled))
+
+    @staticmethod
+    def _stem(page_index: int, variant: str) -> str:
+        return f"{page_index}_{variant}_"
+
+    def _find(self, comic_id: int, page_index: int, variant: str, mtime_ns: int) -> Optional[Path]:
+        comic_dir = self.root / str(comic_id)
+        prefix = f"{self._stem(page_index, variant)}{mtime_ns}."
+        for ext in VARIANT_MIME_TYPES:
+            candidate = comic_dir / f"{prefix}{ext}"
+            if candidate.is_file():
+                return candidate
+        return None
+
+    def contains(self, comic_id: int, page_index: int, variant: str, mtime_ns: int) -> bool:
+        """Existence check without touching the counters or LRU order (read-ahead)"""
+        return self._find(comic_id, page_index, variant, mtime_ns) is not None
+
+    def get(self, comic_id: int, page_index: int, variant: str, mtime_ns: int) -> Optional[Tuple[bytes, str]]:
+        """(bytes, mime_type) of a cached variant, or None"""
+        path = self._find(comic_id, page_index, variant, mtime_ns)
+        if path is None:
+            self.misses += 1
+            return None
+
+        try:
+            data = path.read_bytes()
+            # LRU bookkeeping
+            os.utime(path, None)
+        except OSError:
+            # Evicted by another worker between the lookup and the read
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return data, VARIANT_MIME_TYPES[path.suffix[1:]]
+
+    def put(self, comic_id: int, page_index: int, variant: str, mtime_ns: int,
+            data: bytes, mime_type: str) -> None:
+        extension = VARIANT_EXTENSIONS.get(mime_type)
+        if not extension or not data:
+            return
+
+        comic_dir = self.root / str(comic_id)
+        stem = self._stem(page_index, variant)
+        target = comic_dir / f"{stem}{mtime_ns}.{extension}"
+        tmp = comic_dir / f".tmp_{target.name}_{os.getpid()}_{threading.get_ident()}"
+
+        try:
+            comic_dir.mkdir(parents=True, exist_ok=True)
+
+            # Variants of an older version of this page are dead weight now
+            freed = 0
+            for old in comic_dir.glob(f"{stem}*"):
+                if old.name != target.name:
+                    freed += old.stat().st_size
+                    old.unlink(missing_ok=True)
+
+            tmp.write_bytes(data)
+            os.replace(tmp, target)
+        except OSError as e:
+            logger.warning(f"Could not cache page variant {target.name}: {e}")
+            tmp.unlink(missing_ok=True)
+            return
+
+        self.stores += 1
+
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = self._measure()
+            else:
+                self._bytes += len(data) - freed
+            over_budget = self._bytes > self._get_max_bytes()
+
+        if over_budget:
+            self._enforce_budget()
+
+    def invalidate(self, comic_id: int) -> None:
+        """Drop every cached variant of a comic (call on rescan, repack or delete)"""
+        shutil.rmtree(self.root / str(comic_id), ignore_errors=True)
+        with self._lock:
+            self._bytes = None
+
+    def _get_max_bytes(self) -> int:
+        # Import here to avoid pulling the DB layer in at import time
+        from app.core.settings_loader import get_cached_setting
+        return int(get_cached_setting("system.cache.variant_size_mb", 1024)) * 1024 * 1024
+
+    def _scan_entries(self):
+        """[(last_access, size, path)] for every cached variant"""
+        entries = []
+        if not self.root.exists():
+            return entries
+        for comic_dir in self.root.iterdir():
+            if not comic_dir.is_dir():
+                continue
+            for entry in os.scandir(comic_dir):
+                if entry.name.startswith(".tmp_"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, Path(entry.path)))
+        return entries
+
+    def _measure(self) -> int:
+        return sum(e[1] for e in self._scan_entries())
+
+    def _enforce_budget(self):
+        with self._lock:
+            max_bytes = self._get_max_bytes()
+            entries = sorted(self._scan_entries(), key=lambda e: e[0])
+            total = sum(e[1] for e in entries)
+            if total <= max_bytes:
+                # Another worker already made room
+                self._bytes = total
+                return
+
+            # Evict least recently served first, leaving headroom for the next writes
+            target = int(max_bytes * self.LOW_WATER)
+            while total > target and entries:
+                _, size, path = entries.pop(0)
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+                total -= size
+                self.evictions += 1
+
+            self._bytes = total
+
+    def clear(self) -> int:
+        """Delete every cached variant. Returns bytes freed."""
+        with self._lock:
+            freed = self._measure()
+            shutil.rmtree(self.root, ignore_errors=True)
+            self._bytes = 0
+        return freed
+
+    def stats(self) -> dict:
+        entries = self._scan_entries()
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(entries),
+            "bytes": sum(e[1] for e in entries),
+            "max_bytes": self._get_max_bytes(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Global instance
+variant_cache = VariantCache(settings.cache_dir / "variants")
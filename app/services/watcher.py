@@ -15,16 +15,21 @@ class LibraryEventHandler(FileSystemEventHandler):
     """
         Handles file system events for a specific library.
         Uses a 'Batching Window' strategy: The first event starts a timer.
-        Subsequent events are ignored until the timer fires.
+        Subsequent events only add their paths until the timer fires, then the
+        changed files / directories are queued as one targeted scan.
     """
 
-    def __init__(self, library_id: int, batch_window_seconds: int = 600): # Default 10 mins
+    def __init__(self, library_id: int, batch_window_seconds: int = 600, path_limit: int = 500): # Default 10 mins
         self.library_id = library_id
         self.batch_window_seconds = batch_window_seconds
+        self.path_limit = path_limit
         self._timer = None
         self._lock = threading.Lock()
         self._stopped = False
 
+        # Changed / deleted paths seen during the current window (None = too many, full scan)
+        self._paths = set()
+
         self.logger = logging.getLogger(__name__)
 
         # Files to completely ignore
@@ -41,6 +46,7 @@ class LibraryEventHandler(FileSystemEventHandler):
             if self._timer:
                 self._timer.cancel()
                 self._timer = None
+            self._paths = set()
 
     def _trigger_scan(self):
         """Trigger the scan and reset the timer"""
@@ -49,39 +55,63 @@ class LibraryEventHandler(FileSystemEventHandler):
             if self._stopped:
                 return
             self._timer = None
+            paths, self._paths = self._paths, set()
 
-        self.logger.info(f"Watcher: Batch window ended for Library {self.library_id}. Queuing scan...")
-        scan_manager.add_task(self.library_id, force=False)
-
-    def on_any_event(self, event):
-        """Called on any file event (create, modify, move, delete)"""
-        if event.is_directory:
-            return
-
-        path = Path(event.src_path)
+        if paths is None:
+            self.logger.info(f"Watcher: Batch window ended for Library {self.library_id}. Queuing full scan...")
+            scan_manager.add_task(self.library_id, force=False)
+        else:
+            self.logger.info(f"Watcher: Batch window ended for Library {self.library_id}. "
+                             f"Queuing scan of {len(paths)} changed path(s)...")
+            scan_manager.add_path_task(self.library_id, paths)
 
-        # --- FILTER NOISE ---
+    def _is_noise(self, path: Path) -> bool:
         # Ignore thumbnails and temp files
         if path.suffix.lower() in self.ignored_extensions:
-            return
+            return True
 
         # Ignore system files
         if path.name.lower() in self.ignored_names:
-            return
+            return True
 
         # Ignore internal storage/git folders if they somehow got into the watch path
         # Check if any part of the path matches ignored dirs
-        if any(part in self.ignored_dirs for part in path.parts):
+        return any(part in self.ignored_dirs for part in path.parts)
+
+    def on_any_event(self, event):
+        """Called on any file event (create, modify, move, delete)"""
+        # A directory 'modified' event is just its listing changing: the file events cover it.
+        # Created / deleted / moved directories are scanned (or dropped) as a whole.
+        if event.is_directory and event.event_type == 'modified':
+            return
+
+        # Reads (the reader / thumbnailer opening archives) change nothing
+        if event.event_type in ('opened', 'closed_no_write'):
+            return
+
+        # --- FILTER NOISE ---
+        # Moves report both ends: the old path is deleted, the new one imported
+        paths = [Path(p) for p in (event.src_path, getattr(event, 'dest_path', None)) if p]
+        paths = [str(p) for p in paths if not self._is_noise(p)]
+        if not paths:
             return
         # -----------------------
 
         # Coalescing Logic (Batching)
-        # If a timer is already running, do nothing (let it gather more changes).
-        # If no timer, start one.
+        # Every event adds its paths; the first one starts the timer.
         with self._lock:
-            if not self._stopped and not self._timer:
+            if self._stopped:
+                return
+
+            if self._paths is not None:
+                self._paths.update(paths)
+                if len(self._paths) > self.path_limit:
+                    # Too much churn for a targeted scan: stop collecting, walk the library
+                    self._paths = None
+
+            if not self._timer:
 
-                self.logger.debug(f"Watcher: Change detected in Library {self.library_id} ({event.event_type}: {path.name}). Starting {self.batch_window_seconds}s batch window.")
+                self.logger.debug(f"Watcher: Change detected in Library {self.library_id} ({event.event_type}: {Path(paths[0]).name}). Starting {self.batch_window_seconds}s batch window.")
 
                 # Start timer
                 self._timer = threading.Timer(self.batch_window_seconds, self._trigger_scan)
@@ -136,13 +166,14 @@ class LibraryWatcher:
             # We fetch it once per refresh so all new watches use the updated value.
             # (Existing watches won't update their timeout until they are restarted, which is fine)
             batch_window = get_cached_setting("scanning.batch_window", 600)
+            path_limit = get_cached_setting("scanning.targeted_scan_limit", 500)
 
             # 2. Add new watches
             for lib in libraries:
                 if lib.id not in self.watches:
                     try:
                         self.logger.info(f"Starting watch for: {lib.path}")
-                        handler = LibraryEventHandler(lib.id, int(batch_window))
+                        handler = LibraryEventHandler(lib.id, int(batch_window), int(path_limit))
                         watch = self.observer.schedule(handler, lib.path, recursive=True)
 
                         # Store both so we can cancel the handler later
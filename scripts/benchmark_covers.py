@@ -0,0 +1,85 @@
+"""
+Per-cover CPU time of the thumbnail + palette step, before and after reduced decoding.
+
+    python -m scripts.benchmark_covers                 # synthetic 2000x3000 JPEG covers
+    python -m scripts.benchmark_covers a.cbz b.jpg     # real covers (page 0 of archives)
+
+"before" is the previous pipeline (full decode, JPEG round trip for ColorThief, LANCZOS
+from full size); "after" is ImageService.render_cover. Archive I/O is excluded from both.
+"""
+import sys
+import time
+import statistics
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+from colorthief import ColorThief
+
+from app.services.archive import ComicArchive
+from app.services.images import ImageService
+
+
+def synthetic_cover(seed: int, size=(2000, 3000)) -> bytes:
+    """Gradient + shapes: compresses like a real scan, unlike noise"""
+    img = Image.linear_gradient("L").resize(size).convert("RGB")
+    draw = ImageDraw.Draw(img)
+    for i in range(40):
+        x, y = (seed * 131 + i * 197) % size[0], (seed * 71 + i * 313) % size[1]
+        color = ((seed * 40 + i * 23) % 256, (i * 61) % 256, (seed * 17 + i * 5) % 256)
+        draw.ellipse((x, y, x + 400, y + 300), fill=color)
+    output = BytesIO()
+    img.save(output, format="JPEG", quality=90)
+    return output.getvalue()
+
+
+def load_cover(path: Path) -> bytes:
+    if path.suffix.lower() in (".cbz", ".cbr", ".cb7"):
+        with ComicArchive(path) as archive:
+            return archive.read_file(archive.get_pages()[0], populate_cache=False)
+    return path.read_bytes()
+
+
+def legacy_render_cover(cover_bytes: bytes, thumbnail_size) -> bytes:
+    img = Image.open(BytesIO(cover_bytes))
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    small_img = img.copy()
+    small_img.thumbnail((150, 150))
+    small_bytes = BytesIO()
+    small_img.save(small_bytes, format='JPEG')
+    ColorThief(small_bytes).get_palette(color_count=5, quality=10)
+
+    img.thumbnail(thumbnail_size, Image.Resampling.LANCZOS)
+    output = BytesIO()
+    img.save(output, format='WEBP', quality=85)
+    return output.getvalue()
+
+
+def cpu_ms(fn, covers, rounds: int):
+    timings = []
+    for _ in range(rounds):
+        for cover in covers:
+            started = time.process_time()
+            fn(cover)
+            timings.append((time.process_time() - started) * 1000)
+    return statistics.median(timings), statistics.mean(timings)
+
+
+def main(argv):
+    covers = [load_cover(Path(p)) for p in argv] or [synthetic_cover(seed) for seed in range(8)]
+    service = ImageService()
+    rounds = 3
+
+    before = cpu_ms(lambda c: legacy_render_cover(c, service.thumbnail_size), covers, rounds)
+    after = cpu_ms(service.render_cover, covers, rounds)
+
+    print(f"{len(covers)} cover(s) x {rounds} rounds, CPU ms per cover (median / mean)")
+    print(f"  before: {before[0]:8.1f} / {before[1]:8.1f}")
+    print(f"  after:  {after[0]:8.1f} / {after[1]:8.1f}")
+    print(f"  speedup: {before[0] / after[0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,68 @@
+"""
+Palette extraction micro-benchmark: ColorThief (pure Python MMCQ) vs app.services.palette (NumPy).
+
+    python -m scripts.benchmark_palette                # synthetic covers
+    python -m scripts.benchmark_palette a.cbz b.jpg    # real covers
+
+Both run on the same 150px RGB image, the size render_cover / extract_palette quantize.
+"""
+import sys
+import time
+import statistics
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+from colorthief import ColorThief
+
+from app.services.palette import extract_palette
+from scripts.benchmark_covers import load_cover, synthetic_cover
+
+
+def small_image(cover_bytes: bytes) -> Image.Image:
+    img = Image.open(BytesIO(cover_bytes)).convert('RGB')
+    img.thumbnail((150, 150))
+    return img
+
+
+def colorthief_palette(img: Image.Image):
+    # ColorThief only takes files: encode once outside the timing, as the old pipeline's
+    # JPEG round trip is benchmarked in benchmark_covers
+    source = BytesIO()
+    img.save(source, format='PNG')
+    thief = ColorThief(source)
+    started = time.process_time()
+    palette = thief.get_palette(color_count=5, quality=10)
+    return palette, time.process_time() - started
+
+
+def numpy_palette(img: Image.Image):
+    started = time.process_time()
+    palette = extract_palette(img, color_count=5, quality=10)
+    return palette, time.process_time() - started
+
+
+def main(argv):
+    covers = [load_cover(Path(p)) for p in argv] or [synthetic_cover(seed) for seed in range(16)]
+    images = [small_image(cover) for cover in covers]
+    rounds = 5
+
+    timings = {"colorthief": [], "numpy": []}
+    mismatches = 0
+    for _ in range(rounds):
+        for img in images:
+            expected, elapsed = colorthief_palette(img)
+            timings["colorthief"].append(elapsed * 1000)
+            palette, elapsed = numpy_palette(img)
+            timings["numpy"].append(elapsed * 1000)
+            mismatches += palette != expected
+
+    print(f"{len(images)} image(s) x {rounds} rounds, CPU ms per palette (median / mean)")
+    for name, values in timings.items():
+        print(f"  {name:<10}: {statistics.median(values):7.2f} / {statistics.mean(values):7.2f}")
+    print(f"  speedup: {statistics.median(timings['colorthief']) / statistics.median(timings['numpy']):.1f}x")
+    print(f"  palettes differing from ColorThief: {mismatches}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
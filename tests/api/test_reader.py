@@ -0,0 +1,474 @@
+import os
+import zipfile
+from io import BytesIO
+
+from PIL import Image
+
+from app.models.comic import Comic, ComicPage
+from app.models.library import Library
+from app.services.scanner import LibraryScanner
+
+
+# --- HELPERS ---
+
+def make_page(color, fmt="JPEG") -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", (60, 90), color).save(buf, format=fmt)
+    return buf.getvalue()
+
+
+def build_cbz(path, pages: dict, comicinfo: str = None, compression=zipfile.ZIP_STORED):
+    """Write a CBZ with the given {entry_name: bytes} pages (insertion order is NOT reading order)"""
+    with zipfile.ZipFile(path, "w", compression=compression) as zf:
+        for name, data in pages.items():
+            zf.writestr(name, data)
+        if comicinfo:
+            zf.writestr("ComicInfo.xml", comicinfo)
+
+
+def scan_library(db, library_path):
+    lib = Library(name="Reader Lib", path=str(library_path))
+    db.add(lib)
+    db.commit()
+    return LibraryScanner(lib, db).scan()
+
+
+COMICINFO = """<?xml version="1.0"?>
+<ComicInfo><Series>Test Series</Series><Number>1</Number><Volume>1</Volume></ComicInfo>"""
+
+
+# --- TESTS ---
+
+def test_scan_persists_page_manifest(db, tmp_path):
+    """Scanner stores the natural-sorted page list at import time"""
+    pages = {
+        "page10.jpg": make_page("red"),
+        "page2.jpg": make_page("green"),
+        "page1.jpg": make_page("blue"),
+        "notes.txt": b"ignore me",
+    }
+    build_cbz(tmp_path / "test.cbz", pages, COMICINFO)
+
+    scan_library(db, tmp_path)
+
+    comic = db.query(Comic).one()
+    manifest = db.query(ComicPage).filter(ComicPage.comic_id == comic.id).order_by(ComicPage.page_index).all()
+
+    assert [p.filename for p in manifest] == ["page1.jpg", "page2.jpg", "page10.jpg"]
+    assert manifest[0].image_type == "jpeg"
+    assert manifest[0].file_size == len(pages["page1.jpg"])
+    assert comic.page_count == 3
+
+    # Stored entries record where their bytes live in the file
+    raw = (tmp_path / "test.cbz").read_bytes()
+    for page in manifest:
+        assert page.compress_type == zipfile.ZIP_STORED
+        assert raw[page.data_offset:page.data_offset + page.file_size] == pages[page.filename]
+
+
+def test_page_endpoint_uses_manifest(auth_client, db, tmp_path):
+    """The page endpoint serves the manifest entry for the requested index"""
+    pages = {
+        "b.png": make_page("green", "PNG"),
+        "a.png": make_page("red", "PNG"),
+    }
+    build_cbz(tmp_path / "test.cbz", pages, COMICINFO)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+
+    response = auth_client.get(f"/api/reader/{comic.id}/page/1")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert response.content == pages["b.png"]
+
+
+def test_page_endpoint_deflated_entries(auth_client, db, tmp_path):
+    """Compressed entries have no offset and go through the regular extraction path"""
+    pages = {"1.png": make_page("red", "PNG"), "2.png": make_page("green", "PNG")}
+    build_cbz(tmp_path / "test.cbz", pages, COMICINFO, compression=zipfile.ZIP_DEFLATED)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+
+    assert all(p.data_offset is None for p in comic.pages)
+
+    response = auth_client.get(f"/api/reader/{comic.id}/page/1")
+    assert response.status_code == 200
+    assert response.content == pages["2.png"]
+
+
+def test_page_endpoint_ignores_stale_manifest(auth_client, db, tmp_path):
+    """If the file changed after the scan, the archive is re-listed instead of trusting the manifest"""
+    cbz = tmp_path / "test.cbz"
+    build_cbz(cbz, {"1.jpg": make_page("red"), "2.jpg": make_page("green")}, COMICINFO)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+
+    # Replace the archive content without rescanning
+    new_pages = {"x1.jpg": make_page("blue"), "x2.jpg": make_page("white")}
+    build_cbz(cbz, new_pages, COMICINFO)
+    os.utime(cbz, (comic.file_modified_at + 10, comic.file_modified_at + 10))
+
+    response = auth_client.get(f"/api/reader/{comic.id}/page/1")
+
+    assert response.status_code == 200
+    assert response.content == new_pages["x2.jpg"]
+
+
+def test_archive_pool_reuses_handles(auth_client, db, tmp_path):
+    """Consecutive page reads share one open archive; a modified file gets a fresh handle"""
+    from app.services.archive_pool import archive_pool
+
+    # Deflated, so reads go through the archive rather than the zero-copy path
+    cbz = tmp_path / "test.cbz"
+    build_cbz(cbz, {"1.jpg": make_page("red"), "2.jpg": make_page("green")}, COMICINFO,
+              compression=zipfile.ZIP_DEFLATED)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+
+    archive_pool.clear()
+    before = archive_pool.stats()
+
+    assert auth_client.get(f"/api/reader/{comic.id}/page/0").status_code == 200
+    assert auth_client.get(f"/api/reader/{comic.id}/page/1").status_code == 200
+
+    after = archive_pool.stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+    # Touching the file changes the pool key
+    os.utime(cbz, (comic.file_modified_at + 10, comic.file_modified_at + 10))
+    assert auth_client.get(f"/api/reader/{comic.id}/page/0").status_code == 200
+    assert archive_pool.stats()["misses"] - before["misses"] == 2
+    assert archive_pool.stats()["open"] == 1
+
+
+def test_scan_probes_page_geometry(admin_client, db, tmp_path):
+    """Page dimensions come from the image headers and are returned by read-init"""
+    spread = BytesIO()
+    Image.new("RGB", (180, 90), "white").save(spread, format="PNG")
+
+    # Extension lies about the format: the header wins
+    pages = {"1.jpg": make_page("red"), "2.jpg": spread.getvalue()}
+    build_cbz(tmp_path / "test.cbz", pages, COMICINFO, compression=zipfile.ZIP_DEFLATED)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+
+    assert [(p.width, p.height, p.is_double) for p in comic.pages] == [(60, 90, False), (180, 90, True)]
+    assert comic.pages[1].image_type == "png"
+
+    response = admin_client.get(f"/api/reader/{comic.id}/read-init")
+
+    assert response.status_code == 200
+    assert response.json()["pages"] == [
+        {"width": 60, "height": 90, "is_double": False},
+        {"width": 180, "height": 90, "is_double": True},
+    ]
+
+
+def test_page_endpoint_caches_processed_variants(auth_client, db, tmp_path, monkeypatch):
+    """Filtered pages are built once and then served from the variant cache"""
+    from app.services.variant_cache import variant_cache
+    from app.services.images import ImageService
+
+    monkeypatch.setattr(variant_cache, "root", tmp_path / "variants")
+    monkeypatch.setattr(variant_cache, "_get_max_bytes", lambda: 10 * 1024 * 1024)
+
+    build_cbz(tmp_path / "test.cbz", {"1.jpg": make_page("red")}, COMICINFO)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+
+    first = auth_client.get(f"/api/reader/{comic.id}/page/0?grayscale=true")
+    assert first.status_code == 200
+
+    # A second request must not touch Pillow
+    monkeypatch.setattr(ImageService, "get_page_image", lambda *a, **kw: (None, False, ""))
+    second = auth_client.get(f"/api/reader/{comic.id}/page/0?grayscale=true")
+
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["content-type"] == "image/jpeg"
+
+
+def test_read_ahead_warms_following_pages(auth_client, db, tmp_path, monkeypatch):
+    """Requesting page N prepares N+1 in the background; the next request is served from memory"""
+    from app.services.read_ahead import read_ahead
+    from app.services.images import ImageService
+    from sqlalchemy.orm import sessionmaker
+
+    monkeypatch.setattr(read_ahead, "max_depth", 2)
+    monkeypatch.setattr(read_ahead, "session_factory", sessionmaker(bind=db.get_bind()))
+    read_ahead.cache.clear()
+
+    pages = {"1.jpg": make_page("red"), "2.jpg": make_page("green"), "3.jpg": make_page("blue")}
+    build_cbz(tmp_path / "test.cbz", pages, COMICINFO, compression=zipfile.ZIP_DEFLATED)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+
+    assert auth_client.get(f"/api/reader/{comic.id}/page/0").status_code == 200
+    read_ahead.drain()
+
+    monkeypatch.setattr(ImageService, "get_page_image", lambda *a, **kw: (None, False, ""))
+    response = auth_client.get(f"/api/reader/{comic.id}/page/1")
+
+    assert response.status_code == 200
+    assert response.content == pages["2.jpg"]
+    read_ahead.drain()
+
+
+def test_read_ahead_rewarms_evicted_pages(auth_client, db, tmp_path, monkeypatch):
+    """A page dropped by the memory LRU is warmed again on the next pass"""
+    from app.services.read_ahead import read_ahead
+    from sqlalchemy.orm import sessionmaker
+
+    monkeypatch.setattr(read_ahead, "max_depth", 2)
+    monkeypatch.setattr(read_ahead, "session_factory", sessionmaker(bind=db.get_bind()))
+    read_ahead.cache.clear()
+
+    pages = {"1.jpg": make_page("red"), "2.jpg": make_page("green"), "3.jpg": make_page("blue")}
+    build_cbz(tmp_path / "test.cbz", pages, COMICINFO, compression=zipfile.ZIP_DEFLATED)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+
+    for _ in range(2):
+        read_ahead.cache.clear()
+        assert auth_client.get(f"/api/reader/{comic.id}/page/0").status_code == 200
+        read_ahead.drain()
+        assert read_ahead.cache.stats()["entries"] == 2
+
+
+def test_page_conditional_get(auth_client, db, tmp_path, monkeypatch):
+    """Revalidation returns 304 without reading the archive; variants have their own validator"""
+    import app.api.reader as reader_api
+
+    build_cbz(tmp_path / "test.cbz", {"1.jpg": make_page("red")}, COMICINFO)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+
+    first = auth_client.get(f"/api/reader/{comic.id}/page/0")
+    etag = first.headers["etag"]
+    assert first.headers["last-modified"]
+
+    # No page bytes may be read from here on
+    monkeypatch.setattr(reader_api, "iter_file_range", None)
+
+    response = auth_client.get(f"/api/reader/{comic.id}/page/0", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    response = auth_client.get(f"/api/reader/{comic.id}/page/0",
+                               headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert response.status_code == 304
+
+    gray = auth_client.get(f"/api/reader/{comic.id}/page/0?grayscale=true", headers={"If-None-Match": etag})
+    assert gray.status_code == 200
+    assert gray.headers["etag"] != etag
+
+
+def test_thumbnail_conditional_get(client, db, tmp_path):
+    """Thumbnail revalidation is answered before the cover file is looked at"""
+    build_cbz(tmp_path / "test.cbz", {"1.jpg": make_page("red")}, COMICINFO)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+
+    cover = tmp_path / "cover.webp"
+    Image.new("RGB", (10, 10), "red").save(cover, format="WEBP")
+    comic.thumbnail_path = str(cover)
+    db.commit()
+
+    first = client.get(f"/api/comics/{comic.id}/thumbnail")
+    assert first.status_code == 200
+
+    cover.unlink()
+    response = client.get(f"/api/comics/{comic.id}/thumbnail", headers={"If-None-Match": first.headers["etag"]})
+
+    assert response.status_code == 304
+
+
+def test_missing_thumbnail_is_flagged_for_regeneration(client, db, tmp_path, monkeypatch):
+    """A missing cover marks the comic dirty once; nothing is rendered or queued by the request"""
+    from app.services.scan_manager import scan_manager
+    from app.services.images import ImageService
+
+    queued = []
+    monkeypatch.setattr(scan_manager, "add_thumbnail_task", lambda *args, **kwargs: queued.append(args))
+    monkeypatch.setattr(ImageService, "render_cover_derivative",
+                        lambda *args: (_ for _ in ()).throw(AssertionError("rendered in request")))
+
+    build_cbz(tmp_path / "test.cbz", {"1.jpg": make_page("red")}, COMICINFO)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+    comic.thumbnail_path = None
+    comic.is_dirty = False
+    db.commit()
+    updated_at = comic.updated_at
+
+    assert client.get(f"/api/comics/{comic.id}/thumbnail").status_code == 404
+    assert client.get(f"/api/comics/{comic.id}/thumbnail?w=640", headers={"Accept": "image/webp"}).status_code == 404
+
+    db.refresh(comic)
+    assert comic.is_dirty is True
+    assert comic.updated_at == updated_at
+    assert queued == []
+
+
+def test_page_responsive_derivatives(auth_client, db, tmp_path, monkeypatch):
+    """w= / Client Hints pick a width tier, Accept picks the codec"""
+    from app.services.variant_cache import variant_cache
+
+    monkeypatch.setattr(variant_cache, "root", tmp_path / "variants")
+    monkeypatch.setattr(variant_cache, "_get_max_bytes", lambda: 10 * 1024 * 1024)
+
+    buf = BytesIO()
+    Image.new("RGB", (1600, 2400), "red").save(buf, format="JPEG")
+    build_cbz(tmp_path / "test.cbz", {"1.jpg": buf.getvalue()}, COMICINFO)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+    url = f"/api/reader/{comic.id}/page/0"
+
+    def fetch(**headers):
+        response = auth_client.get(url if "w" not in headers else f"{url}?w={headers.pop('w')}", headers=headers)
+        assert response.status_code == 200
+        return response, Image.open(BytesIO(response.content))
+
+    response, img = fetch(w=700, Accept="image/webp,*/*")
+    assert response.headers["content-type"] == "image/webp"
+    assert img.width == 720
+    assert "Viewport-Width" in response.headers["vary"]
+
+    response, img = fetch(w=700, Accept="image/avif,image/webp")
+    assert response.headers["content-type"] == "image/avif"
+
+    # Viewport-Width is CSS px x DPR; Save-Data drops DPR to 1
+    response, img = fetch(**{"Viewport-Width": "400", "DPR": "2"})
+    assert (response.headers["content-type"], img.width) == ("image/jpeg", 1080)
+    _, img = fetch(**{"Viewport-Width": "400", "DPR": "2", "Save-Data": "on"})
+    assert img.width == 480
+
+    # Beyond the largest tier / no hints: the original page
+    response, img = fetch(w=5000)
+    assert img.width == 1600
+    assert response.content == buf.getvalue()
+
+
+def test_page_narrower_than_tier_streams_original(auth_client, db, tmp_path, monkeypatch):
+    """A stored page that already fits the width tier is not re-encoded"""
+    from app.services.images import ImageService
+    from app.services.variant_cache import variant_cache
+
+    monkeypatch.setattr(variant_cache, "root", tmp_path / "variants")
+    monkeypatch.setattr(variant_cache, "_get_max_bytes", lambda: 10 * 1024 * 1024)
+
+    buf = BytesIO()
+    Image.new("RGB", (600, 900), "red").save(buf, format="JPEG")
+    build_cbz(tmp_path / "test.cbz", {"1.jpg": buf.getvalue()}, COMICINFO)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+
+    def no_decode(*args, **kwargs):
+        raise AssertionError("page should not go through Pillow")
+
+    monkeypatch.setattr(ImageService, "get_page_image", no_decode)
+
+    response = auth_client.get(f"/api/reader/{comic.id}/page/0?w=1080", headers={"Accept": "image/avif,image/webp"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/jpeg"
+    assert response.content == buf.getvalue()
+
+
+def test_cover_responsive_derivative(client, db, tmp_path, monkeypatch):
+    """Small cover tiers are cut from the stored thumbnail"""
+    from app.services.variant_cache import variant_cache
+
+    monkeypatch.setattr(variant_cache, "root", tmp_path / "variants")
+    monkeypatch.setattr(variant_cache, "_get_max_bytes", lambda: 10 * 1024 * 1024)
+
+    build_cbz(tmp_path / "test.cbz", {"1.jpg": make_page("red")}, COMICINFO)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+
+    cover = tmp_path / "cover.webp"
+    Image.new("RGB", (320, 455), "red").save(cover, format="WEBP")
+    comic.thumbnail_path = str(cover)
+    db.commit()
+
+    response = client.get(f"/api/comics/{comic.id}/thumbnail?w=100", headers={"Accept": "image/webp"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert Image.open(BytesIO(response.content)).width == 160
+    assert response.headers["etag"] != client.get(f"/api/comics/{comic.id}/thumbnail").headers["etag"]
+
+
+def test_pages_bundle_streams_zip(admin_client, db, tmp_path, monkeypatch):
+    """A page range comes back as one stored ZIP, in reading order"""
+    from app.services.variant_cache import variant_cache
+
+    monkeypatch.setattr(variant_cache, "root", tmp_path / "variants")
+    monkeypatch.setattr(variant_cache, "_get_max_bytes", lambda: 10 * 1024 * 1024)
+
+    pages = {f"p{i}.jpg": make_page(color) for i, color in enumerate(["red", "green", "blue", "white"])}
+    build_cbz(tmp_path / "test.cbz", pages, COMICINFO, compression=zipfile.ZIP_DEFLATED)
+    scan_library(db, tmp_path)
+    comic = db.query(Comic).one()
+
+    response = admin_client.get(f"/api/reader/{comic.id}/pages?from=1&count=10")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    assert response.headers["x-page-range"] == "1-3"
+
+    bundle = zipfile.ZipFile(BytesIO(response.content))
+    assert bundle.namelist() == ["0001.jpg", "0002.jpg", "0003.jpg"]
+    assert all(info.compress_type == zipfile.ZIP_STORED for info in bundle.infolist())
+    assert bundle.read("0002.jpg") == pages["p2.jpg"]
+
+    # Processed variants render in parallel but keep their order
+    gray = zipfile.ZipFile(BytesIO(admin_client.get(f"/api/reader/{comic.id}/pages?from=0&count=2&grayscale=true").content))
+    assert gray.namelist() == ["0000.jpg", "0001.jpg"]
+    assert Image.open(BytesIO(gray.read("0001.jpg"))).mode == "L"
+
+    again = admin_client.get(f"/api/reader/{comic.id}/pages?from=1&count=10",
+                             headers={"If-None-Match": response.headers["etag"]})
+    assert again.status_code == 304
+
+    assert admin_client.get(f"/api/reader/{comic.id}/pages?from=4").status_code == 404
+
+
+def test_bundle_renders_through_a_small_window(monkeypatch):
+    """Bundle renders stay a few pages ahead of the stream and are cancelled when the client leaves"""
+    from concurrent.futures import Future
+
+    from app.api import reader
+
+    class FakeExecutor:
+        max_workers = 4
+
+        def __init__(self):
+            self.futures = []
+
+        def submit(self, fn, index):
+            # Only the first page finishes; the rest stay queued
+            future = Future()
+            if index == 0:
+                future.set_result((b"page0", "image/jpeg"))
+            self.futures.append(future)
+            return future
+
+    executor = FakeExecutor()
+    monkeypatch.setattr(reader, "image_executor", executor)
+
+    pages = reader._iter_bundle_pages(1, "/nowhere.cbz", 1, {i: f"{i}.jpg" for i in range(32)},
+                                      sharpen=False, grayscale=True, webp=False, derivative=None,
+                                      variant="grayscale")
+
+    assert next(pages) == ("0000.jpg", b"page0")
+    # One page handed out, the window (half the executor) refilled behind it
+    assert len(executor.futures) == 3
+
+    pages.close()
+
+    assert all(future.cancelled() for future in executor.futures[1:])
+    assert len(executor.futures) == 3
@@ -0,0 +1,113 @@
+from app.core.comic_helpers import get_sort_keys, UNKNOWN_SORT_NUMBER, UNKNOWN_SORT_DATE
+from app.models.comic import Comic, Volume
+from app.models.library import Library
+from app.models.series import Series
+from app.models.pull_list import PullList, PullListItem
+from app.services.reading_order import ReadingOrderCache, Generation, reading_order_cache
+
+
+# --- HELPERS ---
+
+def make_volume(db, numbers):
+    lib = Library(name="Order Lib", path="/tmp/order")
+    db.add(lib)
+    db.flush()
+    series = Series(name="Order Series", library_id=lib.id)
+    db.add(series)
+    db.flush()
+    volume = Volume(series_id=series.id, volume_number=1)
+    db.add(volume)
+    db.flush()
+
+    comics = []
+    for number in numbers:
+        comic = Comic(volume_id=volume.id, number=number, filename=f"{number}.cbz",
+                      file_path=f"/tmp/order/{number}.cbz", page_count=1,
+                      **get_sort_keys(number, None, None, None, None))
+        db.add(comic)
+        comics.append(comic)
+    db.commit()
+    return volume, comics
+
+
+# --- TESTS ---
+
+def test_sort_keys_parse_issue_labels():
+    keys = get_sort_keys("10a", "Annual", 1992, 5, None)
+    assert (keys["sort_number"], keys["sort_suffix"]) == (10.0, "a")
+    assert (keys["sort_date"], keys["format_weight"]) == (19920599, 2)
+
+    assert get_sort_keys("-1", None, None, None, None)["sort_number"] == -1.0
+    assert get_sort_keys("0.5", None, None, None, None)["sort_number"] == 0.5
+
+    # Non-numeric labels and missing dates sort last
+    keys = get_sort_keys("Alpha", "One-Shot", -1, -1, -1)
+    assert (keys["sort_number"], keys["sort_suffix"]) == (UNKNOWN_SORT_NUMBER, "alpha")
+    assert (keys["sort_date"], keys["format_weight"]) == (UNKNOWN_SORT_DATE, 3)
+
+
+def test_cache_rebuilds_after_generation_bump(db, admin_user, tmp_path):
+    volume, comics = make_volume(db, ["1", "10", "2"])
+    cache = ReadingOrderCache(Generation(tmp_path / "order.gen"))
+
+    order = cache.get(db, "volume", volume.id, admin_user)
+    # Natural sort: 1, 2, 10
+    assert order.ids == [comics[0].id, comics[2].id, comics[1].id]
+    assert order.neighbours(comics[2].id) == (comics[0].id, comics[1].id)
+    assert cache.get(db, "volume", volume.id, admin_user) is order
+
+    db.add(Comic(volume_id=volume.id, number="3", filename="3.cbz", file_path="/tmp/order/3.cbz",
+                 **get_sort_keys("3", None, None, None, None)))
+    db.commit()
+    cache.invalidate()
+
+    assert len(cache.get(db, "volume", volume.id, admin_user)) == 4
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 2)
+
+
+def test_pull_list_reorder_updates_navigation_and_manifest(admin_client, db, admin_user):
+    _, comics = make_volume(db, ["1", "2", "3"])
+    plist = PullList(user_id=admin_user.id, name="Weekly")
+    db.add(plist)
+    db.flush()
+    for index, comic in enumerate(comics):
+        db.add(PullListItem(pull_list_id=plist.id, comic_id=comic.id, sort_order=index))
+    db.commit()
+
+    params = {"context_type": "pull_list", "context_id": plist.id}
+    data = admin_client.get(f"/api/reader/{comics[1].id}/read-init", params=params).json()
+    assert (data["prev_comic_id"], data["next_comic_id"]) == (comics[0].id, comics[2].id)
+    assert (data["context_position"], data["context_total"], data["context_label"]) == (2, 3, "Weekly")
+
+    new_order = [comics[2].id, comics[1].id, comics[0].id]
+    response = admin_client.post(f"/api/pull-lists/{plist.id}/reorder", json={"comic_ids": new_order})
+    assert response.status_code == 200
+
+    data = admin_client.get(f"/api/reader/{comics[2].id}/read-init", params=params).json()
+    assert (data["prev_comic_id"], data["next_comic_id"]) == (None, comics[1].id)
+
+    manifest = admin_client.get("/api/comics/covers/manifest", params=params).json()
+    assert [item["comic_id"] for item in manifest["items"]] == new_order
+
+    response = admin_client.put(f"/api/pull-lists/{plist.id}", json={"name": "Monthly"})
+    assert response.status_code == 200
+    data = admin_client.get(f"/api/reader/{comics[2].id}/read-init", params=params).json()
+    assert data["context_label"] == "Monthly"
+
+
+def test_comic_outside_context_rebuilds_once_per_generation(admin_client, db, admin_user):
+    _, comics = make_volume(db, ["1", "2", "3"])
+    plist = PullList(user_id=admin_user.id, name="Short")
+    db.add(plist)
+    db.flush()
+    db.add(PullListItem(pull_list_id=plist.id, comic_id=comics[0].id, sort_order=0))
+    db.commit()
+
+    params = {"context_type": "pull_list", "context_id": plist.id}
+    misses = reading_order_cache.stats()["misses"]
+    for comic in comics[1:] * 2:
+        data = admin_client.get(f"/api/reader/{comic.id}/read-init", params=params).json()
+        assert data["context_position"] == 0
+
+    # One build plus a single forced rebuild, however many outsiders are requested
+    assert reading_order_cache.stats()["misses"] - misses == 2
@@ -32,6 +32,28 @@ def mock_background_services():
     library_watcher.start = MagicMock()
     library_watcher.stop = MagicMock()
 
+    # Reader read-ahead runs on its own thread + DB session; tests opt in explicitly
+    from app.services.read_ahead import read_ahead
+    read_ahead.max_depth = 0
+
+
+@pytest.fixture(autouse=True)
+def isolated_storage(tmp_path, monkeypatch):
+    """
+    Keep tests out of the checkout's storage/: settings resolve to their defaults instead of
+    the production database, and reading-order bumps go to a per-test file.
+    """
+    from app.core import settings_loader
+    from app.services.reading_order import reading_order_cache, Generation
+
+    monkeypatch.setattr(settings_loader, "get_system_setting", lambda key, default=None: default)
+    settings_loader.invalidate_settings_cache()
+    monkeypatch.setattr(reading_order_cache, "generation", Generation(tmp_path / "reading_order.gen"))
+
+    yield
+
+    settings_loader.invalidate_settings_cache()
+
 
 # --- FIXTURE END ---
 
@@ -57,6 +79,10 @@ def db():
     # Create Tables
     Base.metadata.create_all(bind=engine)
 
+    # Ids restart with every fresh database: drop orders cached by earlier tests
+    from app.services.reading_order import reading_order_cache
+    reading_order_cache.clear()
+
     session = TestingSessionLocal()
     yield session
 
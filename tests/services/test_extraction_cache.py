@@ -0,0 +1,89 @@
+import os
+import zipfile
+from types import SimpleNamespace
+
+from app.services.extraction_cache import ExtractionCache
+
+
+# --- HELPERS ---
+
+def make_archive(path, pages: dict):
+    """
+    Stand-in for a RAR ComicArchive: the cache only needs .filepath and .archive.extractall().
+    (zipfile provides the same extractall() contract, and doesn't need the unrar binary)
+    """
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in pages.items():
+            zf.writestr(name, data)
+    return SimpleNamespace(filepath=path, archive=zipfile.ZipFile(path))
+
+
+def make_cache(tmp_path, max_bytes=10 * 1024 * 1024):
+    cache = ExtractionCache(tmp_path / "extracted")
+    cache._get_max_bytes = lambda: max_bytes
+    return cache
+
+
+# --- TESTS ---
+
+def test_first_read_extracts_everything_once(tmp_path):
+    cache = make_cache(tmp_path)
+    archive = make_archive(tmp_path / "a.cbr", {"01.jpg": b"one", "sub/02.jpg": b"two"})
+
+    assert cache.read(archive, "01.jpg") == b"one"
+    assert cache.read(archive, "sub/02.jpg") == b"two"
+
+    assert cache.extractions == 1
+    assert cache.misses == 1
+    assert cache.hits == 1
+
+
+def test_peek_does_not_populate(tmp_path):
+    cache = make_cache(tmp_path)
+    archive = make_archive(tmp_path / "a.cbr", {"01.jpg": b"one"})
+
+    assert cache.read(archive, "01.jpg", populate=False) is None
+    assert (cache.extractions, cache.misses) == (0, 0)
+
+
+def test_entry_evicted_during_read_falls_back(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path)
+    archive = make_archive(tmp_path / "a.cbr", {"01.jpg": b"one"})
+    cache.read(archive, "01.jpg")
+
+    # Another worker evicts the directory between the lookup and the read
+    monkeypatch.setattr(os, "utime", lambda path, times: cache.clear())
+    assert cache.read(archive, "01.jpg") is None
+
+
+def test_modified_source_replaces_stale_copy(tmp_path):
+    cache = make_cache(tmp_path)
+    path = tmp_path / "a.cbr"
+    archive = make_archive(path, {"01.jpg": b"old"})
+    cache.read(archive, "01.jpg")
+
+    archive = make_archive(path, {"01.jpg": b"new"})
+    os.utime(path, ns=(os.stat(path).st_mtime_ns + 10**9,) * 2)
+
+    assert cache.read(archive, "01.jpg") == b"new"
+    assert cache.stats()["entries"] == 1
+
+
+def test_budget_evicts_least_recently_read(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=15)
+    first = make_archive(tmp_path / "a.cbr", {"01.jpg": b"x" * 10})
+    second = make_archive(tmp_path / "b.cbr", {"01.jpg": b"y" * 10})
+
+    cache.read(first, "01.jpg")
+    cache.read(second, "01.jpg")
+
+    assert cache.evictions == 1
+    assert cache.read(first, "01.jpg", populate=False) is None
+    assert cache.read(second, "01.jpg", populate=False) == b"y" * 10
+
+
+def test_rejects_path_traversal(tmp_path):
+    cache = make_cache(tmp_path)
+    archive = make_archive(tmp_path / "a.cbr", {"01.jpg": b"one"})
+
+    assert cache.read(archive, "../../a.cbr") is None
@@ -0,0 +1,42 @@
+import asyncio
+import threading
+
+from app.services.image_executor import BlockingExecutor
+
+
+# --- TESTS ---
+
+def test_call_runs_on_pool_and_records_stats():
+    executor = BlockingExecutor(max_workers=2, name="test-io")
+
+    thread_name = executor.call(lambda: threading.current_thread().name)
+
+    assert thread_name.startswith("test-io")
+    stats = executor.stats()
+    assert stats["completed"] == 1
+    assert stats["queued"] == 0 and stats["active"] == 0
+    executor.shutdown()
+
+
+def test_nested_call_runs_inline():
+    """A task that calls back into a full pool must not deadlock"""
+    executor = BlockingExecutor(max_workers=1)
+
+    assert executor.call(lambda: executor.call(lambda: 42)) == 42
+    executor.shutdown()
+
+
+def test_run_does_not_block_event_loop():
+    executor = BlockingExecutor(max_workers=1)
+    release = threading.Event()
+
+    async def scenario():
+        task = asyncio.ensure_future(executor.run(release.wait, 5))
+        # The loop is still free while the worker blocks
+        await asyncio.sleep(0)
+        assert executor.stats()["active"] + executor.stats()["queued"] == 1
+        release.set()
+        return await task
+
+    assert asyncio.run(scenario()) is True
+    executor.shutdown()
@@ -0,0 +1,85 @@
+import threading
+import time
+
+from app.services.image_pool import ImageWorkerPool
+
+
+# --- HELPERS ---
+
+def square(n):
+    return n * n
+
+
+def fail(n):
+    raise ValueError(f"bad {n}")
+
+
+def slow(n):
+    time.sleep(30)
+    return n
+
+
+# --- TESTS ---
+
+def test_pool_stays_warm_across_jobs():
+    pool = ImageWorkerPool(size=2)
+    try:
+        results = []
+        pool.run(square, range(10), results.append)
+        assert sorted(results) == [n * n for n in range(10)]
+
+        assert pool.call(square, 7) == 49
+        stats = pool.stats()
+        assert (stats["starts"], stats["jobs"], stats["completed"], stats["in_flight"]) == (1, 2, 11, 0)
+    finally:
+        pool.shutdown()
+
+    assert pool.stats()["running"] is False
+
+
+def test_errors_reach_the_job_and_limit_caps_concurrency():
+    pool = ImageWorkerPool(size=2)
+    try:
+        errors = []
+        pool.run(fail, [1, 2], lambda _: None, errors.append)
+        assert sorted(str(e) for e in errors) == ["bad 1", "bad 2"]
+
+        # limit=1: never more than one task of this job in flight
+        peak = []
+        lock = threading.Lock()
+
+        def tasks():
+            for n in range(5):
+                with lock:
+                    peak.append(sum(pool._in_flight.values()))
+                yield n
+
+        pool.run(square, tasks(), lambda _: None, limit=1)
+        assert max(peak) <= 1
+    finally:
+        pool.shutdown()
+
+
+def test_shutdown_fails_the_tasks_of_a_running_job():
+    pool = ImageWorkerPool(size=1)
+    errors = []
+    outcome = []
+
+    def job():
+        try:
+            pool.run(slow, range(100), lambda _: None, errors.append)
+        except RuntimeError as e:
+            outcome.append(e)
+
+    runner = threading.Thread(target=job)
+    runner.start()
+    while not pool.stats()["in_flight"]:
+        time.sleep(0.01)
+
+    pool.shutdown(timeout=0.2)
+    runner.join(5)
+
+    assert not runner.is_alive()
+    assert len(outcome) == 1
+    assert errors and all(isinstance(e, RuntimeError) for e in errors)
+    assert pool.stats()["active_jobs"] == 0
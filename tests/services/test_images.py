@@ -0,0 +1,43 @@
+from io import BytesIO
+
+from PIL import Image, JpegImagePlugin
+
+from app.services.images import ImageService
+
+
+def jpeg_bytes(size, color=(200, 40, 40)):
+    img = Image.new("RGB", size, color)
+    img.paste((20, 60, 180), (0, 0, size[0] // 2, size[1]))
+    output = BytesIO()
+    img.save(output, format="JPEG", quality=90)
+    return output.getvalue()
+
+
+def test_render_cover_decodes_large_jpeg_at_thumbnail_size(monkeypatch):
+    service = ImageService()
+
+    # Size of the image once draft() has picked the JPEG decode scale
+    decoded = []
+    draft = JpegImagePlugin.JpegImageFile.draft
+
+    def spy(img, mode, size):
+        result = draft(img, mode, size)
+        decoded.append(img.size)
+        return result
+
+    monkeypatch.setattr(JpegImagePlugin.JpegImageFile, "draft", spy)
+
+    thumbnail_bytes, palette = service.render_cover(jpeg_bytes((2000, 3000)))
+
+    # Reduced decode straight to the thumbnail scale (1/4 here). thumbnail() on its own only
+    # drafts to twice the target size, and not at all once the pixels are loaded.
+    assert decoded and decoded[0] == (500, 750)
+
+    thumb = Image.open(BytesIO(thumbnail_bytes))
+    assert thumb.format == "WEBP"
+    assert thumb.size[0] <= service.thumbnail_size[0]
+    assert thumb.size[1] <= service.thumbnail_size[1]
+    assert max(thumb.size) >= min(service.thumbnail_size)
+
+    assert set(palette) == {'primary', 'secondary', 'accent1', 'accent2', 'accent3'}
+    assert palette['primary'].startswith("#")
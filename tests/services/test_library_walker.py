@@ -0,0 +1,79 @@
+import os
+import time
+
+from app.services.library_walker import LibraryWalker
+
+
+# --- HELPERS ---
+
+def age(*paths, seconds=60):
+    """Move mtimes into the past so the walker trusts them"""
+    past = time.time() - seconds
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+def walk(root, known_dirs, known_files, full=False):
+    walker = LibraryWalker(str(root), [".cbz", ".cbr"], known_dirs, known_files, full=full)
+    found = sorted(path for path, _, _ in walker.walk())
+    return walker, found
+
+
+# --- TESTS ---
+
+def test_unchanged_directories_are_pruned(tmp_path):
+    series = tmp_path / "Series"
+    deep = series / "Vol 1"
+    deep.mkdir(parents=True)
+    (series / "a.cbz").write_bytes(b"a")
+    (deep / "b.cbr").write_bytes(b"b")
+    (deep / "notes.txt").write_text("ignored")
+    age(deep, series, tmp_path)
+
+    walker, found = walk(tmp_path, {}, [])
+    assert found == sorted([str(series / "a.cbz"), str(deep / "b.cbr")])
+    assert (walker.listed, walker.pruned) == (3, 0)
+    assert walker.directories[str(deep)] == (os.stat(deep).st_mtime_ns, 2)
+
+    # Nothing changed: no listing, known files reported unchanged
+    known_files = found
+    walker, found = walk(tmp_path, walker.directories, known_files)
+    assert found == []
+    assert (walker.listed, walker.pruned) == (0, 3)
+    assert sorted(walker.unchanged_paths) == known_files
+
+    # A deep change is found even though the parents' mtimes did not move
+    (deep / "c.cbz").write_bytes(b"c")
+    age(deep)
+    walker, found = walk(tmp_path, walker.directories, known_files)
+    assert found == [str(deep / "b.cbr"), str(deep / "c.cbz")]
+    assert (walker.listed, walker.pruned) == (1, 2)
+
+    # Full walk lists everything regardless
+    walker, found = walk(tmp_path, walker.directories, known_files, full=True)
+    assert len(found) == 3 and walker.pruned == 0
+
+
+def test_recent_directory_mtime_is_not_trusted(tmp_path):
+    (tmp_path / "a.cbz").write_bytes(b"a")
+
+    walker, _ = walk(tmp_path, {}, [])
+    assert walker.directories[str(tmp_path)] == (None, 1)
+
+    # Stored as NULL, so it is listed again next time
+    walker, found = walk(tmp_path, walker.directories, [str(tmp_path / "a.cbz")])
+    assert found == [str(tmp_path / "a.cbz")] and walker.listed == 1
+
+
+def test_deleted_directory_drops_its_files(tmp_path):
+    gone = tmp_path / "Gone"
+    gone.mkdir()
+    age(gone, tmp_path)
+    known = {str(tmp_path): (os.stat(tmp_path).st_mtime_ns, 1), str(gone): (os.stat(gone).st_mtime_ns, 1)}
+
+    gone.rmdir()
+    age(tmp_path)
+    walker, found = walk(tmp_path, known, [str(gone / "x.cbz")])
+
+    assert found == [] and walker.unchanged_paths == []
+    assert str(gone) not in walker.directories
@@ -0,0 +1,48 @@
+import random
+from io import BytesIO
+
+import pytest
+from PIL import Image, ImageDraw
+
+from app.services.images import ImageService
+from app.services.palette import extract_palette
+
+colorthief = pytest.importorskip("colorthief")
+
+
+def fixture_covers():
+    """Deterministic covers: flat fills, busy panels, gradients, near-monochrome"""
+    rng = random.Random(7)
+    covers = []
+    for n in range(24):
+        img = Image.new("RGB", (150, 225), tuple(rng.randrange(256) for _ in range(3)))
+        draw = ImageDraw.Draw(img)
+        for _ in range(rng.randrange(1, 25)):
+            x, y = rng.randrange(150), rng.randrange(225)
+            draw.rectangle((x, y, x + rng.randrange(80), y + rng.randrange(80)),
+                           fill=tuple(rng.randrange(256) for _ in range(3)))
+        covers.append(img)
+
+    covers.append(Image.linear_gradient("L").resize((150, 225)).convert("RGB"))
+    covers.append(Image.merge("RGB", [Image.linear_gradient("L").resize((150, 225)).rotate(r) for r in (0, 90, 180)]))
+    covers.append(Image.new("RGB", (150, 225), (12, 20, 33)))
+    # Mostly white page with a little ink
+    page = Image.new("RGB", (150, 225), (255, 255, 255))
+    ImageDraw.Draw(page).text((10, 100), "PARKER", fill=(30, 30, 30))
+    covers.append(page)
+    return covers
+
+
+def test_palette_matches_colorthief():
+    for img in fixture_covers():
+        source = BytesIO()
+        img.save(source, format="PNG")
+        expected = colorthief.ColorThief(source).get_palette(color_count=5, quality=10)
+
+        assert extract_palette(img, color_count=5, quality=10) == expected
+
+
+def test_all_white_cover_still_gets_a_palette():
+    palette = ImageService.palette_to_hex(extract_palette(Image.new("RGB", (150, 150), (255, 255, 255))))
+    assert palette['primary'] == palette['secondary'] == palette['accent1']
+    assert palette['primary'].startswith("#")
@@ -0,0 +1,57 @@
+from app.services.read_ahead import ReadAheadService, PageMemoryCache
+
+
+# --- HELPERS ---
+
+def make_service(max_depth=8):
+    return ReadAheadService(max_depth=max_depth, cache_bytes=1024, session_factory=None)
+
+
+# --- TESTS ---
+
+def test_depth_grows_with_page_turn_speed():
+    service = make_service()
+
+    assert service.depth_for(None) == ReadAheadService.DEFAULT_DEPTH
+    # 10s of reading ahead: slow readers get 1 page, fast readers hit the cap
+    assert service.depth_for(20.0) == 1
+    assert service.depth_for(5.0) == 2
+    assert service.depth_for(0.5) == 8
+
+
+def test_forward_turns_update_speed_and_jumps_reset_it():
+    service = make_service()
+    session = service._get_session("reader")
+
+    service._observe(session, 1, 0, now=100.0)
+    service._observe(session, 1, 1, now=102.0)
+    assert session.avg_interval == 2.0
+
+    depth = service._observe(session, 1, 2, now=103.0)
+    assert session.avg_interval == 0.7 * 2.0 + 0.3 * 1.0
+    assert depth == 6
+
+    # Jumping back (or opening another comic) forgets the speed
+    assert service._observe(session, 1, 0, now=104.0) == ReadAheadService.DEFAULT_DEPTH
+    assert session.avg_interval is None
+
+
+def test_disabled_service_schedules_nothing():
+    service = make_service(max_depth=0)
+    service.on_page_request("reader", 1, 0)
+
+    assert service.scheduled == 0
+    assert service._executor is None
+
+
+def test_memory_cache_is_bounded():
+    cache = PageMemoryCache(max_bytes=10)
+    cache.put(("a",), b"12345", "image/jpeg")
+    cache.put(("b",), b"12345", "image/jpeg")
+    cache.get(("a",))
+    cache.put(("c",), b"12345", "image/jpeg")
+
+    # Least recently used ("b") goes first
+    assert ("b",) not in cache
+    assert cache.get(("a",)) == (b"12345", "image/jpeg")
+    assert cache.stats()["bytes"] == 10
@@ -0,0 +1,74 @@
+import zipfile
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app.config import settings
+from app.models.comic import Comic, Volume
+from app.models.library import Library
+from app.models.reading_progress import ReadingProgress
+from app.models.series import Series
+from app.services.archive import content_fingerprint
+from app.services.repack import RepackService
+
+py7zr = pytest.importorskip("py7zr")
+
+COMICINFO = """<?xml version="1.0"?>
+<ComicInfo><Series>Repack</Series><Number>1</Number><Volume>1</Volume></ComicInfo>"""
+
+
+def build_cb7(path):
+    with py7zr.SevenZipFile(path, "w") as archive:
+        for name, color in (("01.jpg", "red"), ("02.jpg", "blue")):
+            buf = BytesIO()
+            Image.new("RGB", (60, 90), color).save(buf, format="JPEG")
+            archive.writestr(buf.getvalue(), name)
+        archive.writestr(COMICINFO, "ComicInfo.xml")
+
+
+@pytest.mark.parametrize("delete_originals", [False, True])
+def test_repack_keeps_comic_and_retires_original(db, tmp_path, monkeypatch, normal_user, delete_originals):
+    monkeypatch.setattr(settings, "cache_dir", tmp_path / "cache")
+    monkeypatch.setattr("app.services.repack.get_cached_setting",
+                        lambda key, default=None: delete_originals if key == "system.repack.delete_originals" else default)
+
+    source = tmp_path / "issue_01.cb7"
+    build_cb7(source)
+
+    lib = Library(name="Repack Lib", path=str(tmp_path))
+    db.add(lib)
+    db.flush()
+    series = Series(name="Repack", library_id=lib.id)
+    db.add(series)
+    db.flush()
+    volume = Volume(series_id=series.id, volume_number=1)
+    db.add(volume)
+    db.flush()
+    comic = Comic(volume_id=volume.id, number="1", filename=source.name, file_path=str(source),
+                  page_count=2, fingerprint="stale")
+    db.add(comic)
+    db.flush()
+    db.add(ReadingProgress(user_id=normal_user.id, comic_id=comic.id, current_page=1, total_pages=2))
+    db.commit()
+    comic_id = comic.id
+
+    stats = RepackService(db).repack_library(lib.id)
+
+    assert (stats["repacked"], stats["errors"]) == (1, 0)
+
+    comic = db.get(Comic, comic_id)
+    target = tmp_path / "issue_01.cbz"
+    assert comic.file_path == str(target)
+    assert db.query(ReadingProgress).filter_by(comic_id=comic_id).one().current_page == 1
+
+    with zipfile.ZipFile(target) as zf:
+        assert all(info.compress_type == zipfile.ZIP_STORED for info in zf.infolist())
+        assert "ComicInfo.xml" in zf.namelist()
+        comicinfo_crc = zf.getinfo("ComicInfo.xml").CRC
+
+    # Fingerprint describes the new file, so a later move of the .cbz is still detected
+    assert comic.fingerprint == content_fingerprint(target, target.stat().st_size, comicinfo_crc)
+
+    assert not source.exists()
+    assert (tmp_path / "issue_01.cb7.bak").exists() is not delete_originals
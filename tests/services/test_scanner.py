@@ -0,0 +1,291 @@
+import os
+import zipfile
+from io import BytesIO
+
+from PIL import Image
+
+from app.models.comic import Comic
+from app.models.collection import CollectionItem
+from app.models.credits import ComicCredit
+from app.models.reading_list import ReadingList, ReadingListItem
+from app.models.library import Library
+from app.models.reading_progress import ReadingProgress
+from app.services import scanner as scanner_module
+from app.services.scanner import LibraryScanner, UNREADABLE_FINGERPRINT
+
+
+# --- HELPERS ---
+
+def build_cbz(path, number, extra=""):
+    buf = BytesIO()
+    Image.new("RGB", (60, 90), "red").save(buf, format="JPEG")
+    comicinfo = f"""<?xml version="1.0"?>
+<ComicInfo><Series>Parallel</Series><Number>{number}</Number><Volume>1</Volume>{extra}</ComicInfo>"""
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("01.jpg", buf.getvalue())
+        zf.writestr("ComicInfo.xml", comicinfo)
+
+
+def scan(db, path, workers):
+    lib = Library(name=f"Scan Lib {workers}", path=str(path))
+    db.add(lib)
+    db.commit()
+    return LibraryScanner(lib, db, workers=workers).scan()
+
+
+# --- TESTS ---
+
+def test_parallel_extraction_matches_serial(db, tmp_path, monkeypatch):
+    """Pool workers only extract; the single writer applies results in walk order"""
+    # Worker count is capped at the core count: make sure the pool is used on small CI boxes
+    monkeypatch.setattr("app.services.scanner.multiprocessing.cpu_count", lambda: 4)
+
+    for workers in (1, 3):
+        root = tmp_path / f"lib{workers}"
+        root.mkdir()
+        for number in range(1, 7):
+            build_cbz(root / f"issue_{number:02d}.cbz", number)
+        (root / "broken.cbz").write_bytes(b"not a zip")
+
+        result = scan(db, root, workers)
+
+        assert (result["imported"], result["errors"]) == (6, 1)
+
+    serial, parallel = (
+        [(c.filename, c.number, c.page_count) for c in
+         db.query(Comic).filter(Comic.file_path.like(f"{tmp_path / name}%")).order_by(Comic.id)]
+        for name in ("lib1", "lib3")
+    )
+    assert serial == parallel
+
+
+def test_incremental_scan_keeps_pruned_comics(db, tmp_path, caplog):
+    """Unchanged folders are not listed again, and their comics are not treated as deleted"""
+    series = tmp_path / "Parallel"
+    series.mkdir()
+    for number in range(1, 4):
+        build_cbz(series / f"issue_{number:02d}.cbz", number)
+
+    lib = Library(name="Incremental", path=str(tmp_path))
+    db.add(lib)
+    db.commit()
+    assert LibraryScanner(lib, db, workers=1).scan()["imported"] == 3
+
+    # Fresh directory mtimes are not trusted yet: age them and let one scan record them
+    past = os.stat(series).st_mtime - 60
+    for path in (series, tmp_path):
+        os.utime(path, (past, past))
+    LibraryScanner(lib, db, workers=1).scan()
+
+    caplog.set_level("INFO", logger="app.services.scanner")
+    result = LibraryScanner(lib, db, workers=1, full_walk_days=7).scan()
+
+    assert (result["imported"], result["deleted"], result["skipped"]) == (0, 0, 3)
+    assert "incremental): listed 0 directories, pruned 2" in caplog.text
+    assert db.query(Comic).count() == 3
+
+
+def test_moved_file_keeps_comic_and_progress(db, tmp_path, normal_user):
+    """A reorganized file is re-pointed in place instead of deleted and re-imported"""
+    old_dir, new_dir = tmp_path / "Inbox", tmp_path / "Parallel" / "Vol 1"
+    old_dir.mkdir()
+    build_cbz(old_dir / "issue_01.cbz", 1)
+    build_cbz(old_dir / "issue_02.cbz", 2)
+
+    lib = Library(name="Moves", path=str(tmp_path))
+    db.add(lib)
+    db.commit()
+    LibraryScanner(lib, db, workers=1).scan()
+
+    comic = db.query(Comic).filter(Comic.filename == "issue_01.cbz").one()
+    comic_id, fingerprint = comic.id, comic.fingerprint
+    assert fingerprint and fingerprint.startswith(f"{comic.file_size}-")
+    db.add(ReadingProgress(user_id=normal_user.id, comic_id=comic_id, current_page=3, total_pages=1))
+    db.commit()
+
+    new_dir.mkdir(parents=True)
+    (old_dir / "issue_01.cbz").rename(new_dir / "Parallel 001.cbz")
+    result = LibraryScanner(lib, db, workers=1).scan()
+
+    assert (result["moved"], result["imported"], result["deleted"]) == (1, 0, 0)
+    comic = db.query(Comic).filter(Comic.id == comic_id).one()
+    assert (comic.file_path, comic.filename) == (str(new_dir / "Parallel 001.cbz"), "Parallel 001.cbz")
+    assert db.query(ReadingProgress).filter(ReadingProgress.comic_id == comic_id).count() == 1
+
+
+def test_rescan_applies_association_changes(db, tmp_path):
+    """Credits / tags / lists are diffed per batch: changed rows replaced, shared entities reused"""
+    tagged = ("<Characters>Alpha, Beta</Characters><Writer>Wendy</Writer><SeriesGroup>Group</SeriesGroup>"
+              "<AlternateSeries>Event</AlternateSeries><AlternateNumber>1</AlternateNumber>")
+    build_cbz(tmp_path / "issue_01.cbz", 1, tagged)
+    build_cbz(tmp_path / "issue_02.cbz", 2, tagged.replace("<AlternateNumber>1", "<AlternateNumber>2"))
+
+    lib = Library(name="Associations", path=str(tmp_path))
+    db.add(lib)
+    db.commit()
+    LibraryScanner(lib, db, workers=1).scan()
+
+    first, second = db.query(Comic).order_by(Comic.number).all()
+    assert sorted(c.name for c in first.characters) == ["Alpha", "Beta"]
+    assert {c.person.name for c in second.credits} == {"Wendy"}
+    assert db.query(ReadingList).filter(ReadingList.name == "Event").one().items[1].comic_id == second.id
+
+    build_cbz(tmp_path / "issue_01.cbz", 1,
+              "<Characters>Beta, Gamma</Characters><Writer>Xavier</Writer>"
+              "<AlternateSeries>Event</AlternateSeries><AlternateNumber>3</AlternateNumber>")
+    result = LibraryScanner(lib, db, workers=1).scan(force=True)
+    assert result["updated"] == 2
+    db.expire_all()
+
+    assert sorted(c.name for c in first.characters) == ["Beta", "Gamma"]
+    assert sorted(c.name for c in second.characters) == ["Alpha", "Beta"]
+    assert {(c.person.name, c.role) for c in first.credits} == {("Xavier", "writer")}
+    assert db.query(ComicCredit).count() == 2
+    assert db.query(CollectionItem).filter(CollectionItem.comic_id == first.id).count() == 0
+    assert db.query(ReadingListItem).filter(ReadingListItem.comic_id == first.id).one().position == 3.0
+
+
+def test_targeted_scan_only_touches_given_paths(db, tmp_path):
+    """Watcher batches: import / delete just the reported paths, leave the rest of the library alone"""
+    inbox = tmp_path / "Inbox"
+    inbox.mkdir()
+    for number in (1, 2):
+        build_cbz(tmp_path / f"issue_{number:02d}.cbz", number)
+
+    lib = Library(name="Targeted", path=str(tmp_path))
+    db.add(lib)
+    db.commit()
+    LibraryScanner(lib, db, workers=1).scan()
+
+    (tmp_path / "issue_02.cbz").unlink()
+    build_cbz(inbox / "issue_03.cbz", 3)
+    build_cbz(tmp_path / "issue_04.cbz", 4)  # Not reported: picked up by the next full scan
+
+    result = LibraryScanner(lib, db, workers=1).scan_paths([
+        str(tmp_path / "issue_02.cbz"), str(inbox), str(inbox / "issue_03.cbz"), "/elsewhere/issue_09.cbz"
+    ])
+
+    assert (result["imported"], result["deleted"], result["skipped"]) == (1, 1, 0)
+    assert sorted(c.filename for c in db.query(Comic)) == ["issue_01.cbz", "issue_03.cbz"]
+
+
+def test_fused_scan_renders_covers(db, tmp_path, monkeypatch):
+    """Covers + palettes come from the extraction pass, so nothing is left for the THUMBNAIL job"""
+    monkeypatch.setattr("app.services.scanner.settings.cover_dir", tmp_path / "covers")
+    root = tmp_path / "lib"
+    root.mkdir()
+    build_cbz(root / "issue_01.cbz", 1)
+
+    lib = Library(name="Fused", path=str(root))
+    db.add(lib)
+    db.commit()
+    LibraryScanner(lib, db, workers=1, fused_covers=True).scan()
+
+    comic = db.query(Comic).one()
+    assert comic.is_dirty is False
+    assert comic.thumbnail_path == str(tmp_path / "covers" / f"comic_{comic.id}.webp")
+    assert comic.color_primary.startswith("#") and comic.color_palette["secondary"]
+    with Image.open(comic.thumbnail_path) as thumb:
+        assert thumb.format == "WEBP"
+
+
+def test_extraction_keeps_a_bounded_window_in_flight(db, tmp_path, monkeypatch):
+    """Paths are submitted only as the writer consumes results, not the whole library at once"""
+    in_flight = []
+
+    class FakeResult:
+        def __init__(self, value):
+            self.value = value
+
+        def get(self):
+            in_flight.append(in_flight[-1] - 1)
+            return self.value
+
+    class FakePool:
+        def __init__(self, processes):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def apply_async(self, fn, args):
+            in_flight.append((in_flight[-1] if in_flight else 0) + 1)
+            return FakeResult(fn(*args))
+
+    monkeypatch.setattr("app.services.scanner.multiprocessing.cpu_count", lambda: 4)
+    monkeypatch.setattr("app.services.scanner.multiprocessing.Pool", FakePool)
+
+    lib = Library(name="Window Lib", path=str(tmp_path))
+    scanner = LibraryScanner(lib, db, workers=2)
+    paths = [tmp_path / f"{n}.cbz" for n in range(50)]
+
+    results = list(scanner._iter_files(str, paths, "Testing"))
+
+    assert results == [str(p) for p in paths]
+    assert max(in_flight) == 2 * LibraryScanner.WINDOW_PER_WORKER
+    assert in_flight[-1] == 0
+
+
+def test_failed_batch_write_is_reported_once_and_retried(db, tmp_path):
+    """A failing association flush is a batch error; the next scan processes the batch again"""
+    for number in range(1, 4):
+        build_cbz(tmp_path / f"issue_{number:02d}.cbz", number, "<Characters>Parker</Characters>")
+
+    lib = Library(name="Batch Lib", path=str(tmp_path))
+    db.add(lib)
+    db.commit()
+
+    scanner = LibraryScanner(lib, db, workers=1)
+    flush = scanner.associations.flush
+
+    def broken_flush():
+        scanner.associations.flush = flush
+        raise RuntimeError("disk I/O error")
+
+    scanner.associations.flush = broken_flush
+    result = scanner.scan()
+
+    assert result["imported"] == 0
+    assert [e["file"] for e in result["error_details"]] == ["(batch of 3 comics)"]
+
+    result = LibraryScanner(lib, db, workers=1).scan()
+
+    assert result["errors"] == 0
+    assert db.query(Comic).count() == 3
+    assert all(c.characters for c in db.query(Comic))
+
+
+def test_unreadable_fingerprint_is_not_retried_until_the_file_changes(db, tmp_path, monkeypatch):
+    """A failed backfill is remembered; only a modified file is fingerprinted again"""
+    path = tmp_path / "issue_01.cbz"
+    build_cbz(path, 1)
+
+    lib = Library(name="Backfill Lib", path=str(tmp_path))
+    db.add(lib)
+    db.commit()
+    LibraryScanner(lib, db, workers=1).scan()
+
+    # Imported before fingerprints existed, and the archive can't be fingerprinted
+    comic = db.query(Comic).one()
+    comic.fingerprint = None
+    db.commit()
+    attempts = []
+    monkeypatch.setattr(scanner_module, "_fingerprint_worker", lambda path_str: attempts.append(path_str))
+
+    LibraryScanner(lib, db, workers=1, full_walk_days=0).scan()
+    LibraryScanner(lib, db, workers=1, full_walk_days=0).scan()
+
+    assert attempts == [str(path)]
+    db.refresh(comic)
+    assert comic.fingerprint == UNREADABLE_FINGERPRINT
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    LibraryScanner(lib, db, workers=1, full_walk_days=0).scan()
+
+    db.refresh(comic)
+    assert comic.fingerprint.startswith(f"{comic.file_size}-")
+    assert attempts == [str(path)]
@@ -0,0 +1,64 @@
+from app.core.comic_helpers import get_sort_keys
+from app.models.comic import Comic, Volume
+from app.models.library import Library
+from app.models.series import Series
+from app.services.thumbnailer import ThumbnailService, _apply_batch
+
+
+def make_comics(db, count):
+    lib = Library(name="Thumb Lib", path="/tmp/thumbs")
+    db.add(lib)
+    db.flush()
+    series = Series(name="Thumb Series", library_id=lib.id)
+    db.add(series)
+    db.flush()
+    volume = Volume(series_id=series.id, volume_number=1)
+    db.add(volume)
+    db.flush()
+
+    comics = [
+        Comic(volume_id=volume.id, number=str(n), filename=f"{n}.cbz", file_path=f"/tmp/thumbs/{n}.cbz",
+              title=f"Title {n}", is_dirty=True, **get_sort_keys(str(n), None, None, None, None))
+        for n in range(1, count + 1)
+    ]
+    db.add_all(comics)
+    db.commit()
+    return comics
+
+
+def test_apply_batch_updates_only_cover_columns(db):
+    comics = make_comics(db, 3)
+    palette = {"primary": "#ff0000", "secondary": "#00ff00", "accent1": "#0000ff"}
+
+    processed, errors = _apply_batch(db, [
+        {"comic_id": comics[0].id, "thumbnail_path": "storage/cover/comic_a.webp", "palette": palette, "error": False},
+        {"comic_id": comics[1].id, "thumbnail_path": "storage/cover/comic_b.webp", "palette": None, "error": False},
+        {"comic_id": comics[2].id, "error": True, "message": "Image processing failed"},
+    ])
+    db.expire_all()
+
+    assert (processed, errors) == (2, 1)
+    assert (comics[0].color_primary, comics[0].color_palette, comics[0].is_dirty) == ("#ff0000", palette, False)
+    assert (comics[1].thumbnail_path, comics[1].color_primary, comics[1].is_dirty) == \
+           ("storage/cover/comic_b.webp", None, False)
+    # Failures stay dirty for the next run, other columns untouched
+    assert comics[2].is_dirty is True
+    assert [c.title for c in comics] == ["Title 1", "Title 2", "Title 3"]
+
+
+def test_tasks_stream_in_keyset_pages(db, monkeypatch):
+    comics = make_comics(db, 5)
+    monkeypatch.setattr(ThumbnailService, "TASK_CHUNK_SIZE", 2)
+    comics[0].is_dirty = False
+    db.commit()
+
+    service = ThumbnailService(db, comics[0].volume.series.library_id)
+
+    # Dirty only, all pages walked
+    assert list(service._iter_tasks()) == [(c.id, c.file_path) for c in comics[1:]]
+
+    # Forced: everything
+    assert [t[0] for t in service._iter_tasks(force=True)] == [c.id for c in comics]
+
+    # Series regeneration: the whole series, clean comics included
+    assert len(list(service._iter_tasks(series_id=comics[0].volume.series_id))) == 5
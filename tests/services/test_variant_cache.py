@@ -0,0 +1,93 @@
+import os
+import time
+
+from app.services.variant_cache import VariantCache
+
+
+# --- HELPERS ---
+
+def make_cache(tmp_path, max_bytes=10 * 1024 * 1024):
+    cache = VariantCache(tmp_path / "variants")
+    cache._get_max_bytes = lambda: max_bytes
+    return cache
+
+
+# --- TESTS ---
+
+def test_variant_key_is_order_independent():
+    assert VariantCache.variant_key(webp=True, grayscale=True, sharpen=False) == "grayscale-webp"
+    assert VariantCache.variant_key(sharpen=False, grayscale=False, webp=False) == ""
+
+
+def test_roundtrip_and_counters(tmp_path):
+    cache = make_cache(tmp_path)
+
+    assert cache.get(1, 0, "webp", 100) is None
+    cache.put(1, 0, "webp", 100, b"webp-bytes", "image/webp")
+
+    assert cache.get(1, 0, "webp", 100) == (b"webp-bytes", "image/webp")
+    # Other variants / pages are separate entries
+    assert cache.get(1, 0, "sharpen", 100) is None
+    assert cache.get(1, 1, "webp", 100) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"], stats["entries"]) == (1, 3, 1, 1)
+
+
+def test_new_source_mtime_replaces_old_variant(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put(1, 0, "webp", 100, b"old", "image/webp")
+    cache.put(1, 0, "webp", 200, b"new", "image/webp")
+
+    assert cache.get(1, 0, "webp", 100) is None
+    assert cache.get(1, 0, "webp", 200) == (b"new", "image/webp")
+    assert cache.stats()["entries"] == 1
+
+
+def test_budget_evicts_least_recently_served(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=25)
+    cache.put(1, 0, "webp", 1, b"a" * 10, "image/webp")
+    cache.put(1, 1, "webp", 1, b"b" * 10, "image/webp")
+
+    # Serve page 0 so page 1 becomes the oldest
+    past = time.time() - 60
+    os.utime(next((tmp_path / "variants" / "1").glob("1_*")), (past, past))
+    assert cache.get(1, 0, "webp", 1)
+
+    cache.put(2, 0, "webp", 1, b"c" * 10, "image/webp")
+
+    assert cache.get(1, 1, "webp", 1) is None
+    assert cache.get(1, 0, "webp", 1)
+    assert cache.get(2, 0, "webp", 1)
+    assert cache.evictions == 1
+
+
+def test_eviction_leaves_headroom(tmp_path, monkeypatch):
+    """A full cache is scanned once per eviction round, not on every write"""
+    cache = make_cache(tmp_path, max_bytes=100)
+    for page in range(10):
+        cache.put(1, page, "webp", 1, b"x" * 10, "image/webp")
+
+    scans = []
+    scan_entries = cache._scan_entries
+    monkeypatch.setattr(cache, "_scan_entries", lambda: scans.append(1) or scan_entries())
+
+    cache.put(1, 10, "webp", 1, b"x" * 10, "image/webp")
+    assert len(scans) == 1
+    assert cache._bytes <= 90
+
+    # Writes within the freed headroom don't rescan the tree
+    cache.put(1, 11, "webp", 1, b"x" * 5, "image/webp")
+    assert len(scans) == 1
+
+
+def test_invalidate_and_clear(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put(1, 0, "grayscale", 1, b"x" * 5, "image/jpeg")
+    cache.put(2, 0, "grayscale", 1, b"y" * 7, "image/jpeg")
+
+    cache.invalidate(1)
+    assert cache.get(1, 0, "grayscale", 1) is None
+
+    assert cache.clear() == 7
+    assert cache.stats()["entries"] == 0